@@ -4,48 +4,6 @@ from PIL import Image
 def app():
     st.title('🗣️ About NEARVision Ⓝ')
 
-    # Include the Font Awesome and additional CSS for animations and styling
-    st.markdown("""
-        <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/5.15.1/css/all.min.css">
-        <style>
-            .highlight {
-                color: #2557a7; /* A color that matches your theme */
-                font-weight: bold;
-            }
-            .about-container {
-                animation: fadeInAnimation ease 3s;
-                animation-iteration-count: 1;
-                animation-fill-mode: forwards;
-            }
-            @keyframes fadeInAnimation {
-                0% {
-                    opacity: 0;
-                }
-                100% {
-                    opacity: 1;
-                }
-            }
-            .header {
-            color: #ff4f8b; /* Change the color */
-            font-size: 3rem; /* Change the font size */
-            text-shadow: 2px 2px #ffcccb; /* Add a shadow effect */
-            font-weight: bold;
-            margin-bottom: 1rem;
-            }
-            .sub-header {
-            color: #30336b; /* Change the color */
-            font-size: 2rem; /* Change the font size */
-            text-shadow: 1px 1px #dfe6e9; /* Add a shadow effect */
-            font-weight: bold;
-            margin-bottom: 1rem;
-            }
-            .near-symbol {
-            font-size: 1.5rem; /* Change the size of the symbol */
-            color: #6c5ce7; /* Change the color of the symbol */
-            }
-        </style>
-        """, unsafe_allow_html=True)
-
     st.markdown("""
        <div class="about-container" style="font-size: 1.25rem; background-color: #f0f2f6; padding: 2rem; border-radius: 10px; box-shadow: 0 0 10px rgba(0,0,0,0.1);">
         Welcome to <span class="highlight">NEARVision</span>. This platform is designed to serve as a <span class="highlight">comprehensive guide</span> and <span class="highlight">analytical tool</span> for the NEAR protocol ecosystem. NEARVision offers a deep dive into the complex workings of the NEAR blockchain, with the goal of rendering intricate data into <span class="highlight">actionable insights</span>.
@@ -0,0 +1,217 @@
+import argparse
+import csv
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from nearblocks import get_json, BACKGROUND
+
+EXPORT_DIR = "exports"
+EXPORT_KINDS = {
+    "txns": "/v1/account/{account_id}/txns",
+    "ft-txns": "/v1/account/{account_id}/ft-txns",
+    "nft-txns": "/v1/account/{account_id}/nft-txns",
+}
+PER_PAGE = 25
+CHUNK_ROWS = 10000  # Rows buffered before a chunk is written and the checkpoint advances
+PREFETCH_PAGES = 4  # Pages fetched ahead of the writer; also bounds memory when writing is slow
+RETRIES = 5
+CHECKPOINT_FILE = "_checkpoint.json"  # Leading underscore keeps Parquet dataset readers from picking it up
+
+def flatten(row, prefix=""):
+    """Flatten nested NearBlocks rows into dotted string columns (yocto amounts overflow int64)."""
+    flat = {}
+    for key, value in row.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, list):
+            flat[name] = json.dumps(value)
+        elif value is not None:
+            flat[name] = str(value)
+    return flat
+
+def export_path(account_id, network, kind, fmt):
+    return os.path.join(EXPORT_DIR, network.lower(), account_id, f"{kind}-{fmt}")
+
+def csv_name(part):
+    # A CSV export starts a new part whenever rows bring columns its header does not have
+    return "history.csv" if part == 0 else f"history-{part:05d}.csv"
+
+def load_checkpoint(directory):
+    # newest: block timestamp of the newest exported row; stop_at / next_newest belong to an update in progress
+    state = {"cursor": None, "rows": 0, "parts": 0, "csv_part": 0, "csv_bytes": 0, "columns": None, "done": False,
+             "newest": None, "stop_at": None, "next_newest": None}
+    path = os.path.join(directory, CHECKPOINT_FILE)
+    if os.path.exists(path):
+        with open(path) as checkpoint_file:
+            state.update(json.load(checkpoint_file))
+    return state
+
+def save_checkpoint(directory, state):
+    path = os.path.join(directory, CHECKPOINT_FILE)
+    with open(path + ".tmp", "w") as checkpoint_file:
+        json.dump(state, checkpoint_file)
+    os.replace(path + ".tmp", path)
+
+def fetch_page(account_id, network, kind, cursor):
+    params = {"per_page": PER_PAGE, "order": "desc"}
+    if cursor:
+        params["cursor"] = cursor
+    for attempt in range(RETRIES):
+        data = get_json(network, EXPORT_KINDS[kind].format(account_id=account_id), params, timeout=30,
+                        priority=BACKGROUND, session_id=f"export-{account_id}")
+        if data is not None:
+            return data
+        time.sleep(2 ** attempt)
+    raise RuntimeError(f"Failed to fetch {kind} page for {account_id} after {RETRIES} attempts")
+
+def _put(pages, item, stop):
+    # Blocks while PREFETCH_PAGES are waiting, but gives up once the writer has stopped
+    while not stop.is_set():
+        try:
+            pages.put(item, timeout=0.5)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def _prefetch_pages(account_id, network, kind, cursor, stop_at, pages, stop):
+    # Walks the cursor chain ahead of the writer, newest first, until it reaches rows already exported
+    try:
+        while not stop.is_set():
+            data = fetch_page(account_id, network, kind, cursor)
+            rows, cursor = data.get("txns", []), data.get("cursor")
+            if stop_at is not None:
+                fresh = [row for row in rows if int(row["block_timestamp"]) > stop_at]
+                if len(fresh) < len(rows):
+                    _put(pages, (fresh, None), stop)
+                    break
+            if not _put(pages, (rows, cursor), stop) or not rows or not cursor:
+                break
+    except Exception as error:
+        _put(pages, error, stop)
+        return
+    _put(pages, None, stop)
+
+def _write_chunk(directory, state, rows, fmt):
+    chunk_columns = sorted({column for row in rows for column in row})
+    if fmt == "parquet":
+        # Each part keeps the columns of its own rows; read_export() unifies them
+        schema = pa.schema([(column, pa.string()) for column in chunk_columns])
+        pq.write_table(pa.Table.from_pylist(rows, schema=schema), os.path.join(directory, f"part-{state['parts']:05d}.parquet"))
+        state["parts"] += 1
+        state["columns"] = sorted(set(state["columns"] or []) | set(chunk_columns))
+    else:
+        new_columns = [column for column in chunk_columns if column not in (state["columns"] or [])]
+        if new_columns:
+            # The header cannot grow in place, so rows with new columns start the next part
+            if state["columns"] is not None:
+                state["csv_part"] += 1
+            state["columns"] = (state["columns"] or []) + new_columns
+            state["csv_bytes"] = 0
+        path = os.path.join(directory, csv_name(state["csv_part"]))
+        with open(path, "a", newline="") as csv_file:
+            # Drop anything appended after the last checkpoint by an interrupted run
+            csv_file.truncate(state["csv_bytes"])
+            csv_file.seek(state["csv_bytes"])
+            writer = csv.DictWriter(csv_file, fieldnames=state["columns"])
+            if state["csv_bytes"] == 0:
+                writer.writeheader()
+            writer.writerows(rows)
+            state["csv_bytes"] = csv_file.tell()
+    state["rows"] += len(rows)
+
+def export_history(account_id, network, kind, fmt="parquet", progress=None):
+    """Stream one history endpoint of an account to chunked Parquet parts or CSV parts.
+
+    Only one chunk is held in memory. The checkpoint advances after each chunk is written,
+    so calling this again after an interruption resumes from the last written chunk.
+    Calling it on a finished export appends the rows that arrived since, newest first.
+    """
+    directory = export_path(account_id, network, kind, fmt)
+    os.makedirs(directory, exist_ok=True)
+    state = load_checkpoint(directory)
+    if state["done"]:
+        if state["newest"] is None and state["rows"]:
+            return state  # Finished before newest rows were tracked, so there is no safe point to update from
+        state.update(done=False, cursor=None, stop_at=state["newest"], next_newest=None)
+
+    pages = queue.Queue(maxsize=PREFETCH_PAGES)
+    stop = threading.Event()
+    producer = threading.Thread(target=_prefetch_pages, args=(account_id, network, kind, state["cursor"], state["stop_at"], pages, stop),
+                                daemon=True)
+    producer.start()
+    buffer, next_cursor = [], state["cursor"]
+    try:
+        while True:
+            item = pages.get()
+            if isinstance(item, Exception):
+                raise item
+            if item is None:
+                break
+            rows, next_cursor = item
+            if rows and state["next_newest"] is None:
+                state["next_newest"] = int(rows[0]["block_timestamp"])
+            buffer.extend(flatten(row) for row in rows)
+            if len(buffer) >= CHUNK_ROWS:
+                _write_chunk(directory, state, buffer, fmt)
+                state["cursor"] = next_cursor
+                save_checkpoint(directory, state)
+                buffer = []
+                if progress:
+                    progress(kind, state["rows"])
+        if buffer:
+            _write_chunk(directory, state, buffer, fmt)
+        newest = [value for value in (state["newest"], state["next_newest"]) if value is not None]
+        state.update(cursor=next_cursor, done=True, newest=max(newest) if newest else None, stop_at=None, next_newest=None)
+        save_checkpoint(directory, state)
+        if progress:
+            progress(kind, state["rows"])
+    finally:
+        stop.set()
+    return state
+
+def export_files(directory, fmt):
+    if fmt == "parquet":
+        return sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".parquet"))
+    checkpoint = load_checkpoint(directory)
+    return [os.path.join(directory, csv_name(part)) for part in range(checkpoint["csv_part"] + 1)
+            if os.path.exists(os.path.join(directory, csv_name(part)))]
+
+def read_export(account_id, network, kind, fmt="parquet"):
+    """Every exported row of one history kind as a DataFrame, with the columns of all parts unified."""
+    files = export_files(export_path(account_id, network, kind, fmt), fmt)
+    if not files:
+        return pd.DataFrame()
+    if fmt == "parquet":
+        schema = pa.unify_schemas([pq.read_schema(path) for path in files])
+        return ds.dataset(files, schema=schema, format="parquet").to_table().to_pandas()
+    return pd.concat([pd.read_csv(path, dtype=str) for path in files], ignore_index=True)
+
+def export_account(account_id, network, fmt="parquet", kinds=tuple(EXPORT_KINDS), progress=None):
+    """Export several history kinds of one account concurrently; returns {kind: final checkpoint}."""
+    with ThreadPoolExecutor(max_workers=len(kinds)) as pool:
+        futures = {kind: pool.submit(export_history, account_id, network, kind, fmt, progress) for kind in kinds}
+        return {kind: future.result() for kind, future in futures.items()}
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the full transaction history of a NEAR account.")
+    parser.add_argument("account_id")
+    parser.add_argument("--network", choices=["Testnet", "Mainnet"], default="Mainnet")
+    parser.add_argument("--format", choices=["parquet", "csv"], default="parquet")
+    parser.add_argument("--kinds", nargs="+", choices=list(EXPORT_KINDS), default=list(EXPORT_KINDS))
+    args = parser.parse_args()
+    results = export_account(args.account_id, args.network, args.format, args.kinds,
+                             progress=lambda kind, rows: print(f"{kind}: {rows} rows written", flush=True))
+    for kind, state in results.items():
+        print(f"{kind}: {state['rows']} rows in {export_path(args.account_id, args.network, kind, args.format)}")
+
+if __name__ == "__main__":
+    main()
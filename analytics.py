@@ -1,31 +1,47 @@
 import streamlit as st
 import yfinance as yf
 import pandas as pd
-import requests
+from nearblocks import get_json, failure_message, submit_json
 import matplotlib.pyplot as plt
 import seaborn as sns
-from scipy.stats import skew, kurtosis, norm, jarque_bera,linregress
-from sklearn.linear_model import LinearRegression
-from sklearn.model_selection import train_test_split
+from scipy.stats import skew, kurtosis, norm, jarque_bera
 import numpy as np
 from scipy.stats.mstats import gmean
 from prompts import format_stats_for_prompt, generate_ai_response,generate_anomaly_analytics_prompt,generate_ai_response_anomaly
 from sklearn.ensemble import IsolationForest
-from collections import defaultdict
+from market_sensitivity import MARKET_ASSETS, TARGET, aligned_returns, fetch_prices, return_matrix, sensitivity
+from anomaly_report import BUCKETS, aggregate_anomalies, anomaly_scores, most_severe
 import calendar
 from datetime import datetime
+from progressive import page_deadline, ai_box
+import risk
+import backtest
+import rolling_metrics
+import forecasting
+
+MAX_PROMPT_BUCKETS = 24
+PAGE_BUDGET = 10  # Seconds until pending AI boxes show their rule-based summary instead
+OUTLOOK_WINDOW = 30  # Trading days behind the rule-based investment outlook
+# Return over the outlook window at or above which each outcome applies; anything lower is 'Higher Loss'
+OUTLOOK_THRESHOLDS = [(0.10, 'Higher Profit'), (0.0, 'Slight Profit'), (-0.10, 'Slight Loss')]
+PATH_OPTIONS = [10_000, 100_000, 1_000_000]  # Monte Carlo paths offered on the VaR section
+SUMMARY_HORIZON = 10  # Trading days behind the VaR and CVaR in the AI summary
+ROLLING_WINDOW_OPTIONS = [7, 30, 90, 180, 365]  # Days offered for the rolling risk charts
+FORECAST_HISTORY = 180  # Past closes drawn next to the forecast
 
 # Function to fetch NEAR Blocks API data
 def fetch_near_blocks_stats():
-    url = "https://api.nearblocks.io/v1/stats"
-    response = requests.get(url)
-    if response.status_code == 200:
-        data = response.json()
+    data = get_json("Mainnet", "/v1/stats")
+    if data is not None:
         return data
     else:
-        st.error("Failed to fetch NEAR Blocks API data.")
+        st.error(failure_message("Failed to fetch NEAR Blocks API data."))
         return {}
 
+def submit_near_blocks_stats():
+    # Same data as fetch_near_blocks_stats, loaded in the background while the page computes
+    return submit_json("Mainnet", "/v1/stats", error="Failed to fetch NEAR Blocks API data.")
+
 # Function to fetch NEAR-USD data
 def get_near_data(start_date, end_date):
     near = yf.Ticker("NEAR-USD")
@@ -91,22 +107,29 @@ def distribution_fitting(returns):
 # Function for stock price predictions
 def stock_price_predictions(df):
     st.subheader("Stock Price Predictions & Accuracy Score")
-    # Simplified prediction model using closing prices
-    X = df[['Open']]
-    y = df['Close']
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-    model = LinearRegression()
-    model.fit(X_train, y_train)
-    score = model.score(X_test, y_test)
+    # Walk-forward backtest: every prediction comes from a model fitted only on earlier days
+    folds, _ = backtest.walk_forward(df['Close'])
+    validation = backtest.overall(folds)
+    if validation is None:
+        st.info(f"Walk-forward validation needs more than {backtest.MIN_TRAIN + backtest.LAGS + 1} days of prices.")
+        return None
     st.markdown(f"""
     <div style="background-color:#e8eaf6;padding:10px;border-radius:10px;">
-        <h4 style="color:#333;">Model Accuracy Score:</h4>
-        <p style="color:red;">{score:.2f}</p>
+        <h4 style="color:#333;">Next-day RMSE (out of sample):</h4>
+        <p style="color:red;">${validation['rmse']:.4f} vs ${validation['naive_rmse']:.4f} for today's close ({validation['skill']:+.1%} skill)</p>
+        <h4 style="color:#333;">Directional accuracy:</h4>
+        <p style="color:red;">{validation['directional_accuracy']:.1%} over {validation['days']} days in {validation['folds']} folds</p>
     </div>
     """, unsafe_allow_html=True)
-    return score
+    st.dataframe(folds.style.format({"RMSE": "{:.4f}", "Naive RMSE": "{:.4f}", "Directional accuracy": "{:.1%}",
+                                     "Test start": "{:%Y-%m-%d}", "Test end": "{:%Y-%m-%d}"}), hide_index=True)
+    return validation
 
 # Function for Value at Risk
+@st.cache_data(max_entries=20, show_spinner=False)
+def risk_table(close, paths):
+    return risk.risk_table(close.to_numpy(), paths=paths)
+
 def value_at_risk(df):
     st.subheader("Value at Risk (VaR)")
     returns = df['Close'].pct_change().dropna()
@@ -117,16 +140,35 @@ def value_at_risk(df):
         <p style="color:red;">{returns.std():.2f}</p>
     </div>
     <div style="background-color:#f0f2f6;padding:10px;border-radius:10px;">
-        <h4 style="color:#333;">Inter-Quantile range:</h4>
-        <p style="color:red;">{returns.quantile(0.05):.2f}</p>
+        <h4 style="color:#333;">5% quantile of daily returns (1-day historical VaR at 95%):</h4>
+        <p style="color:red;">{returns.quantile(0.05):.2%}</p>
     </div>
     """, unsafe_allow_html=True)
+    paths = st.select_slider("Monte Carlo paths", options=PATH_OPTIONS, value=risk.MONTE_CARLO_PATHS, format_func="{:,}".format)
+    table = risk_table(df['Close'], paths)
+    # Losses as a share of the position; CVaR is the average loss beyond the VaR
+    table = table.pivot_table(index=["Horizon (days)", "Confidence"], columns="Method", values=["VaR", "CVaR"], sort=False)
+    st.dataframe(table.style.format("{:.2%}"))
 
 # Function for time series forecast
 def time_series_forecast(df):
     st.subheader("Time Series Forecast")
-    logged_close = np.log(df['Close'])
-    st.line_chart(logged_close)
+    close = df['Close'].dropna()
+    if len(close) < 3:
+        st.info("Not enough price history for a forecast.")
+        return None
+    forecast, params = forecasting.forecast_close(close)
+    chart = pd.concat([close.tail(FORECAST_HISTORY).rename("Close").to_frame(), forecast[["Forecast", "Lower 95%", "Upper 95%"]]])
+    st.line_chart(chart)
+    last = forecast.iloc[-1]
+    st.markdown(f"""
+    <div style="background-color:#f0f2f6;padding:10px;border-radius:10px;">
+        <h4 style="color:#333;">{len(forecast)}-day forecast (damped-trend exponential smoothing):</h4>
+        <p style="color:red;">${last['Forecast']:.3f} (80% band ${last['Lower 80%']:.3f} to ${last['Upper 80%']:.3f}, 95% band ${last['Lower 95%']:.3f} to ${last['Upper 95%']:.3f})</p>
+        <p style="color:#333;">Best of the grid by one-step error: alpha {params['alpha']:.2f}, beta {params['beta']:.2f}, phi {params['phi']:.2f}</p>
+    </div>
+    """, unsafe_allow_html=True)
+    return forecast
 
 # Function for Covariance & Correlations analysis
 def covariance_correlations(df):
@@ -145,20 +187,49 @@ def covariance_correlations(df):
     </div>
     """, unsafe_allow_html=True)
 
+# Function for rolling risk metrics
+def rolling_risk(df):
+    st.subheader("Rolling Risk Metrics")
+    windows = st.multiselect("Rolling windows (days)", ROLLING_WINDOW_OPTIONS, default=list(rolling_metrics.WINDOWS), key="rolling_windows")
+    if not windows:
+        st.info("Select at least one window.")
+        return
+    windows = sorted(windows)
+    close = df['Close'].dropna()
+    periods = rolling_metrics.periods_per_year(close.index)
+    # Windows are in days; intraday candles hold more rows per day
+    rows = [max(2, round(window * periods / 365)) for window in windows]
+    labels = {f"{row}": f"{window}d" for row, window in zip(rows, windows)}
+    returns = np.log(close / close.shift(1)).dropna()
+
+    st.markdown("**Annualised volatility**")
+    st.line_chart(rolling_metrics.rolling_volatility(returns, rows, periods).rename(columns=labels))
+    st.markdown("**Sharpe ratio** (annualised, zero risk-free rate)")
+    st.line_chart(rolling_metrics.rolling_sharpe(returns, rows, periods).rename(columns=labels))
+
+    market_prices = fetch_prices(("BTC-USD",), close.index.min().date(), close.index.max().date())
+    aligned = aligned_returns(close, market_prices)
+    if len(aligned) > min(windows):
+        st.markdown("**Beta vs BTC-USD** (daily returns)")
+        st.line_chart(rolling_metrics.rolling_beta(aligned[TARGET], aligned["BTC-USD"], windows).rename(columns=lambda window: f"{window}d"))
+    else:
+        st.info("Not enough overlapping BTC-USD history for a rolling beta.")
+
+    st.markdown("**Drawdown from peak**")
+    st.area_chart(rolling_metrics.drawdowns(close))
+
 # Function for Linear Regression analysis
 def linear_regression(df):
     st.subheader("Linear Regression (Graphical representation)")
-    df = df.dropna()
-    X = df[['Open']]
-    y = df['Close']
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-    model = LinearRegression()
-    model.fit(X_train, y_train)
-    plt.scatter(X_train, y_train, color='blue')
-    plt.plot(X_train, model.predict(X_train), color='red')
+    _, predictions = backtest.walk_forward(df['Close'].dropna())
+    if predictions.empty:
+        return
+    plt.plot(predictions.index, predictions['Actual'], color='blue', label="Actual close")
+    plt.plot(predictions.index, predictions['Predicted'], color='red', label="Walk-forward prediction")
     plt.title("Linear Regression")
-    plt.xlabel("Open Price")
+    plt.xlabel("Date")
     plt.ylabel("Close Price")
+    plt.legend()
     st.pyplot(plt)
     plt.close()
 
@@ -205,58 +276,64 @@ def stock_statistics(df):
     else:
         st.error("The returns are likely not normal.")
 
-# Beta calculation (using NEAR-USD as market proxy)
+# Beta and correlation of NEAR-USD against a basket of market assets
 def beta_calculation(df):
-    st.subheader("Market Sensitivity Analysis: NEAR-USD vs. BTC-USD")
-    # Download market data
-    market_df = yf.download('BTC-USD', df.index.min(), df.index.max())['Adj Close']
-    # Convert to timezone-naive datetime index if it's timezone-aware
-    if market_df.index.tz is not None:
-        market_df.index = market_df.index.tz_localize(None)
-
-    # Calculate returns and ensure timezone-naive index for NEAR data as well
-    market_ret = market_df.pct_change().dropna()
-    near_ret = df['Close'].pct_change().dropna()
-    if near_ret.index.tz is not None:
-        near_ret.index = near_ret.index.tz_localize(None)
-
-    # Align the data by date
-    aligned_data = pd.merge(market_ret.rename('Market'), near_ret.rename('NEAR'), left_index=True, right_index=True, how='inner')
-
-    # Perform linear regression
-    slope, intercept, r_value, p_value, std_err = linregress(aligned_data['Market'], aligned_data['NEAR'])
+    st.subheader("Market Sensitivity Analysis: NEAR-USD vs. Crypto Market")
+    assets = st.multiselect("Market assets", MARKET_ASSETS + ["BNB-USD", "ADA-USD", "AVAX-USD", "DOT-USD"], default=MARKET_ASSETS, key="market_assets")
+    if not assets:
+        st.info("Select at least one market asset.")
+        return
+    # One cached download for the whole basket
+    market_prices = fetch_prices(tuple(assets), df.index.min().date(), df.index.max().date())
+    names, returns = return_matrix(df['Close'], market_prices)
+    if len(returns) < 2:
+        st.error("Not enough overlapping price history to compare NEAR-USD with the selected assets.")
+        return
+    corr, beta, alpha = sensitivity(returns)
+    near = names.index(TARGET)
 
     st.markdown(f"""
     <div style="background-color:#f0f2f6;padding:10px;border-radius:10px;margin-bottom:10px;">
-        <h4 style="color:#333;">Beta (slope):</h4>
-        <p style="color:red;">{slope:.2f}</p>
+        <h4 style="color:#333;">Beta vs {names[0]} (slope):</h4>
+        <p style="color:red;">{beta[near, 0]:.2f}</p>
     </div>
     <div style="background-color:#f0f2f6;padding:10px;border-radius:10px;">
-        <h4 style="color:#333;">Alpha (intercept):</h4>
-        <p style="color:red;">{intercept:.4f}</p>
+        <h4 style="color:#333;">Alpha vs {names[0]} (intercept):</h4>
+        <p style="color:red;">{alpha[near, 0]:.4f}</p>
     </div>
     """, unsafe_allow_html=True)
-    
-    # Plotting the scatter plot of returns
+
+    st.dataframe(pd.DataFrame({"Beta": beta[near], "Alpha": alpha[near], "Correlation": corr[near]}, index=names).drop(TARGET))
+
+    # Correlation heatmap of the whole basket
+    fig, ax = plt.subplots()
+    sns.heatmap(pd.DataFrame(corr, index=names, columns=names), annot=True, fmt=".2f", cmap="coolwarm", vmin=-1, vmax=1, ax=ax)
+    ax.set_title("Daily Return Correlations")
+    st.pyplot(fig)
+    plt.close(fig)
+
+    # Plotting the scatter plot of returns against the first asset
     plt.subplots()
-    plt.scatter(aligned_data['Market'], aligned_data['NEAR'], alpha=0.5)
-    plt.plot(aligned_data['Market'], intercept + slope * aligned_data['Market'], 'r', label='fitted line')
-    plt.xlabel('BTC-USD Returns')
+    plt.scatter(returns[:, 0], returns[:, near], alpha=0.5)
+    plt.plot(returns[:, 0], alpha[near, 0] + beta[near, 0] * returns[:, 0], 'r', label='fitted line')
+    plt.xlabel(f'{names[0]} Returns')
     plt.ylabel('NEAR-USD Returns')
-    plt.title('Market Sensitivity Analysis: NEAR-USD vs. BTC-USD')
+    plt.title(f'Market Sensitivity Analysis: NEAR-USD vs. {names[0]}')
     plt.legend()
     st.pyplot(plt)
     plt.close()
 
-def summarize_findings(df):
+def summarize_findings(df, near_blocks_data=None, validation=None, forecast=None):
     # Statistical Analysis Metrics
     mean_return = df['Close'].pct_change().mean()
     min_return = df['Close'].pct_change().min()
     max_return = df['Close'].pct_change().max()
     median_return = df['Close'].pct_change().median()
     std_deviation = df['Close'].pct_change().std()
-    # Value at Risk Metric
-    inter_quantile_range = df['Close'].pct_change().quantile(0.05)
+    # Value at Risk Metrics
+    return_quantile = df['Close'].pct_change().quantile(0.05)
+    risks = risk_table(df['Close'], risk.MONTE_CARLO_PATHS).set_index(["Method", "Confidence", "Horizon (days)"])
+    var_95, cvar_95 = risks.loc[("Monte Carlo", 0.95, SUMMARY_HORIZON)] if not risks.empty else (np.nan, np.nan)
     # Covariance & Correlations Analysis Metric
     returns = np.log(df['Close'] / df['Close'].shift(1)).dropna()
     variance = returns.var()
@@ -265,13 +342,31 @@ def summarize_findings(df):
     kurtosis_value = kurtosis(returns)
     jb_stat, pvalue = jarque_bera(returns)
     normality = "likely normal" if pvalue > 0.05 else "likely not normal"
-    # Get the model accuracy score from the stock_price_predictions function
-    model_accuracy_score = stock_price_predictions(df)
-    # Stock Price Predictions Metric
-    model_accuracy = model_accuracy_score  # Now using the actual score from your analysis
-
-    # Fetch NEAR Blocks API data
-    near_blocks_data = fetch_near_blocks_stats()
+    # Stock Price Predictions Metrics from the walk-forward backtest
+    if validation is None:
+        validation = backtest.overall(backtest.walk_forward(df['Close'])[0])
+    if validation is None:
+        model_validation = "not enough price history"
+    else:
+        model_validation = (f"next-day RMSE {validation['rmse']:.4f} USD vs {validation['naive_rmse']:.4f} for a no-change forecast "
+                            f"({validation['skill']:+.1%} skill), directional accuracy {validation['directional_accuracy']:.1%} "
+                            f"over {validation['days']} out-of-sample days")
+
+    # Time Series Forecast Metric
+    if forecast is None and len(df['Close'].dropna()) >= 3:
+        forecast = forecasting.forecast_close(df['Close'].dropna())[0]
+    if forecast is None:
+        forecast_bands = "not enough price history"
+    else:
+        last = forecast.iloc[-1]
+        forecast_bands = (f"{last['Forecast']:.4f} USD in {len(forecast)} days, 80% band {last['Lower 80%']:.4f} to {last['Upper 80%']:.4f}, "
+                          f"95% band {last['Lower 95%']:.4f} to {last['Upper 95%']:.4f}")
+
+    # Fetch NEAR Blocks API data unless the caller already started it
+    if near_blocks_data is None:
+        near_blocks_data = fetch_near_blocks_stats()
+    elif "error" in near_blocks_data:
+        st.error(near_blocks_data["error"])
     high_24h = near_blocks_data.get("high_24h", "N/A")
     high_all = near_blocks_data.get("high_all", "N/A")
     low_24h = near_blocks_data.get("low_24h", "N/A")
@@ -285,18 +380,19 @@ def summarize_findings(df):
     - Max Return: {max_return:.4f}
     - Median Return: {median_return:.4f}
     - Standard Deviation: {std_deviation:.4f}
-    - Inter-Quantile Range: {inter_quantile_range:.4f}
+    - 5% Quantile of Daily Returns: {return_quantile:.4f}
+    - {SUMMARY_HORIZON}-day 95% VaR (Monte Carlo): {var_95:.2%}, CVaR: {cvar_95:.2%}
     - Variance: {variance:.4f}
     - Skewness: {skewness:.4f}
     - Kurtosis: {kurtosis_value:.4f}
     - Jarque-Bera Test: {jb_stat:.2f}, P-value: {pvalue:.2e} ({normality})
-    - Model Accuracy Score: {model_accuracy}
+    - Walk-Forward Model Validation: {model_validation}
+    - Price Forecast (exponential smoothing): {forecast_bands}
     - 24h High: {high_24h}
     - All-Time High: {high_all}
     - 24h Low: {low_24h}
     - All-Time Low: {low_all}
     - 24h Change: {change_24}
-    - Model Accuracy Score: {model_accuracy:.2f}
     """
     return summary
 
@@ -305,30 +401,44 @@ def generate_prediction(summary, api_key):
     prediction = generate_ai_response(prompt, api_key)
     return prediction
 
-def summarize_anomalies(anomaly_dates):
-    summary = {}
-    summary = defaultdict(int)
-    for date in anomaly_dates:
-        month_year = date.strftime("%B %Y")
-        if month_year in summary:
-            summary[month_year] += 1
-        else:
-            summary[month_year] = 1
+def rule_based_outlook(df):
+    """Deterministic outcome category from the recent return and volatility."""
+    returns = df['Close'].pct_change().dropna().tail(OUTLOOK_WINDOW)
+    if returns.empty:
+        return "Not enough price history for an outlook."
+    period_return = (1 + returns).prod() - 1
+    outcome = next((name for threshold, name in OUTLOOK_THRESHOLDS if period_return >= threshold), 'Higher Loss')
+    return (f"<strong>{outcome}</strong>: NEAR-USD moved {period_return:+.1%} over the last {len(returns)} trading days "
+            f"with a daily volatility of {returns.std():.2%}, and fell on {(returns < 0).mean():.0%} of those days.")
+
+def rule_based_anomaly_summary(anomaly_report, bucket):
+    """Deterministic digest of the bucketed anomaly report sent to the LLM."""
+    worst = anomaly_report.loc[anomaly_report['score_max'].idxmax()]
+    busiest = anomaly_report.loc[anomaly_report['count'].idxmax()]
+    severities = anomaly_report['severity'].value_counts()
+    summary = f"{int(anomaly_report['count'].sum())} anomalies fall in {len(anomaly_report)} {bucket} buckets "
+    summary += f"({severities.get('high', 0)} high and {severities.get('medium', 0)} medium severity).<br>"
+    summary += f"The most severe was {worst['label']} with a peak score of {worst['score_max']:.3f}; "
+    summary += f"the most anomalies were in {busiest['label']} ({int(busiest['count'])})."
     return summary
 
-def generate_input_prompt(anomaly_summary):
-    prompt = "Here is a list of detected anomalies in particular months:\n\n"
-    for month_year, count in anomaly_summary.items():
-        prompt += f"{month_year}: {count} anomalies\n\n"
+def summarize_anomalies(anomaly_report):
+    return dict(zip(anomaly_report["label"], anomaly_report["count"]))
+
+def generate_input_prompt(anomaly_summary, bucket="month"):
+    prompt = f"Here is a list of detected anomalies per {bucket}:\n\n"
+    for label, count in anomaly_summary.items():
+        prompt += f"{label}: {count} anomalies\n\n"
     # Add more to the prompt as needed
     return prompt
 
-def anomaly_detection(df):
+def anomaly_detection(df, deadline=None):
     st.subheader("Anomaly Detection in NEAR-USD Trading Patterns")
 
     data = df[['Close']].copy()
     isolation_forest = IsolationForest(n_estimators=100, contamination='auto', random_state=42)
     anomalies = isolation_forest.fit_predict(data)
+    data['Score'] = anomaly_scores(isolation_forest, data[['Close']])
     data['Anomaly'] = anomalies
     anomaly_data = data[data['Anomaly'] == -1]
 
@@ -343,25 +453,30 @@ def anomaly_detection(df):
     plt.close()
 
     if not anomaly_data.empty:
-        anomaly_dates = sorted(anomaly_data.index.to_list())  # Ensure these are datetime objects
-        anomaly_summary = summarize_anomalies(anomaly_dates)
-        input_prompt = generate_input_prompt(anomaly_summary)
+        bucket = st.radio("Group anomalies by", list(BUCKETS), index=2, horizontal=True, key="anomaly_bucket")
+        anomaly_report = aggregate_anomalies(data['Score'], data['Anomaly'] == -1, bucket)
+        st.dataframe(anomaly_report.set_index("label")[["count", "severity", "score_median", "score_p90", "score_max"]])
+        # Only the most severe buckets go to the LLM so day buckets over long histories stay within the prompt size
+        anomaly_report = most_severe(anomaly_report, MAX_PROMPT_BUCKETS)
+        anomaly_summary = summarize_anomalies(anomaly_report)
+        input_prompt = generate_input_prompt(anomaly_summary, bucket)
         
         # Display the input prompt
         st.markdown(f"<div style='padding: 10px; border-radius: 10px; background-color: #e1f5fe; margin-bottom: 10px;'>👤 <strong>Input prompt:</strong><br>{input_prompt}</div>", unsafe_allow_html=True)
 
-        analytics_prompt = generate_anomaly_analytics_prompt(anomaly_dates)
-        analytics_response = generate_ai_response_anomaly(analytics_prompt, st.secrets["API_KEY"])
+        analytics_prompt = generate_anomaly_analytics_prompt(anomaly_report, bucket)
+        api_key = st.secrets["API_KEY"]
 
-        # Splitting the response into individual lines and adding line breaks for Streamlit
-        response_lines = analytics_response.split("\n")
-        formatted_response = "<br>".join(response_lines)
+        def analyse():
+            # Splitting the response into individual lines and adding line breaks for Streamlit
+            return "<br>".join(generate_ai_response_anomaly(analytics_prompt, api_key).split("\n"))
 
-        st.markdown(f"""
+        ai_box("anomaly_analysis", analytics_prompt, analyse, rule_based_anomaly_summary(anomaly_report, bucket),
+               deadline or page_deadline(PAGE_BUDGET), """
         <div style='padding: 10px; border-radius: 10px; background-color: #f0f4c3; margin-bottom: 10px;'>
-            🤖 <strong>Anomaly Analysis:</strong><br>{formatted_response}
+            🤖 <strong>Anomaly Analysis:</strong><br>{text}
         </div>
-        """, unsafe_allow_html=True)
+        """)
     else:
         st.markdown(f"""
         <div style="background-color:#f0f2f6;padding:10px;border-radius:10px;margin-bottom:10px;">
@@ -375,6 +490,8 @@ def app():
     st.title('🕵🏻 Real Time Insights and Anomaly detection')
     start_date = st.date_input("Start Date", value=pd.to_datetime('2023-01-01'))
     end_date = st.date_input("End Date", value=pd.to_datetime('today'))
+    deadline = page_deadline(PAGE_BUDGET)
+    near_blocks_stats = submit_near_blocks_stats()
     df = get_near_data(start_date, end_date)
 
     if not df.empty:
@@ -382,18 +499,21 @@ def app():
         statistical_analysis(df)
         distribution_fitting(df)
         value_at_risk(df)
-        time_series_forecast(df)
+        forecast = time_series_forecast(df)
         covariance_correlations(df)
+        rolling_risk(df)
         stock_statistics(df)
         beta_calculation(df)
+        validation = stock_price_predictions(df)
         linear_regression(df)
         # Anomaly Detection
-        anomaly_detection(df)
+        anomaly_detection(df, deadline)
         # Generate summary and prediction
-        summary = summarize_findings(df)
-        prediction = generate_prediction(summary, st.secrets["API_KEY"])
+        summary = summarize_findings(df, near_blocks_stats.result(), validation, forecast)
+        api_key = st.secrets["API_KEY"]
         st.subheader("Investment Outcome Prediction")
-        st.markdown(f"<div style='padding: 10px; border-radius: 10px; background-color: #f0f4c3; margin-bottom: 10px;'>🤖 <strong>Investment predictions response:</strong><br>{prediction}</div>", unsafe_allow_html=True)
+        ai_box("investment_prediction", summary, lambda: generate_prediction(summary, api_key), rule_based_outlook(df), deadline,
+               "<div style='padding: 10px; border-radius: 10px; background-color: #f0f4c3; margin-bottom: 10px;'>🤖 <strong>Investment predictions response:</strong><br>{text}</div>")
 
 if __name__ == "__main__":
     app()
\ No newline at end of file
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+# Bucket name -> (pandas frequency, label format)
+BUCKETS = {
+    "day": ("D", "%d %B %Y"),
+    "week": ("W-SUN", "Week ending %d %B %Y"),
+    "month": ("M", "%B %Y"),
+}
+# Quantiles of the detector's scores over all points that mark medium and high severity
+SEVERITY_QUANTILES = {"medium": 0.95, "high": 0.99}
+
+def anomaly_scores(model, X):
+    """IsolationForest scores flipped so that higher means more anomalous."""
+    return -model.score_samples(X)
+
+def aggregate_anomalies(scores, flags, bucket="month"):
+    """Group flagged points into day/week/month buckets with per-bucket severity.
+
+    scores is a Series of anomaly scores over the full datetime index (higher = more anomalous)
+    and flags a boolean Series marking the detected anomalies. Returns one row per non-empty
+    bucket, oldest first, with count, median/p90/max score, severity and a display label.
+    """
+    freq, label_format = BUCKETS[bucket]
+    thresholds = scores.quantile(list(SEVERITY_QUANTILES.values())).to_numpy()
+    flagged = scores[flags.to_numpy()]
+    if flagged.empty:
+        return pd.DataFrame(columns=["count", "score_median", "score_p90", "score_max", "severity", "label"])
+
+    grouped = flagged.groupby(pd.Grouper(freq=freq))
+    report = pd.DataFrame({
+        "count": grouped.size(),
+        "score_median": grouped.median(),
+        "score_p90": grouped.quantile(0.9),
+        "score_max": grouped.max(),
+    })
+    report = report[report["count"] > 0]
+    levels = np.searchsorted(thresholds, report["score_max"].to_numpy(), side="right")
+    report["severity"] = np.array(["low", *SEVERITY_QUANTILES])[levels]
+    report["label"] = report.index.strftime(label_format)
+    return report
+
+def most_severe(report, limit):
+    """The `limit` buckets with the highest peak score, back in time order."""
+    return report.nlargest(limit, "score_max").sort_index() if len(report) > limit else report
@@ -0,0 +1,104 @@
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from numpy.lib.stride_tricks import sliding_window_view
+from sklearn.linear_model import LinearRegression
+
+LAGS = 5  # Past daily log returns used to predict the next one
+MIN_TRAIN = 90  # Rows in the first training window
+TEST_ROWS = 30  # Rows scored per fold; folds are anchored at the start so adding days only adds folds
+N_JOBS = -1
+CACHE_SIZE = 512  # Fold results kept, keyed by the hash of the data they saw
+FOLD_COLUMNS = ["Fold", "Train days", "Test start", "Test end", "Test rows", "RMSE", "Naive RMSE", "Directional accuracy"]
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+def lag_features(close, lags=LAGS):
+    """Rows of the last `lags` daily log returns and the next day's log return as the target.
+
+    Row j ends at close[j + lags] and its target is the return to close[j + lags + 1].
+    """
+    returns = np.diff(np.log(np.asarray(close, dtype=np.float64)))
+    return sliding_window_view(returns, lags)[:-1], returns[lags:]
+
+def expanding_folds(rows, min_train=MIN_TRAIN, test_rows=TEST_ROWS):
+    """(train end, test end) row bounds: each fold trains on everything before its test block."""
+    return [(start, min(start + test_rows, rows)) for start in range(min_train, rows, test_rows)]
+
+def _fit_fold(close, X, y, train_end, test_end, lags):
+    model = LinearRegression().fit(X[:train_end], y[:train_end])
+    predicted = model.predict(X[train_end:test_end])
+    actual = y[train_end:test_end]
+    base = close[train_end + lags:test_end + lags]
+    # Errors are measured on the next close in USD; the naive forecast is today's close
+    errors = base * np.expm1(predicted) - base * np.expm1(actual)
+    naive = base * np.expm1(actual)
+    return {
+        "rmse": float(np.sqrt(np.mean(errors ** 2))),
+        "naive_rmse": float(np.sqrt(np.mean(naive ** 2))),
+        "hits": int(np.count_nonzero(np.sign(predicted) == np.sign(actual))),
+        "predicted": base * np.exp(predicted),
+    }
+
+def _fold_key(close, train_end, test_end, lags):
+    # A fold only sees closes up to its last target, so it stays valid while later days are added
+    digest = hashlib.sha1(close[:test_end + lags + 1].tobytes()).hexdigest()
+    return digest, train_end, test_end, lags
+
+def _cached_fold(close, X, y, train_end, test_end, lags):
+    key = _fold_key(close, train_end, test_end, lags)
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    result = _fit_fold(close, X, y, train_end, test_end, lags)
+    with _lock:
+        _cache[key] = result
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
+
+def walk_forward(close, lags=LAGS, min_train=MIN_TRAIN, test_rows=TEST_ROWS, n_jobs=N_JOBS):
+    """Expanding-window backtest of a linear model on lagged returns predicting the next close.
+
+    close is a Series with a datetime index; missing closes are dropped. Returns the per-fold
+    metrics and the out-of-sample predictions next to the actual closes.
+    """
+    close = close.dropna()
+    values = close.to_numpy(dtype=np.float64)
+    X, y = lag_features(values, lags)
+    folds = expanding_folds(len(y), min_train, test_rows)
+    if not folds:
+        return pd.DataFrame(columns=FOLD_COLUMNS), pd.DataFrame(columns=["Actual", "Predicted"])
+    # Folds are small least-squares fits that release the GIL, so threads avoid process start-up and copies
+    results = Parallel(n_jobs=n_jobs, prefer="threads")(
+        delayed(_cached_fold)(values, X, y, train_end, test_end, lags) for train_end, test_end in folds)
+
+    dates = close.index[lags + 1:]  # Date of each row's target close
+    table = pd.DataFrame([(number, train_end, dates[train_end], dates[test_end - 1], test_end - train_end,
+                           result["rmse"], result["naive_rmse"], result["hits"] / (test_end - train_end))
+                          for number, ((train_end, test_end), result) in enumerate(zip(folds, results), 1)], columns=FOLD_COLUMNS)
+    start = folds[0][0]
+    predictions = pd.DataFrame({"Actual": values[start + lags + 1:], "Predicted": np.concatenate([r["predicted"] for r in results])},
+                               index=dates[start:])
+    return table, predictions
+
+def overall(table):
+    """Metrics over every scored day: RMSE, naive RMSE, skill against the naive forecast and directional accuracy."""
+    if table.empty:
+        return None
+    rows = table["Test rows"]
+    rmse = float(np.sqrt((table["RMSE"] ** 2 * rows).sum() / rows.sum()))
+    naive_rmse = float(np.sqrt((table["Naive RMSE"] ** 2 * rows).sum() / rows.sum()))
+    return {
+        "folds": len(table),
+        "days": int(rows.sum()),
+        "rmse": rmse,
+        "naive_rmse": naive_rmse,
+        "skill": 1 - rmse / naive_rmse if naive_rmse else 0.0,
+        "directional_accuracy": float((table["Directional accuracy"] * rows).sum() / rows.sum()),
+    }
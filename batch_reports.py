@@ -0,0 +1,110 @@
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from nearblocks import get_json, BACKGROUND
+from llm_gateway import last_failed
+from payloads import CONTRACT_FIELDS, DEPLOYMENTS_FIELDS, INVENTORY_FIELDS, TOKENS_FIELDS
+from prompts import (format_for_openai_account, format_inventory_for_openai, format_tokens_for_openai,
+                     format_deployments_for_openai, format_contract_access_for_openai, generate_ai_response)
+
+# Report sections: (endpoint, formatter, fields read); the paths mirror what the Explorer Pro page fetches
+SECTIONS = {
+    "account": ("/v1/account/{account_id}", format_for_openai_account, None),
+    "contract": ("/v1/account/{account_id}/contract", format_contract_access_for_openai, CONTRACT_FIELDS),
+    "deployments": ("/v1/account/{account_id}/contract/deployments", format_deployments_for_openai, DEPLOYMENTS_FIELDS),
+    "inventory": ("/v1/account/{account_id}/inventory", format_inventory_for_openai, INVENTORY_FIELDS),
+    "tokens": ("/v1/account/{account_id}/tokens", format_tokens_for_openai, TOKENS_FIELDS),
+}
+RETRIES = 4
+
+def fetch_section(path, account_id, network, fields=None):
+    # Pacing and 429 backoff come from the shared scheduler; background requests leave room for page loads
+    for attempt in range(RETRIES):
+        data = get_json(network, path.format(account_id=account_id), timeout=30, priority=BACKGROUND, session_id="batch", fields=fields)
+        if data is not None:
+            return data
+        time.sleep(2 ** attempt)
+    raise RuntimeError(f"Failed to fetch {path.format(account_id=account_id)}")
+
+def fetch_response(name, prompt, api_key):
+    # The gateway returns busy, timeout and error messages as text; only a real answer goes into the report
+    for attempt in range(RETRIES):
+        response = generate_ai_response(prompt, api_key)
+        if not last_failed():
+            return response
+        time.sleep(2 ** attempt)
+    raise RuntimeError(f"No AI response for the {name} section: {response}")
+
+def build_report(account_id, network, llm=False, api_key=None):
+    """Fetch and format every section for one account, optionally asking the LLM about each prompt."""
+    lookup_id = account_id.replace('.poolv1', '')
+    report = {"account_id": account_id, "network": network, "prompts": {}, "responses": {}}
+    for name, (path, formatter, fields) in SECTIONS.items():
+        data = fetch_section(path, account_id if name == "account" else lookup_id, network, fields)
+        prompt = formatter(data)
+        if prompt is None:
+            continue
+        report["prompts"][name] = prompt
+        if llm:
+            report["responses"][name] = fetch_response(name, prompt, api_key)
+    return report
+
+def completed_accounts(output_path):
+    """Account ids already reported successfully, so a rerun resumes where the last one stopped."""
+    done = set()
+    if os.path.exists(output_path):
+        with open(output_path) as output_file:
+            for line in output_file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # A line cut off by an interrupted run
+                if record.get("status") == "ok":
+                    done.add(record["account_id"])
+    return done
+
+def run_batch(account_ids, network, output_path, workers=8, llm=False, api_key=None):
+    done = completed_accounts(output_path)
+    pending = [account_id for account_id in dict.fromkeys(account_ids) if account_id not in done]
+    write_lock = threading.Lock()
+    succeeded = failed = 0
+
+    with open(output_path, "a") as output_file, ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(build_report, account_id, network, llm, api_key): account_id for account_id in pending}
+        for future in as_completed(futures):
+            account_id = futures[future]
+            try:
+                record = {**future.result(), "status": "ok"}
+                succeeded += 1
+            except Exception as error:
+                record = {"account_id": account_id, "network": network, "status": "error", "error": str(error)}
+                failed += 1
+            record["generated_at"] = datetime.now(timezone.utc).isoformat()
+            with write_lock:
+                output_file.write(json.dumps(record) + "\n")
+                output_file.flush()
+    return {"skipped": len(set(account_ids)) - len(pending), "succeeded": succeeded, "failed": failed}
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate NearVision account reports for many accounts.")
+    parser.add_argument("accounts", help="File with one account id per line")
+    parser.add_argument("--network", choices=["Testnet", "Mainnet"], default="Mainnet")
+    parser.add_argument("--output", default="reports.jsonl", help="JSONL file; existing successful accounts are skipped")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--llm", action="store_true", help="Also generate an AI response for every prompt")
+    args = parser.parse_args()
+
+    with open(args.accounts) as accounts_file:
+        account_ids = [line.strip() for line in accounts_file if line.strip()]
+    api_key = os.environ.get("OPENAI_API_KEY") if args.llm else None
+    if args.llm and not api_key:
+        parser.error("--llm needs the OPENAI_API_KEY environment variable")
+    summary = run_batch(account_ids, args.network, args.output, args.workers, args.llm, api_key)
+    print(f"{summary['succeeded']} reports written, {summary['failed']} failed, {summary['skipped']} already done")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+import argparse
+import importlib
+import json
+import os
+import platform
+import statistics
+import time
+import numpy as np
+import pandas as pd
+import synthetic_chain
+
+BASELINE_FILE = "benchmarks_baseline.json"
+TOLERANCE = 0.25  # A case counts as regressed when its median is this much slower than the baseline
+# Payload sizes: a normal page worth of data, and whale accounts / long histories
+SIZES = {
+    "realistic": {"inventory": 50, "contract_keys": 20, "deployments": 10, "rows": 1000, "candle_days": 365, "candle_freq": "D", "var_paths": 100000},
+    "whale": {"inventory": 10000, "contract_keys": 2000, "deployments": 500, "rows": 100000, "candle_days": 3650, "candle_freq": "H", "var_paths": 1000000},
+}
+
+# --- Synthetic market payloads; NearBlocks payloads come from synthetic_chain ----------------------------
+
+def _rng():
+    return np.random.default_rng(0)
+
+def make_inventory(count):
+    return synthetic_chain.make_inventory(count // 2, count - count // 2)
+
+def make_rows(generator):
+    return lambda count: list(generator(count))
+
+def make_candles(days, freq):
+    rng = _rng()
+    index = pd.date_range(end="2024-01-01", periods=days * (24 if freq == "H" else 1), freq=freq, tz="UTC")
+    close = 5 * np.exp(np.cumsum(rng.normal(0, 0.02, len(index))))
+    return pd.DataFrame({"Open": close * (1 + rng.normal(0, 0.005, len(index))), "High": close * 1.01, "Low": close * 0.99,
+                         "Close": close, "Volume": rng.uniform(1e6, 1e8, len(index))}, index=index)
+
+# --- Cases: name -> function(size) returning the zero-argument call to time -----------------------------
+
+def _prompt(name, payload, *args):
+    def setup(size):
+        function = getattr(importlib.import_module("prompts"), name)
+        data = payload(size)
+        return lambda: function(data, *args)
+    return setup
+
+def _analytics(name):
+    def setup(size):
+        function = getattr(importlib.import_module("analytics"), name)
+        df = make_candles(size["candle_days"], size["candle_freq"])
+        return lambda: function(df)
+    return setup
+
+def _table(name, rows):
+    def setup(size):
+        function = getattr(importlib.import_module("transactions"), name)
+        data = rows(size["rows"])
+        return lambda: function(data)
+    return setup
+
+def _block_window(size):
+    block_metrics = importlib.import_module("block_metrics")
+    frame = block_metrics.blocks_to_frame(list(synthetic_chain.iter_blocks(size["rows"])))
+    return lambda: block_metrics.analyze_block_window(frame, block_metrics.MOVING_AVERAGE_WINDOW)
+
+def _downsample(size):
+    chart_data = importlib.import_module("chart_data")
+    df = make_candles(size["candle_days"], size["candle_freq"]).reset_index(names="date")
+    return lambda: chart_data.lttb(df["date"].astype("int64").to_numpy(), df["Close"].to_numpy(), 1200)
+
+def _anomalies(size):
+    anomaly_report = importlib.import_module("anomaly_report")
+    close = make_candles(size["candle_days"], size["candle_freq"])["Close"]
+    scores = (close - close.rolling(24, min_periods=1).mean()).abs()
+    return lambda: anomaly_report.aggregate_anomalies(scores, scores > scores.quantile(0.97), "week")
+
+def _sensitivity(size):
+    market_sensitivity = importlib.import_module("market_sensitivity")
+    returns = _rng().normal(0, 0.02, (size["candle_days"], 6))
+    return lambda: market_sensitivity.sensitivity(returns)
+
+def _decode(size):
+    payloads = importlib.import_module("payloads")
+    body = json.dumps(make_inventory(size["inventory"])).encode()
+    chunks = [body[i:i + payloads.CHUNK_SIZE] for i in range(0, len(body), payloads.CHUNK_SIZE)]
+    return lambda: payloads.decode_chunks(chunks, payloads.INVENTORY_FIELDS)
+
+def _risk(size):
+    risk = importlib.import_module("risk")
+    close = make_candles(size["candle_days"], size["candle_freq"])["Close"].to_numpy()
+    return lambda: risk.risk_table(close, paths=size["var_paths"])
+
+def _rolling(size):
+    rolling_metrics = importlib.import_module("rolling_metrics")
+    candles = make_candles(size["candle_days"], size["candle_freq"])
+    returns, market = np.log(candles["Close"]).diff().dropna(), np.log(candles["Open"]).diff().dropna()
+    periods = rolling_metrics.periods_per_year(candles.index)
+    windows = [round(days * periods / 365) for days in (7, 30, 90, 365)]
+    return lambda: (rolling_metrics.rolling_volatility(returns, windows, periods), rolling_metrics.rolling_sharpe(returns, windows, periods),
+                    rolling_metrics.rolling_beta(returns, market, windows), rolling_metrics.drawdowns(candles["Close"]))
+
+CASES = {
+    "prompts.format_stats_for_prompt_home": _prompt("format_stats_for_prompt_home", lambda size: synthetic_chain.make_stats(), "Mainnet"),
+    "prompts.format_inventory_for_openai": _prompt("format_inventory_for_openai", lambda size: make_inventory(size["inventory"])),
+    "prompts.format_for_openai_inventory": _prompt("format_for_openai_inventory", lambda size: make_inventory(size["inventory"])),
+    "prompts.format_contract_access_for_openai": _prompt("format_contract_access_for_openai", lambda size: synthetic_chain.make_contract(size["contract_keys"])),
+    "prompts.format_smart_contract_info": _prompt("format_smart_contract_info", lambda size: synthetic_chain.make_contract(size["contract_keys"])),
+    "prompts.format_deployments_for_openai": _prompt("format_deployments_for_openai", lambda size: synthetic_chain.make_deployments(size["deployments"])),
+    "transactions.build_transactions_table": _table("build_transactions_table", make_rows(synthetic_chain.iter_txns)),
+    "transactions.build_blocks_table": _table("build_blocks_table", make_rows(synthetic_chain.iter_blocks)),
+    "block_metrics.analyze_block_window": _block_window,
+    "chart_data.lttb": _downsample,
+    "anomaly_report.aggregate_anomalies": _anomalies,
+    "market_sensitivity.sensitivity": _sensitivity,
+    "payloads.decode_chunks": _decode,
+    "risk.risk_table": _risk,
+    "rolling_metrics": _rolling,
+    "analytics.statistical_analysis": _analytics("statistical_analysis"),
+    "analytics.value_at_risk": _analytics("value_at_risk"),
+    "analytics.time_series_forecast": _analytics("time_series_forecast"),
+    "analytics.covariance_correlations": _analytics("covariance_correlations"),
+    "analytics.stock_statistics": _analytics("stock_statistics"),
+    "analytics.stock_price_predictions": _analytics("stock_price_predictions"),
+    "analytics.linear_regression": _analytics("linear_regression"),
+}
+
+def measure(call, repeat, min_time=0.2):
+    """Median and best seconds per call; fast calls are looped until one sample takes at least min_time / repeat."""
+    call()  # Warm up caches and lazy imports
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            call()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / repeat or loops >= 10 ** 6:
+            break
+        loops *= 10
+    samples = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            call()
+        samples.append((time.perf_counter() - start) / loops)
+    return statistics.median(samples), min(samples)
+
+def run(sizes, name_filter=None, repeat=5):
+    results, skipped = {}, {}
+    for size_name in sizes:
+        for name, setup in CASES.items():
+            if name_filter and name_filter not in name:
+                continue
+            key = f"{name}[{size_name}]"
+            try:
+                call = setup(SIZES[size_name])
+            except ImportError as error:
+                skipped[key] = str(error)
+                continue
+            median, best = measure(call, repeat)
+            results[key] = {"median": median, "min": best}
+            print(f"{key:<60} {median * 1e3:>12.3f} ms  (min {best * 1e3:.3f} ms)", flush=True)
+    return results, skipped
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Regressed cases as (name, baseline seconds, current seconds)."""
+    regressions = []
+    for key, result in results.items():
+        if key in baseline["results"]:
+            before = baseline["results"][key]["median"]
+            ratio = result["median"] / before if before else 1.0
+            print(f"{key:<60} {ratio:>6.2f}x {'REGRESSED' if ratio > 1 + tolerance else ''}")
+            if ratio > 1 + tolerance:
+                regressions.append((key, before, result["median"]))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the CPU-bound formatters, table builders and analytics on synthetic payloads.")
+    parser.add_argument("--size", choices=[*SIZES, "all"], default="all")
+    parser.add_argument("--filter", help="Only run cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store these timings as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="Exit non-zero if any case is slower than the baseline allows")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args()
+
+    # Streamlit calls inside the analytics functions run without a server; their warnings are noise here
+    os.environ.setdefault("STREAMLIT_LOGGER_LEVEL", "error")
+    # Formatters only need the gateway importable; the offline provider never touches the network
+    os.environ.setdefault("LLM_PROVIDER", "mock")
+    results, skipped = run(list(SIZES) if args.size == "all" else [args.size], args.filter, args.repeat)
+    for key, reason in skipped.items():
+        print(f"{key:<60} skipped ({reason})")
+
+    if args.save_baseline:
+        baseline = {"python": platform.python_version(), "machine": platform.machine(), "results": results}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as baseline_file:
+                # Keep cases that were filtered out of this run
+                baseline["results"] = {**json.load(baseline_file)["results"], **results}
+        with open(args.baseline, "w") as baseline_file:
+            json.dump(baseline, baseline_file, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+    if args.compare:
+        with open(args.baseline) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.tolerance)
+        for key, before, after in regressions:
+            print(f"Regression: {key} {before * 1e3:.3f} ms -> {after * 1e3:.3f} ms")
+        if regressions:
+            raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
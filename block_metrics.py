@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+from nearblocks import fetch_pages, LOOKUP
+from payloads import BLOCKS_FIELDS
+from network_metrics import observe
+
+BLOCKS_PER_PAGE = 25
+DEFAULT_WINDOW = 1000  # Number of recent blocks the health judgments are based on: 40 pages, about 18 minutes of chain
+MOVING_AVERAGE_WINDOW = 50
+
+# Function to fetch the most recent `count` blocks as a flat, height-sorted DataFrame
+@st.cache_data(ttl=30, max_entries=20, show_spinner=False)
+def fetch_recent_blocks(network, count=DEFAULT_WINDOW, _session_id=None):
+    # A multi-page crawl queues as a lookup so page loads go first; _session_id (not part of the cache key)
+    # keeps a call from a worker thread in its viewer's round-robin turn
+    pages = range(1, -(-count // BLOCKS_PER_PAGE) + 1)
+    blocks = fetch_pages(network, "/v1/blocks", "blocks", pages, per_page=BLOCKS_PER_PAGE, priority=LOOKUP,
+                         fields=BLOCKS_FIELDS, session_id=_session_id)
+    observe(network, blocks=blocks)
+    return blocks_to_frame(blocks)
+
+def blocks_to_frame(blocks):
+    """Flatten NearBlocks block rows into typed columns, deduplicated and sorted by height."""
+    if not blocks:
+        return pd.DataFrame(columns=['block_height', 'block_timestamp', 'author_account_id', 'gas_used', 'gas_limit', 'transactions_count'])
+    frame = pd.DataFrame({
+        'block_height': np.array([block["block_height"] for block in blocks], dtype=np.int64),
+        # Timestamps are nanosecond strings; keep them as int64 so no precision is lost
+        'block_timestamp': np.array([block["block_timestamp"] for block in blocks]).astype(np.int64),
+        'author_account_id': [block["author_account_id"] for block in blocks],
+        'gas_used': np.array([block["chunks_agg"]["gas_used"] for block in blocks], dtype=np.int64),
+        'gas_limit': np.array([block["chunks_agg"]["gas_limit"] for block in blocks], dtype=np.int64),
+        'transactions_count': np.array([block["transactions_agg"]["count"] for block in blocks], dtype=np.int64),
+    })
+    # Pages shift while new blocks arrive during the crawl, so the same block can appear twice
+    return frame.drop_duplicates('block_height').sort_values('block_height', ignore_index=True)
+
+def moving_average(values, window):
+    """Trailing moving average via cumulative sums, NaN until the window is full."""
+    values = np.asarray(values, dtype=np.float64)
+    result = np.full(len(values), np.nan)
+    window = max(1, min(window, len(values)))
+    if len(values) == 0:
+        return result
+    csum = np.concatenate(([0.0], np.cumsum(values)))
+    result[window - 1:] = (csum[window:] - csum[:-window]) / window
+    return result
+
+def analyze_block_window(frame, ma_window=MOVING_AVERAGE_WINDOW):
+    """Compute block time, throughput and gas utilisation statistics over a window of blocks.
+
+    Returns a summary dict and a per-block DataFrame with the moving-average series for charting.
+    """
+    if len(frame) < 2:
+        return {}, pd.DataFrame()
+
+    timestamps = frame['block_timestamp'].to_numpy(dtype=np.int64)
+    transactions = frame['transactions_count'].to_numpy(dtype=np.float64)
+    gas_used = frame['gas_used'].to_numpy(dtype=np.float64)
+    gas_limit = frame['gas_limit'].to_numpy(dtype=np.float64)
+
+    # Integer nanosecond diffs, converted to seconds only once at the end
+    block_times = np.diff(timestamps) / 1e9
+    span_seconds = (timestamps[-1] - timestamps[0]) / 1e9
+    utilisation = np.divide(gas_used, gas_limit, out=np.zeros_like(gas_used), where=gas_limit > 0)
+
+    # Throughput over the trailing window: transactions included / time elapsed across those blocks
+    window = max(1, min(ma_window, len(timestamps) - 1))
+    tx_csum = np.concatenate(([0.0], np.cumsum(transactions)))
+    rolling_tps = np.full(len(timestamps), np.nan)
+    elapsed = (timestamps[window:] - timestamps[:-window]) / 1e9
+    rolling_tps[window:] = np.divide(tx_csum[window + 1:] - tx_csum[1:-window], elapsed, out=np.zeros_like(elapsed), where=elapsed > 0)
+
+    block_time_p50, block_time_p90, block_time_p99 = np.percentile(block_times, [50, 90, 99])
+    utilisation_p50, utilisation_p90, utilisation_p99 = np.percentile(utilisation, [50, 90, 99])
+    summary = {
+        'blocks': len(frame),
+        'span_seconds': span_seconds,
+        'block_time_mean': block_times.mean(),
+        'block_time_p50': block_time_p50,
+        'block_time_p90': block_time_p90,
+        'block_time_p99': block_time_p99,
+        'block_time_max': block_times.max(),
+        # Jitter: spread of block times around their mean
+        'block_time_jitter': block_times.std(),
+        'tps': transactions[1:].sum() / span_seconds if span_seconds > 0 else 0.0,
+        'utilisation_mean': utilisation.mean(),
+        'utilisation_p50': utilisation_p50,
+        'utilisation_p90': utilisation_p90,
+        'utilisation_p99': utilisation_p99,
+        'unique_producers': frame['author_account_id'].nunique(),
+    }
+
+    series = pd.DataFrame({
+        'block_height': frame['block_height'].to_numpy(),
+        'block_timestamp': pd.to_datetime(timestamps, unit='ns'),
+        'block_time': np.concatenate(([np.nan], block_times)),
+        'utilisation': utilisation,
+    })
+    series['block_time_ma'] = np.concatenate(([np.nan], moving_average(block_times, ma_window)))
+    series['utilisation_ma'] = moving_average(utilisation, ma_window)
+    series['tps_ma'] = rolling_tps
+    return summary, series
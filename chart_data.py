@@ -0,0 +1,100 @@
+import hashlib
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+CHART_WIDTH_PX = 1200  # Approximate plot width of a full-width chart in the wide layout
+POINTS_PER_PIXEL = 1
+CACHE_SIZE = 64
+
+# Downsampled series keyed by (source hash, columns, range, target, method)
+_cache = OrderedDict()
+
+def target_points(width_px=CHART_WIDTH_PX, points_per_pixel=POINTS_PER_PIXEL):
+    """Number of points worth sending for a chart of the given pixel width."""
+    return max(int(width_px * points_per_pixel), 10)
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: indices of n_out points that preserve the visual shape of (x, y)."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    # The first and last points are always kept, the rest are split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+        # The third triangle vertex is the average of the next bucket (or the last point)
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        if next_end > next_start:
+            avg_x, avg_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        else:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+        areas = np.abs((x[previous] - avg_x) * (y[start:end] - y[previous]) - (x[previous] - x[start:end]) * (avg_y - y[previous]))
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+    return selected
+
+def min_max(y, n_out):
+    """Indices of the minimum and maximum of each bucket, so spikes are never dropped."""
+    n = len(y)
+    buckets = max(n_out // 2, 1)
+    if n <= n_out:
+        return np.arange(n)
+    size = n // buckets
+    trimmed = y[:size * buckets].reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    indices = np.concatenate((offsets + np.nanargmin(trimmed, axis=1), offsets + np.nanargmax(trimmed, axis=1)))
+    if size * buckets < n:
+        tail = y[size * buckets:]
+        indices = np.concatenate((indices, size * buckets + np.array([np.nanargmin(tail), np.nanargmax(tail)])))
+    return np.unique(indices)
+
+def source_hash(df, columns):
+    """Stable content hash of the columns a chart is built from."""
+    hashed = pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+    return hashlib.sha1(hashed.tobytes()).hexdigest()
+
+def _numeric(values):
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.to_numpy(dtype='datetime64[ns]').astype(np.int64).astype(np.float64)
+    return pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64)
+
+def downsample(df, x, y, x_range=None, n_out=None, method='lttb'):
+    """Return the rows of df worth plotting for x against the y column(s).
+
+    x_range restricts the series to a zoomed window before downsampling, so zooming in
+    refines detail while the number of points sent to the browser stays the same.
+    """
+    columns = [y] if isinstance(y, str) else list(y)
+    n_out = n_out or target_points()
+    key = (source_hash(df, [x] + columns), x, tuple(columns), x_range, n_out, method)
+    if key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key]
+
+    frame = df.copy()
+    if not pd.api.types.is_numeric_dtype(frame[x]):
+        frame[x] = pd.to_datetime(frame[x])
+    frame = frame.sort_values(x, ignore_index=True)
+    if x_range is not None:
+        start, end = x_range
+        frame = frame[(frame[x] >= pd.Timestamp(start)) & (frame[x] <= pd.Timestamp(end))] if pd.api.types.is_datetime64_any_dtype(frame[x]) else frame[(frame[x] >= start) & (frame[x] <= end)]
+        frame = frame.reset_index(drop=True)
+
+    if len(frame) > n_out:
+        x_values = _numeric(frame[x])
+        keep = []
+        # Each series gets its share of the point budget; the union keeps every series' shape
+        per_series = max(n_out // len(columns), 3)
+        for column in columns:
+            y_values = np.nan_to_num(_numeric(frame[column]))
+            keep.append(lttb(x_values, y_values, per_series) if method == 'lttb' else min_max(y_values, per_series))
+        frame = frame.iloc[np.unique(np.concatenate(keep))].reset_index(drop=True)
+
+    _cache[key] = frame
+    if len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return frame
@@ -0,0 +1,112 @@
+import os
+import threading
+import time
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from nearblocks import get_json
+
+DATA_DIR = os.path.join(".cache", "charts")
+REFRESH_SECONDS = 600  # Today's row only moves slowly, so refresh at most every 10 minutes
+RETRY_SECONDS = 30  # First wait after a failed refresh, doubling per failure up to REFRESH_SECONDS
+
+_locks = {}  # network -> lock, so one network's download does not hold up the other's
+_locks_lock = threading.Lock()
+_failures = {}  # network -> (failed attempts in a row, time of the next attempt)
+
+def _network_lock(network):
+    with _locks_lock:
+        return _locks.setdefault(network, threading.Lock())
+
+def chart_path(network):
+    return os.path.join(DATA_DIR, f"charts_{network.lower()}.parquet")
+
+def _normalize(rows):
+    """Daily chart rows as a DataFrame with a datetime `date` column and numeric metrics."""
+    df = pd.DataFrame(rows)
+    if df.empty or 'date' not in df:
+        return pd.DataFrame()
+    df['date'] = pd.to_datetime(df['date']).dt.tz_localize(None).dt.normalize()
+    for column in df.columns.drop('date'):
+        converted = pd.to_numeric(df[column], errors='coerce')
+        # Keep text columns as they are, only convert columns that are really numeric
+        if converted.notna().sum() == df[column].notna().sum():
+            df[column] = converted
+    return df
+
+def _read(network):
+    path = chart_path(network)
+    return pq.read_table(path).to_pandas() if os.path.exists(path) else pd.DataFrame()
+
+def _write(network, df):
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = chart_path(network)
+    # Write to a temporary file first so readers never see a half written file
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path + ".tmp")
+    os.replace(path + ".tmp", path)
+
+def upsert_rows(stored, rows):
+    """Merge freshly fetched days into the stored history, the newer copy of a day wins."""
+    fresh = _normalize(rows)
+    if stored.empty:
+        return fresh.sort_values('date', ignore_index=True)
+    if fresh.empty:
+        return stored
+    merged = pd.concat([stored, fresh], ignore_index=True)
+    return merged.drop_duplicates('date', keep='last').sort_values('date', ignore_index=True)
+
+def _follows(stored, rows):
+    """Whether fetched rows overlap or directly follow the stored history, so merging them leaves no missing days."""
+    fresh = _normalize(rows)
+    return fresh.empty or fresh['date'].min() <= stored['date'].max() + pd.Timedelta(days=1)
+
+def refresh_chart_history(network, force=False):
+    """Bring the local history up to date, downloading the full series on first use or to fill a gap."""
+    path = chart_path(network)
+    with _network_lock(network):
+        if not force and os.path.exists(path) and time.time() - os.path.getmtime(path) < REFRESH_SECONDS:
+            return True
+        failures, retry_at = _failures.get(network, (0, 0))
+        if not force and time.time() < retry_at:
+            return os.path.exists(path)
+        stored = _read(network)
+        if stored.empty:
+            data = get_json(network, "/v1/charts")
+            if data is None:
+                # Fall back to the latest window when the full history endpoint is unavailable
+                data = get_json(network, "/v1/charts/latest")
+        else:
+            data = get_json(network, "/v1/charts/latest")
+            if data is not None and not _follows(stored, data.get("charts", [])):
+                # Stale for longer than the latest window covers: only the full series fills the gap
+                data = get_json(network, "/v1/charts")
+        if data is None:
+            _failures[network] = (failures + 1, time.time() + min(RETRY_SECONDS * 2 ** failures, REFRESH_SECONDS))
+            return not stored.empty
+        _failures.pop(network, None)
+        merged = upsert_rows(stored, data.get("charts", []))
+        if merged.empty:
+            return False
+        _write(network, merged)
+        return True
+
+def chart_history_bounds(network):
+    """First and last stored day, read from the date column only."""
+    path = chart_path(network)
+    if not os.path.exists(path):
+        return None, None
+    dates = pq.read_table(path, columns=['date']).column('date').to_pandas()
+    return (dates.min().date(), dates.max().date()) if len(dates) else (None, None)
+
+def load_chart_history(network, start_date=None, end_date=None, columns=None):
+    """Read the stored daily series, filtered to [start_date, end_date] while scanning the file."""
+    path = chart_path(network)
+    if not os.path.exists(path):
+        return pd.DataFrame()
+    filters = []
+    if start_date is not None:
+        filters.append(('date', '>=', pd.Timestamp(start_date)))
+    if end_date is not None:
+        filters.append(('date', '<=', pd.Timestamp(end_date)))
+    read_columns = None if columns is None else ['date'] + [column for column in columns if column != 'date']
+    return pq.read_table(path, columns=read_columns, filters=filters or None).to_pandas()
@@ -0,0 +1,39 @@
+import streamlit as st
+from nearblocks import executor, fetch_many
+
+COMPARE_OPTION = 'Compare Testnet & Mainnet'
+NETWORKS = ['Testnet', 'Mainnet']
+
+def fetch_both(paths):
+    """Fetch every path for both networks in one parallel batch; returns {network: {name: json}}."""
+    calls = {(network, name): (network, path) for network in NETWORKS for name, path in paths.items()}
+    results = fetch_many(calls)
+    return {network: {name: results[(network, name)] for name in paths} for network in NETWORKS}
+
+def submit_both(function, *args):
+    """Start function(network, *args) for both networks on the shared pool; returns {network: future}."""
+    return {network: executor.submit(function, network, *args) for network in NETWORKS}
+
+def format_delta(testnet_value, mainnet_value, fmt):
+    try:
+        delta = float(mainnet_value) - float(testnet_value)
+    except (TypeError, ValueError):
+        return "–"
+    return ("+" if delta > 0 else "") + fmt(delta)
+
+def display_comparison_table(rows):
+    """Render (label, testnet value, mainnet value, formatter) rows with a Mainnet − Testnet delta column."""
+    html ="<table class='compare-table'><thead><tr><th>Metric</th><th>Testnet</th><th>Mainnet</th><th>Δ (Mainnet − Testnet)</th></tr></thead><tbody>"
+    for label, testnet_value, mainnet_value, fmt in rows:
+        testnet_text = fmt(float(testnet_value)) if testnet_value is not None else "N/A"
+        mainnet_text = fmt(float(mainnet_value)) if mainnet_value is not None else "N/A"
+        html += f"<tr><td>{label}</td><td>{testnet_text}</td><td>{mainnet_text}</td><td>{format_delta(testnet_value, mainnet_value, fmt)}</td></tr>"
+    html += "</tbody></table>"
+    st.markdown(html, unsafe_allow_html=True)
+
+def first_count(data, key):
+    """Pull the count out of NearBlocks' {key: [{count: ...}]} responses."""
+    try:
+        return data[key][0]["count"]
+    except (TypeError, KeyError, IndexError):
+        return None
@@ -0,0 +1,120 @@
+import hashlib
+import itertools
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+
+# Damped-trend exponential smoothing (Holt) on log prices, in error-correction form:
+#   forecast = level + phi * trend;  level += alpha * error;  trend = phi * trend + beta * error
+ALPHAS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+BETAS = (0.0, 0.01, 0.05, 0.1)
+PHIS = (0.8, 0.9, 0.95, 0.98, 1.0)
+HORIZON = 30  # Rows forecast ahead
+BAND_LEVELS = (0.8, 0.95)
+CACHE_SIZE = 32  # Fitted grids kept, keyed by the hash of their data
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+def _digest(values):
+    return hashlib.sha1(values.tobytes()).hexdigest()
+
+def _smooth(alpha, beta, phi, level, trend, sse, values):
+    # One pass over the new rows for a block of configurations at once
+    level, trend, sse = level.copy(), trend.copy(), sse.copy()
+    for value in values.tolist():
+        forecast = level + phi * trend
+        error = value - forecast
+        sse += error * error
+        level = forecast + alpha * error
+        trend = phi * trend + beta * error
+    return level, trend, sse
+
+class SmoothingGrid:
+    """Every configuration of the grid fitted to one series, ready to be extended with new rows.
+
+    The fit is one-step-ahead, so each configuration's squared errors are honest forecast
+    errors and the best configuration is simply the one with the smallest sum.
+    """
+
+    def __init__(self, values, alphas=ALPHAS, betas=BETAS, phis=PHIS):
+        grid = np.array(list(itertools.product(alphas, betas, phis)), dtype=np.float64)
+        self.grid_key = (tuple(alphas), tuple(betas), tuple(phis))
+        self.alpha, self.beta, self.phi = grid.T
+        self.level = np.full(len(grid), values[0])
+        self.trend = np.zeros(len(grid))
+        self.sse = np.zeros(len(grid))
+        self.rows = 1
+        self.digest = _digest(values[:1])
+
+    def extend(self, values):
+        """Continue the fit over values[self.rows:]; values must start with the rows already fitted."""
+        new = values[self.rows:]
+        if not len(new):
+            return self
+        # The per-row loop overhead dominates at this grid size, so splitting the grid over processes does not pay
+        self.level, self.trend, self.sse = _smooth(self.alpha, self.beta, self.phi, self.level, self.trend, self.sse, new)
+        self.rows = len(values)
+        self.digest = _digest(values)
+        return self
+
+    def best(self):
+        return int(np.argmin(self.sse))
+
+    def params(self):
+        best = self.best()
+        return {"alpha": float(self.alpha[best]), "beta": float(self.beta[best]), "phi": float(self.phi[best])}
+
+    def forecast(self, horizon=HORIZON, levels=BAND_LEVELS):
+        """Log-scale point forecast and (lower, upper) bands for each level, h = 1..horizon."""
+        best = self.best()
+        alpha, beta, phi = self.alpha[best], self.beta[best], self.phi[best]
+        steps = np.arange(1, horizon + 1)
+        damped = np.cumsum(phi ** steps)  # phi + phi^2 + ... + phi^h
+        point = self.level[best] + damped * self.trend[best]
+        # Forecast variance of the additive damped-trend model: sigma^2 * (1 + sum of c_j^2 for j < h)
+        c = alpha + beta * damped[:-1]
+        variance = self.sse[best] / max(self.rows - 1, 1) * (1 + np.concatenate([[0.0], np.cumsum(c * c)]))
+        spread = {level: norm.ppf(0.5 + level / 2) * np.sqrt(variance) for level in levels}
+        bands = {level: (point - width, point + width) for level, width in spread.items()}
+        return point, bands
+
+def fit(values, alphas=ALPHAS, betas=BETAS, phis=PHIS):
+    """The fitted grid for values, from the cache, by extending a fit of an earlier prefix, or from scratch."""
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    grid_key = (tuple(alphas), tuple(betas), tuple(phis))
+    digest = _digest(values)
+    with _lock:
+        if (digest, grid_key) in _cache:
+            _cache.move_to_end((digest, grid_key))
+            return _cache[(digest, grid_key)]
+        # New candles usually just extend a series fitted on an earlier rerun
+        prefixes = [grid for grid in _cache.values()
+                    if grid.grid_key == grid_key and grid.rows < len(values) and grid.digest == _digest(values[:grid.rows])]
+    base = max(prefixes, key=lambda grid: grid.rows) if prefixes else None
+    grid = SmoothingGrid(values, alphas, betas, phis)
+    if base is not None:
+        # extend() replaces the state arrays rather than writing into them, so the shorter fit stays valid
+        grid.level, grid.trend, grid.sse, grid.rows = base.level, base.trend, base.sse, base.rows
+    grid.extend(values)
+    with _lock:
+        _cache[(digest, grid_key)] = grid
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return grid
+
+def forecast_close(close, horizon=HORIZON, levels=BAND_LEVELS):
+    """Forecast of a close Series with a datetime index, in prices, with lower/upper band columns per level.
+
+    Returns the forecast frame (indexed by the future dates) and the chosen smoothing parameters.
+    """
+    grid = fit(np.log(close.to_numpy(dtype=np.float64)))
+    point, bands = grid.forecast(horizon, levels)
+    step = close.index[-1] - close.index[-2]
+    frame = pd.DataFrame({"Forecast": np.exp(point)}, index=pd.date_range(close.index[-1] + step, periods=horizon, freq=step))
+    for level, (lower, upper) in bands.items():
+        frame[f"Lower {level:.0%}"] = np.exp(lower)
+        frame[f"Upper {level:.0%}"] = np.exp(upper)
+    return frame, grid.params()
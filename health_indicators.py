@@ -1,37 +1,73 @@
 import streamlit as st
-import requests
 from streamlit import secrets  # Import secrets to access your API key
-import openai
 import pandas as pd
+import numpy as np
 import plotly.express as px
 from datetime import datetime, timedelta
 from prompts import generate_network_summary_prompt, generate_ai_response
-
-def fetch_chart_data(network):
-    base_url = "https://api-testnet.nearblocks.io" if network == 'Testnet' else "https://api.nearblocks.io"
-    response = requests.get(f"{base_url}/v1/charts/latest")
-    if response.status_code == 200:
-        return pd.DataFrame(response.json()["charts"])
-    else:
+from block_metrics import fetch_recent_blocks, analyze_block_window, DEFAULT_WINDOW
+from chart_data import downsample
+from chart_store import refresh_chart_history, load_chart_history, chart_history_bounds
+from compare import COMPARE_OPTION, NETWORKS, fetch_both, submit_both, display_comparison_table, first_count
+from theme import stat_card
+from prompt_cache import complete
+from progressive import page_deadline, placeholder, render_when_ready, ai_box
+from nearblocks import executor, submit_json, current_session
+from network_metrics import metrics_for, WINDOWS
+
+PAGE_BUDGET = 4  # Seconds until a pending AI summary is replaced by the rule-based one
+QUANTILE_WINDOW = "Last hour"  # Window of the fee and gas percentile cards
+# Health rating points: (threshold for 2 points, threshold for 1 point)
+BLOCK_TIME_LIMITS = (1.3, 2.0)  # Seconds, lower is better
+NODES_ONLINE_LIMITS = (100, 30)
+PRODUCER_LIMITS = (50, 10)
+HEALTH_RATINGS = [(5, 'Excellent'), (4, 'Good'), (2, 'Moderate'), (0, 'Poor')]
+
+def submit_chart_refresh(network):
+    # Charts are served from the local history, which only fetches the newest days upstream
+    return executor.submit(refresh_chart_history, network)
+
+def display_chart_history(network, refreshed):
+    if not refreshed:
         st.error("Failed to fetch chart data")
-        return pd.DataFrame()
+        return
+    start_date, end_date = select_chart_history_range(network)
+    df = load_chart_history(network, start_date, end_date)
+    if not df.empty:
+        df['date'] = pd.to_datetime(df['date']).dt.date  # Convert to date for better readability
+        display_charts(df)
+
+def select_chart_history_range(network):
+    first_date, last_date = chart_history_bounds(network)
+    if first_date is None or first_date == last_date:
+        return None, None
+    selected = st.date_input("Chart history", value=(first_date, last_date), min_value=first_date, max_value=last_date, key=f"chart_history_{network}")
+    # The widget returns a single date while the user is still picking the range end
+    return selected if len(selected) == 2 else (selected[0], last_date)
 
 def display_charts(df):
+    # Zooming into a date range re-samples the visible window at full detail
+    first_date, last_date = min(df['date']), max(df['date'])
+    if first_date < last_date:
+        zoom = st.slider("Chart date range", min_value=first_date, max_value=last_date, value=(first_date, last_date), key="charts_zoom")
+    else:
+        zoom = None
+
     # Transaction Volume Chart
-    fig_txns = px.line(df, x='date', y='txns')
+    fig_txns = px.line(downsample(df, 'date', 'txns', x_range=zoom), x='date', y='txns')
     animate_and_style_chart(fig_txns, "Transaction Volume Over Time")
 
     # NEAR Price Chart
-    fig_price = px.line(df, x='date', y='near_price')
+    fig_price = px.line(downsample(df, 'date', 'near_price', x_range=zoom), x='date', y='near_price')
     animate_and_style_chart(fig_price, "NEAR Price Over Time")
 
 def calculate_and_display_metrics(df_blocks):
-    # Transactions Per Block
-    fig_transactions = px.bar(df_blocks, x='block_height', y='transactions_count')
+    # Transactions Per Block (min/max buckets keep the busiest blocks visible)
+    fig_transactions = px.bar(downsample(df_blocks, 'block_height', 'transactions_count', method='minmax'), x='block_height', y='transactions_count')
     animate_and_style_chart(fig_transactions, "Transactions Per Block")
 
     # Gas Used Per Block
-    fig_gas = px.bar(df_blocks, x='block_height', y='gas_used')
+    fig_gas = px.bar(downsample(df_blocks, 'block_height', 'gas_used', method='minmax'), x='block_height', y='gas_used')
     animate_and_style_chart(fig_gas, "Gas Used Per Block")
 
 def animate_and_style_chart(fig, title):
@@ -42,268 +78,192 @@ def animate_and_style_chart(fig, title):
 def calculate_avg_block_times(df_blocks):
     df_blocks = df_blocks.copy()  # Make a copy to avoid modifying the original DataFrame in place
     if not pd.api.types.is_datetime64_any_dtype(df_blocks['block_timestamp']):
-        df_blocks['block_timestamp'] = df_blocks['block_timestamp'].apply(lambda x: datetime(1970, 1, 1) + timedelta(seconds=int(x) // 1e9))
+        # Vectorised nanosecond conversion keeps sub-second precision
+        df_blocks['block_timestamp'] = pd.to_datetime(df_blocks['block_timestamp'].astype('int64'), unit='ns')
     df_blocks = df_blocks.sort_values('block_timestamp')
     df_blocks['block_time_diff'] = df_blocks['block_timestamp'].diff().dt.total_seconds().fillna(0)
     avg_block_time = df_blocks['block_time_diff'].mean()
 
     fig_block_times = px.line(df_blocks, x='block_timestamp', y='block_time_diff')
     animate_and_style_chart(fig_block_times, "Block Time Differences Over Time")
-    # Styling for the average block time box
-    st.markdown(f"""
-            <div style="
-                padding: 10px;
-                border-radius: 10px;
-                background-color: #f0f2f6;
-                border-left: 5px solid #4CAF50;
-                margin: 10px 0;
-                box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-                animation: fadeIn 1s ease-in-out;
-                ">
-                <h5 style="margin: 0; color: #333;">Average Block Time</h5>
-                <h3 style="margin: 5px 0; color: #4CAF50;">{avg_block_time:.2f} seconds</h3>
-            </div>
-            <style>
-            @keyframes fadeIn {{
-                0% {{ opacity: 0; }}
-                100% {{ opacity: 1; }}
-            }}
-            </style>
-        """, unsafe_allow_html=True)
+    st.markdown(stat_card("Average Block Time", f"{avg_block_time:.2f} seconds"), unsafe_allow_html=True)
     return df_blocks, avg_block_time
 
+def display_window_metric(title, value, color):
+    st.markdown(stat_card(title, value, color), unsafe_allow_html=True)
+
+def block_window_size(network):
+    # The slider's current value, readable before the slider itself is drawn
+    return st.session_state.get(f"block_window_{network}", DEFAULT_WINDOW)
+
+def display_block_window_controls(network):
+    st.markdown("<h3 style='text-align: center; color: #b34317;'>Block Time & Gas Utilisation Analysis</h3>", unsafe_allow_html=True)
+    st.select_slider("Blocks analysed", options=[500, DEFAULT_WINDOW, 2000, 5000], value=DEFAULT_WINDOW, key=f"block_window_{network}")
+
+def display_block_window_analysis(frame):
+    summary, series = analyze_block_window(frame)
+    if not summary:
+        st.error("Failed to fetch blocks for the analysis window")
+        return summary
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        display_window_metric("Block Time p50 / p90 / p99", f"{summary['block_time_p50']:.2f}s / {summary['block_time_p90']:.2f}s / {summary['block_time_p99']:.2f}s", "#4CAF50")
+    with col2:
+        display_window_metric("Block Time Jitter (std)", f"{summary['block_time_jitter']:.3f}s", "#668cff")
+    with col3:
+        display_window_metric("Throughput", f"{summary['tps']:.2f} tx/s", "#ff8c1a")
+    with col4:
+        display_window_metric("Gas Utilisation p50 / p90 / p99", f"{summary['utilisation_p50']:.1%} / {summary['utilisation_p90']:.1%} / {summary['utilisation_p99']:.1%}", "#8f428a")
+    st.caption(f"Based on {summary['blocks']} blocks spanning {summary['span_seconds'] / 60:.1f} minutes.")
+
+    fig_block_time = px.line(downsample(series, 'block_timestamp', ['block_time', 'block_time_ma'], method='minmax'), x='block_timestamp', y=['block_time', 'block_time_ma'])
+    animate_and_style_chart(fig_block_time, "Block Time and Moving Average")
+    fig_utilisation = px.line(downsample(series, 'block_timestamp', ['utilisation', 'utilisation_ma'], method='minmax'), x='block_timestamp', y=['utilisation', 'utilisation_ma'])
+    animate_and_style_chart(fig_utilisation, "Gas Utilisation (gas used / gas limit)")
+    fig_tps = px.line(downsample(series, 'block_timestamp', 'tps_ma'), x='block_timestamp', y='tps_ma')
+    animate_and_style_chart(fig_tps, "Throughput Moving Average (tx/s)")
+    # Bin on the server so only 50 bars are sent instead of every block's value
+    counts, edges = np.histogram(series['utilisation'], bins=50)
+    fig_distribution = px.bar(x=edges[:-1], y=counts, labels={'x': 'utilisation', 'y': 'blocks'})
+    animate_and_style_chart(fig_distribution, "Gas Utilisation Distribution")
+    return summary
+
 def fetch_blocks_data(network, limit=9):
-    base_url = "https://api-testnet.nearblocks.io" if network == 'Testnet' else "https://api.nearblocks.io"
-    response = requests.get(f"{base_url}/v1/blocks/latest?limit={limit}")
-    if response.status_code == 200:
-        data = response.json()["blocks"]
-        # Flatten nested JSON structures
-        for block in data:
-            block['gas_used'] = block['chunks_agg']['gas_used']
-            block['transactions_count'] = block['transactions_agg']['count']
-        return pd.DataFrame(data)
-    else:
-        st.error("Failed to fetch blocks data")
+    return submit_json(network, "/v1/blocks/latest", {"limit": limit}, "Failed to fetch blocks data")
+
+def blocks_frame(data):
+    if "error" in data:
+        st.error(data["error"])
         return pd.DataFrame()
+    data = data["blocks"]
+    # Flatten nested JSON structures
+    for block in data:
+        block['gas_used'] = block['chunks_agg']['gas_used']
+        block['transactions_count'] = block['transactions_agg']['count']
+    return pd.DataFrame(data)
 
 def fetch_stats_data(network):
-    base_url = "https://api-testnet.nearblocks.io" if network == 'Testnet' else "https://api.nearblocks.io"
-    response = requests.get(f"{base_url}/v1/stats")
-    if response.status_code == 200:
-        data = response.json()["stats"][0]  # Assuming there's only one stats object
-        return data
-    else:
-        st.error("Failed to fetch stats data")
+    return submit_json(network, "/v1/stats", error="Failed to fetch stats data")
+
+def read_stats(data):
+    if "error" in data:
+        st.error(data["error"])
         return {}
+    return data["stats"][0]  # Assuming there's only one stats object
+
+def read_count(data, key):
+    if "error" in data:
+        st.error(data["error"])
+        return 0
+    return data[key][0]["count"]
 
 def visualize_block_activity(df_blocks):
     # Using transactions_count as a proxy for block activity/size
-    fig_block_activity = px.line(df_blocks, x='block_timestamp', y='transactions_count', title='Block Activity Over Time')
+    fig_block_activity = px.line(downsample(df_blocks, 'block_timestamp', 'transactions_count'), x='block_timestamp', y='transactions_count', title='Block Activity Over Time')
     animate_and_style_chart(fig_block_activity, "Block Activity Over Time")
 
 def visualize_block_producers(df_blocks):
     # Count of unique block producers over time
     unique_producers = df_blocks['author_account_id'].nunique()
-    st.markdown(f"""
-        <div style="
-            padding: 10px;
-            border-radius: 10px;
-            background-color: #f0f2f6;
-            border-left: 5px solid #4CAF50;
-            margin: 10px 0;
-            box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-            animation: fadeIn 1s ease-in-out;
-            ">
-            <h5 style="margin: 0; color: #333;">Unique Block Producers </h5>
-            <h3 style="margin: 5px 0; color: #4CAF50;">{unique_producers}</h3>
-        </div>
-        <style>
-        @keyframes fadeIn {{
-            0% {{ opacity: 0; }}
-            100% {{ opacity: 1; }}
-        }}
-        </style>
-    """, unsafe_allow_html=True)
+    st.markdown(stat_card("Unique Block Producers", unique_producers), unsafe_allow_html=True)
+
+def display_unique_producers(network):
+    # Distinct producers over long windows, from every block this app has fetched for the network
+    metrics = metrics_for(network)
+    first_seen = metrics.producers.first_seen()
+    if first_seen is None:
+        return
+    for column, (label, seconds) in zip(st.columns(len(WINDOWS)), WINDOWS.items()):
+        with column:
+            st.markdown(stat_card(f"Unique Block Producers · {label}", f"{metrics.unique_producers(seconds):,}", "#668cff"), unsafe_allow_html=True)
+    st.caption(f"Approximate distinct producers of the blocks seen since {datetime.fromtimestamp(first_seen):%Y-%m-%d %H:%M}.")
+
+def display_fee_gas_quantiles(network):
+    metrics = metrics_for(network)
+    fees, gas = metrics.fee_quantiles(WINDOWS[QUANTILE_WINDOW]), metrics.gas_quantiles(WINDOWS[QUANTILE_WINDOW])
+    col1, col2 = st.columns(2)
+    if gas is not None:
+        with col1:
+            st.markdown(stat_card(f"Gas Used per Block p50 / p90 / p99 · {QUANTILE_WINDOW}", " / ".join(f"{used / 1e12:,.0f} Tgas" for used in gas), "#8f428a"), unsafe_allow_html=True)
+    if fees is not None:
+        with col2:
+            st.markdown(stat_card(f"Transaction Fee p50 / p90 / p99 · {QUANTILE_WINDOW}", " / ".join(f"{fee / 1e24:.5f} Ⓝ" for fee in fees), "#ff8c1a"), unsafe_allow_html=True)
 
 def visualize_online_nodes(nodes_online):
     # Visualize Online Nodes
     fig_nodes_online = px.bar(x=['Online Nodes'], y=[int(nodes_online)], 
                               labels={'x': '', 'y': 'Count'})
     animate_and_style_chart(fig_nodes_online, "Online Nodes")
-    st.markdown(f"""
-        <div style="
-            padding: 10px;
-            border-radius: 10px;
-            background-color: #f0f2f6;
-            border-left: 5px solid #4CAF50;
-            margin: 10px 0;
-            box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-            animation: fadeIn 1s ease-in-out;
-            ">
-            <h5 style="margin: 0; color: #333;">Nodes Online </h5>
-            <h3 style="margin: 5px 0; color: #4CAF50;">{nodes_online}</h3>
-        </div>
-        <style>
-        @keyframes fadeIn {{
-            0% {{ opacity: 0; }}
-            100% {{ opacity: 1; }}
-        }}
-        </style>
-    """, unsafe_allow_html=True)
+    st.markdown(stat_card("Nodes Online", nodes_online), unsafe_allow_html=True)
 
 def visualize_total_transactions(total_txns):
     # Visualize Total Transactions
     fig_total_txns = px.bar(x=['Total Transactions'], y=[int(total_txns)], 
                             labels={'x': '', 'y': 'Count'})
     animate_and_style_chart(fig_total_txns, "Total Transactions")
-    st.markdown(f"""
-        <div style="
-            padding: 10px;
-            border-radius: 10px;
-            background-color: #f0f2f6;
-            border-left: 5px solid #4CAF50;
-            margin: 10px 0;
-            box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-            animation: fadeIn 1s ease-in-out;
-            ">
-            <h5 style="margin: 0; color: #333;">Total Transactions </h5>
-            <h3 style="margin: 5px 0; color: #4CAF50;">{total_txns}</h3>
-        </div>
-        <style>
-        @keyframes fadeIn {{
-            0% {{ opacity: 0; }}
-            100% {{ opacity: 1; }}
-        }}
-        </style>
-    """, unsafe_allow_html=True)
+    st.markdown(stat_card("Total Transactions", total_txns), unsafe_allow_html=True)
 
 def visualize_market_cap(market_cap):
     market_cap_float = float(market_cap)  # Convert string to float
-    # Display Market Cap in styled box
-    st.markdown(f"""
-        <div style="
-            padding: 10px;
-            border-radius: 10px;
-            background-color: #f0f2f6;
-            border-left: 5px solid #668cff;
-            margin: 10px 0;
-            box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-            animation: fadeIn 1s ease-in-out;
-            ">
-            <h5 style="margin: 0; color: #333;">Market Cap</h5>
-            <h3 style="margin: 5px 0; color: #668cff;">${market_cap_float:,.2f}</h3> Formatted as currency with commas
-        </div>
-        <style>
-        @keyframes fadeIn {{
-            0% {{ opacity: 0; }}
-            100% {{ opacity: 1; }}
-        }}
-        </style>
-    """, unsafe_allow_html=True)
+    # Display Market Cap in styled box, formatted as currency with commas
+    st.markdown(stat_card("Market Cap", f"${market_cap_float:,.2f}", "#668cff"), unsafe_allow_html=True)
 
 def visualize_volume(volume):
     volume_float = float(volume)  # Convert string to float
-    # Display Volume in styled box
-    st.markdown(f"""
-        <div style="
-            padding: 10px;
-            border-radius: 10px;
-            background-color: #f0f2f6;
-            border-left: 5px solid #ff8c1a;
-            margin: 10px 0;
-            box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-            animation: fadeIn 1s ease-in-out;
-            ">
-            <h5 style="margin: 0; color: #333;">Volume</h5>
-            <h3 style="margin: 5px 0; color: #ff8c1a;">${volume_float:,.2f}</h3> Formatted as currency with commas
-        </div>
-        <style>
-        @keyframes fadeIn {{
-            0% {{ opacity: 0; }}
-            100% {{ opacity: 1; }}
-        }}
-        </style>
-    """, unsafe_allow_html=True)
+    # Display Volume in styled box, formatted as currency with commas
+    st.markdown(stat_card("Volume", f"${volume_float:,.2f}", "#ff8c1a"), unsafe_allow_html=True)
 
 def fetch_fts_count(network):
-    base_url = "https://api-testnet.nearblocks.io" if network == 'Testnet' else "https://api.nearblocks.io"
-    response = requests.get(f"{base_url}/v1/fts/count")
-    if response.status_code == 200:
-        data = response.json()
-        return data["tokens"][0]["count"]
-    else:
-        st.error("Failed to fetch Fungible Tokens count")
-        return 0
+    return submit_json(network, "/v1/fts/count", error="Failed to fetch Fungible Tokens count")
 
 def fetch_fts_txns_count(network):
-    base_url = "https://api-testnet.nearblocks.io" if network == 'Testnet' else "https://api.nearblocks.io"
-    response = requests.get(f"{base_url}/v1/fts/txns/count")
-    if response.status_code == 200:
-        data = response.json()
-        return data["txns"][0]["count"]
-    else:
-        st.error("Failed to fetch Fungible Tokens transactions count")
-        return 0
+    return submit_json(network, "/v1/fts/txns/count", error="Failed to fetch Fungible Tokens transactions count")
 
 def visualize_fts_data(fts_count, fts_txns_count):
     # Display Fungible Tokens Count
-    st.markdown(f"""
-        <div style="padding: 10px; border-radius: 10px; background-color: #f0f2f6;
-            border-left: 5px solid #D4AF37; margin: 10px 0; box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);">
-            <h5 style="margin: 0; color: #333;">Fungible Tokens Count</h5>
-            <h3 style="margin: 5px 0; color: #D4AF37;">{fts_count}</h3>
-        </div>
-    """, unsafe_allow_html=True)
+    st.markdown(stat_card("Fungible Tokens Count", fts_count, "#D4AF37"), unsafe_allow_html=True)
 
     # Display Fungible Tokens Transactions Count
-    st.markdown(f"""
-        <div style="padding: 10px; border-radius: 10px; background-color: #f0f2f6;
-            border-left: 5px solid #8f428a; margin: 10px 0; box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);">
-            <h5 style="margin: 0; color: #333;">Fungible Tokens Transactions Count</h5>
-            <h3 style="margin: 5px 0; color: #8f428a;">{fts_txns_count}</h3>
-        </div>
-    """, unsafe_allow_html=True)
+    st.markdown(stat_card("Fungible Tokens Transactions Count", fts_txns_count, "#8f428a"), unsafe_allow_html=True)
 
 def fetch_nfts_count(network):
-    base_url = "https://api-testnet.nearblocks.io" if network == 'Testnet' else "https://api.nearblocks.io"
-    response = requests.get(f"{base_url}/v1/nfts/count")
-    if response.status_code == 200:
-        data = response.json()
-        return data["tokens"][0]["count"]
-    else:
-        st.error("Failed to fetch Non-Fungible Tokens count")
-        return 0
+    return submit_json(network, "/v1/nfts/count", error="Failed to fetch Non-Fungible Tokens count")
 
 def fetch_nfts_txns_count(network):
-    base_url = "https://api-testnet.nearblocks.io" if network == 'Testnet' else "https://api.nearblocks.io"
-    response = requests.get(f"{base_url}/v1/nfts/txns/count")
-    if response.status_code == 200:
-        data = response.json()
-        return data["txns"][0]["count"]
-    else:
-        st.error("Failed to fetch Non-Fungible Tokens transactions count")
-        return 0
+    return submit_json(network, "/v1/nfts/txns/count", error="Failed to fetch Non-Fungible Tokens transactions count")
 
 def visualize_nfts_data(nfts_count, nfts_txns_count):
     # Display Non-Fungible Tokens Count
-    st.markdown(f"""
-        <div style="padding: 10px; border-radius: 10px; background-color: #f0f2f6;
-            border-left: 5px solid #366e80; margin: 10px 0; box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);">
-            <h5 style="margin: 0; color: #333;">Non-Fungible Tokens Count</h5>
-            <h3 style="margin: 5px 0; color: #366e80;">{nfts_count}</h3>
-        </div>
-    """, unsafe_allow_html=True)
+    st.markdown(stat_card("Non-Fungible Tokens Count", nfts_count, "#366e80"), unsafe_allow_html=True)
 
     # Display Non-Fungible Tokens Transactions Count
-    st.markdown(f"""
-        <div style="padding: 10px; border-radius: 10px; background-color: #f0f2f6;
-            border-left: 5px solid #aaad39; margin: 10px 0; box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);">
-            <h5 style="margin: 0; color: #333;">Non-Fungible Tokens Transactions Count</h5>
-            <h3 style="margin: 5px 0; color: #aaad39;">{nfts_txns_count}</h3>
-        </div>
-    """, unsafe_allow_html=True)
-
-def display_network_health_analysis(stats_data, fts_count, fts_txns_count, nfts_count, nfts_txns_count, avg_block_time, unique_block_producers, market_cap, volume):
+    st.markdown(stat_card("Non-Fungible Tokens Transactions Count", nfts_txns_count, "#aaad39"), unsafe_allow_html=True)
+
+def rating_points(value, limits, lower_is_better=False):
+    best, good = limits
+    if lower_is_better:
+        return 2 if value <= best else 1 if value <= good else 0
+    return 2 if value >= best else 1 if value >= good else 0
+
+def rule_based_health_summary(stats_data, fts_txns_count, nfts_txns_count, avg_block_time, unique_block_producers):
+    """Deterministic health categorisation from the same numbers the AI analysis gets."""
+    try:
+        nodes_online = int(stats_data.get('nodes_online', 0))
+    except ValueError:
+        nodes_online = 0
+    points = (rating_points(avg_block_time, BLOCK_TIME_LIMITS, lower_is_better=True) if avg_block_time else 0) \
+        + rating_points(nodes_online, NODES_ONLINE_LIMITS) + rating_points(unique_block_producers, PRODUCER_LIMITS)
+    rating = next(name for minimum, name in HEALTH_RATINGS if points >= minimum)
+    summary = f"<strong>Overall health: {rating}</strong> ({points}/6 points).<br>"
+    if avg_block_time:
+        pace = "close to" if avg_block_time <= BLOCK_TIME_LIMITS[0] else "slower than"
+        summary += f"Blocks arrive every {avg_block_time:.2f} seconds on average, {pace} NEAR's one-second target. "
+    summary += f"{nodes_online:,} nodes are online and {unique_block_producers:,} distinct validators produced the analysed blocks. "
+    summary += f"The network has processed {int(stats_data.get('total_txns', 0)):,} transactions, including {int(fts_txns_count):,} fungible token and {int(nfts_txns_count):,} NFT transactions."
+    return summary
+
+def display_network_health_analysis(stats_data, fts_count, fts_txns_count, nfts_count, nfts_txns_count, avg_block_time, unique_block_producers, market_cap, volume, deadline):
     # Convert market_cap and volume to float before formatting
     try:
         market_cap_float = float(market_cap)  # Ensure market_cap is treated as float
@@ -319,102 +279,138 @@ def display_network_health_analysis(stats_data, fts_count, fts_txns_count, nfts_
     
     # Assuming you have an API key for OpenAI in your secrets
     api_key = secrets["API_KEY"]
-    ai_response = generate_ai_response(prompt, api_key)
+    fallback = rule_based_health_summary(stats_data, fts_txns_count, nfts_txns_count, avg_block_time, unique_block_producers)
 
-    # Display the prompt and AI response in Streamlit
+    # Display the prompt and AI response in Streamlit; the answer may arrive after the rest of the page
     st.markdown(f"<div class='user_prompt'>👤 <strong>You:</strong><br>{prompt}</div>", unsafe_allow_html=True)
-    st.markdown(f"<div class='ai_response'>🤖 <strong>NearVision AI:</strong><br>{ai_response}</div>", unsafe_allow_html=True)
+    ai_box("network_health", prompt, lambda: complete("network_health", prompt, generate_ai_response, api_key), fallback, deadline,
+           "<div class='ai_response'>🤖 <strong>NearVision AI:</strong><br>{text}</div>")
     
 def app(network='Select Network'):
     if network == 'Select Network':
         st.info("Please select a network to view stats.")
         return
+    if network == COMPARE_OPTION:
+        compare_app()
+        return
     
-    # Your existing style and header setup here...
-    st.markdown("""
-        <style>
-            .big-font {
-                font-size:30px !important;
-                font-weight: bold;
-                color: #ff6347;
-                text-align: center;
-                margin-bottom: 30px;
-            }
-            .chart-title {
-                text-align: center;
-                margin-top: 40px;
-                font-weight: bold;
-                font-size: 24px;
-                color: #193785;
-            }
-            .user_prompt, .ai_response {
-                padding: 10px;
-                border-radius: 10px;
-                margin-bottom: 10px;
-            }
-            .user_prompt {
-                background-color: #e1f5fe;  /* Light blue background */
-            }
-            .ai_response {
-                background-color: #f0f4c3;  /* Light green background */
-            }
-            @media (prefers-color-scheme: dark) {
-                .user_prompt {
-                    background-color: #333;  /* Darker background for dark mode */
-                }
-                .ai_response {
-                    background-color: #444;  /* Even darker background for dark mode */
-                }
-            }
-        </style>
-        """, unsafe_allow_html=True)
-    
-    st.markdown('<p class="big-font">👨🏻‍💻 Health Indicators Ⓝ</p>', unsafe_allow_html=True)
-    
-    df = fetch_chart_data(network)
-    if not df.empty:
-            df['date'] = pd.to_datetime(df['date']).dt.date  # Convert to date for better readability
-            display_charts(df)
-        
-    df_blocks = fetch_blocks_data(network)
-    stats_data = fetch_stats_data(network)
-    fts_count = fetch_fts_count(network)
-    fts_txns_count = fetch_fts_txns_count(network)
-    nfts_count = fetch_nfts_count(network)
-    nfts_txns_count = fetch_nfts_txns_count(network)
-
-    if not df_blocks.empty:
-        # Calculate average block times and update df_blocks with block time differences
-        df_blocks, avg_block_time = calculate_avg_block_times(df_blocks)
-        # Display metrics for transactions per block and gas used per block
-        calculate_and_display_metrics(df_blocks)
-        # Visualize block activity and unique block producers
-        visualize_block_activity(df_blocks)
-        visualize_block_producers(df_blocks)
-        unique_block_producers = df_blocks['author_account_id'].nunique()
-    else:
-        avg_block_time = 0
-        unique_block_producers = 0
-        
-    if stats_data:
-        market_cap = stats_data.get('market_cap', 0)  # Use 0 or another default value as fallback
-        volume = stats_data.get('volume', 0)
-        visualize_online_nodes(stats_data['nodes_online'])
-        visualize_total_transactions(stats_data['total_txns'])
-        visualize_market_cap(market_cap)  # Use the extracted value
-        visualize_volume(volume)  # Use the extracted value
-        
+    st.markdown('<p class="big-font page-title">👨🏻‍💻 Health Indicators Ⓝ</p>', unsafe_allow_html=True)
+    deadline = page_deadline(PAGE_BUDGET)
+
+    # Start every NearBlocks request at once; each panel below renders as soon as its own inputs arrive
+    futures = {
+        "blocks": fetch_blocks_data(network),
+        "window": executor.submit(fetch_recent_blocks, network, block_window_size(network), current_session()),
+        "stats": fetch_stats_data(network),
+        "fts": fetch_fts_count(network),
+        "fts_txns": fetch_fts_txns_count(network),
+        "nfts": fetch_nfts_count(network),
+        "nfts_txns": fetch_nfts_txns_count(network),
+        "charts": submit_chart_refresh(network),
+    }
+
+    # Inputs of the health summary, filled in by the panels as they render; stats stay None until their panel renders
+    health = {"stats": None, "fts": 0, "fts_txns": 0, "nfts": 0, "nfts_txns": 0}
+
+    def render_blocks(data):
+        df_blocks = blocks_frame(data)
+        if not df_blocks.empty:
+            # Calculate average block times and update df_blocks with block time differences
+            df_blocks, avg_block_time = calculate_avg_block_times(df_blocks)
+            # Display metrics for transactions per block and gas used per block
+            calculate_and_display_metrics(df_blocks)
+            # Visualize block activity and unique block producers
+            visualize_block_activity(df_blocks)
+            visualize_block_producers(df_blocks)
+            health["latest"] = (avg_block_time, df_blocks['author_account_id'].nunique())
+
+    def render_window(frame):
+        # Health judgments rest on the large window rather than the 9 latest blocks
+        window_summary = display_block_window_analysis(frame)
+        display_unique_producers(network)
+        display_fee_gas_quantiles(network)
+        if window_summary:
+            health["window"] = (window_summary['block_time_mean'], window_summary['unique_producers'])
+
+    def render_stats(data):
+        stats_data = health["stats"] = read_stats(data)
+        if stats_data:
+            visualize_online_nodes(stats_data['nodes_online'])
+            visualize_total_transactions(stats_data['total_txns'])
+            visualize_market_cap(stats_data.get('market_cap', 0))  # Use 0 or another default value as fallback
+            visualize_volume(stats_data.get('volume', 0))
+
+    def render_counts(count_key, txns_key):
+        def render(count_data, txns_data):
+            health[count_key], health[txns_key] = read_count(count_data, "tokens"), read_count(txns_data, "txns")
+            (visualize_fts_data if count_key == "fts" else visualize_nfts_data)(health[count_key], health[txns_key])
+        return render
+
+    charts_slot = placeholder()
+    blocks_slot = placeholder()
+    display_block_window_controls(network)
+    window_slot = placeholder()
+    stats_slot = placeholder()
     st.markdown(f"<h3 style='text-align: center; color: #b34317;'>NEAR Fungible Tokens Overview</h3>", unsafe_allow_html=True)
-    visualize_fts_data(fts_count, fts_txns_count)
-
+    fts_slot = placeholder()
     st.markdown(f"<h3 style='text-align: center; color: #b34317;'>NEAR Non-Fungible Tokens Overview</h3>", unsafe_allow_html=True)
-    visualize_nfts_data(nfts_count, nfts_txns_count)
+    nfts_slot = placeholder()
+    render_when_ready({
+        "charts": (["charts"], charts_slot, lambda refreshed: display_chart_history(network, refreshed)),
+        "blocks": (["blocks"], blocks_slot, render_blocks),
+        "window": (["window"], window_slot, render_window),
+        "stats": (["stats"], stats_slot, render_stats),
+        "fts": (["fts", "fts_txns"], fts_slot, render_counts("fts", "fts_txns")),
+        "nfts": (["nfts", "nfts_txns"], nfts_slot, render_counts("nfts", "nfts_txns")),
+    }, futures, deadline)
 
     st.markdown(f"<h3 style='text-align: center; color: #b34317'>✍️ Health of NEAR blockchain network - Summary </h3>", unsafe_allow_html=True)
 
     # Display network health analysis after all other content, ensuring no duplication
-    if stats_data:
-        display_network_health_analysis(stats_data, fts_count, fts_txns_count, nfts_count, nfts_txns_count, avg_block_time, unique_block_producers, market_cap, volume)
+    stats_data = health["stats"]
+    if stats_data is None:
+        st.caption("⏳ The summary needs the network stats, which are still loading; refresh the page to include it.")
+    elif stats_data:
+        avg_block_time, unique_block_producers = health.get("window") or health.get("latest") or (0, 0)
+        display_network_health_analysis(stats_data, health["fts"], health["fts_txns"], health["nfts"], health["nfts_txns"], avg_block_time, unique_block_producers,
+                                        stats_data.get('market_cap', 0), stats_data.get('volume', 0), deadline)
+
+def compare_app():
+    st.markdown("<h2 style='text-align: center; color: #ff6347;'>👨🏻‍💻 Health Indicators Ⓝ - Testnet vs Mainnet</h2>", unsafe_allow_html=True)
+    # Start the block windows and chart refreshes first so they overlap with the count requests
+    window_futures = submit_both(fetch_recent_blocks, DEFAULT_WINDOW, current_session())
+    chart_futures = submit_both(refresh_chart_history)
+    data = fetch_both({"stats": "/v1/stats", "fts": "/v1/fts/count", "fts_txns": "/v1/fts/txns/count",
+                       "nfts": "/v1/nfts/count", "nfts_txns": "/v1/nfts/txns/count"})
+    windows = {network: analyze_block_window(future.result())[0] for network, future in window_futures.items()}
+    stats = {network: (data[network]["stats"] or {}).get("stats", [{}])[0] for network in NETWORKS}
+
+    count = lambda v: f'{v:,.0f}'
+    rows = [
+        ("Nodes Online", stats['Testnet'].get('nodes_online'), stats['Mainnet'].get('nodes_online'), count),
+        ("Total Transactions", stats['Testnet'].get('total_txns'), stats['Mainnet'].get('total_txns'), count),
+        ("Fungible Tokens Count", first_count(data['Testnet']["fts"], "tokens"), first_count(data['Mainnet']["fts"], "tokens"), count),
+        ("Fungible Tokens Transactions Count", first_count(data['Testnet']["fts_txns"], "txns"), first_count(data['Mainnet']["fts_txns"], "txns"), count),
+        ("Non-Fungible Tokens Count", first_count(data['Testnet']["nfts"], "tokens"), first_count(data['Mainnet']["nfts"], "tokens"), count),
+        ("Non-Fungible Tokens Transactions Count", first_count(data['Testnet']["nfts_txns"], "txns"), first_count(data['Mainnet']["nfts_txns"], "txns"), count),
+        ("Average Block Time", windows['Testnet'].get('block_time_mean'), windows['Mainnet'].get('block_time_mean'), lambda v: f'{v:.3f}s'),
+        ("Block Time p99", windows['Testnet'].get('block_time_p99'), windows['Mainnet'].get('block_time_p99'), lambda v: f'{v:.3f}s'),
+        ("Block Time Jitter", windows['Testnet'].get('block_time_jitter'), windows['Mainnet'].get('block_time_jitter'), lambda v: f'{v:.3f}s'),
+        ("Throughput (tx/s)", windows['Testnet'].get('tps'), windows['Mainnet'].get('tps'), lambda v: f'{v:.2f}'),
+        ("Gas Utilisation p50", windows['Testnet'].get('utilisation_p50'), windows['Mainnet'].get('utilisation_p50'), lambda v: f'{v:.2%}'),
+        ("Unique Block Producers", windows['Testnet'].get('unique_producers'), windows['Mainnet'].get('unique_producers'), count),
+    ]
+    display_comparison_table(rows)
+
+    # Daily transaction volume of both networks on one chart
+    histories = []
+    for network, future in chart_futures.items():
+        if future.result():
+            history = load_chart_history(network, columns=['txns'])
+            histories.append(downsample(history, 'date', 'txns').assign(network=network))
+    if histories:
+        fig_txns = px.line(pd.concat(histories, ignore_index=True), x='date', y='txns', color='network')
+        animate_and_style_chart(fig_txns, "Transaction Volume Over Time")
 
 if __name__ == "__main__":
     app('')  # Example call with Testnet
\ No newline at end of file
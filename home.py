@@ -1,119 +1,36 @@
 import streamlit as st
-import requests
-import openai
 from prompts import format_stats_for_prompt_home,generate_ai_response
-
-openai.api_key = st.secrets["API_KEY"]
+from compare import COMPARE_OPTION, fetch_both, display_comparison_table
+from theme import metric_card
+from prompt_cache import complete
+from nearblocks import get_json, failure_message
 
 def fetch_stats(network):
-    if network == 'Testnet':
-        url = "https://api-testnet.nearblocks.io/v1/stats"
-    else:
-        url = "https://api.nearblocks.io/v1/stats"
-    response = requests.get(url)
-    return response.json()["stats"][0] if response.status_code == 200 else {}
+    data = get_json(network, "/v1/stats")
+    return data["stats"][0] if data else {}
 
 def app(network):
     if network == 'Select Network':
         st.info("Please select a network to view stats of NEAR blocks.")
         return
+    if network == COMPARE_OPTION:
+        compare_app()
+        return
     
     st.title('👋 NEARVision Ⓝ')
-    # Styles for the prompts
-    user_prompt_style = """
-        <style>
-            .user_prompt, .ai_response {
-                padding: 10px;
-                border-radius: 10px;
-                margin-bottom: 10px;
-            }
-            .user_prompt {
-                background-color: #e1f5fe;
-            }
-            .ai_response {
-                background-color: #f0f4c3;
-            }
-            @media (prefers-color-scheme: dark) {
-                .user_prompt {
-                    background-color: #333;
-                }
-                .ai_response {
-                    background-color: #444;
-                }
-            }
-            .header {
-            color: #ff4f8b; /* Change the color */
-            font-size: 3rem; /* Change the font size */
-            text-shadow: 2px 2px #ffcccb; /* Add a shadow effect */
-            font-weight: bold;
-            margin-bottom: 1rem;
-            }
-            .sub-header {
-            color: #30336b; /* Change the color */
-            font-size: 2rem; /* Change the font size */
-            text-shadow: 1px 1px #dfe6e9; /* Add a shadow effect */
-            font-weight: bold;
-            margin-bottom: 1rem;
-            }
-            .near-symbol {
-            font-size: 1.5rem; /* Change the size of the symbol */
-            color: #6c5ce7; /* Change the color of the symbol */
-            }
-        </style>
-    """
-    st.markdown(user_prompt_style, unsafe_allow_html=True)
-
     stats = fetch_stats(network)
     if stats:
         display_stats_with_style(stats)
         formatted_prompt = format_stats_for_prompt_home(stats,network)
         st.markdown(f"<div class='user_prompt'>👤 <strong>Stats for {network}:</strong><br>{formatted_prompt}</div>", unsafe_allow_html=True)
         
-        ai_response = generate_ai_response(formatted_prompt, st.secrets["API_KEY"])
+        ai_response = complete("home_stats", formatted_prompt, generate_ai_response, st.secrets["API_KEY"])
         st.markdown(f"<div class='ai_response'>🤖 <strong>AI Response:</strong><br>{ai_response}</div>", unsafe_allow_html=True)
     else:
-        st.error("Failed to fetch data. Please try again.")
+        st.error(failure_message("Failed to fetch data. Please try again."))
 
 def display_stats_with_style(stats):
-    # Injecting custom styles
-    st.markdown("""
-    <style>
-            .st-emotion-cache-1isgx0k{
-                width:800px !important;
-            }
-            .metric-container {
-            border-radius: 10px;
-            background-color: #f0f2f6;
-            box-shadow: 0 2px 12px rgba(0,0,0,0.1);
-            padding: 20px;
-            height: 150px;  /* Fixed height for uniform size */
-            display: flex;
-            flex-direction: column;
-            justify-content: space-around;  /* Distribute space above and below content */
-            transition: transform 0.2s;
-            cursor: pointer;
-            margin : 10px 0px;
-        }
-        .metric-container h3 {
-            font-size: 16px;  /* Adjust title font size */
-            margin: 0;
-            padding: 0;
-            text-align: center;
-        }
-        .metric-container p {
-            font-size: 24px;  /* Adjust value font size */
-            margin: 0;
-            padding: 0;
-            text-align: center;
-            word-wrap: break-word;  /* Ensure long words do not overflow */
-        }
-        .metric-container:hover {
-            transform: scale(1.05);
-        }
-    </style>
-    """, unsafe_allow_html=True)
-
-    # Display metrics with enhanced styles
+    # Card styles come from theme.register_styles()
     metrics_layout(stats)
 
 def metrics_layout(stats):
@@ -139,13 +56,26 @@ def metrics_layout(stats):
         cols = st.columns(5)
         for col, metric in zip(cols, metrics[i:i+5]):
             label, value = metric
-            metric_html = f"""
-            <div class="metric-container">
-                <h3 style="margin:0;">{label}</h3>
-                <p style="margin:0; font-size:20px;"><strong>{value}</strong></p>
-            </div>
-            """
-            col.markdown(metric_html, unsafe_allow_html=True)
+            col.markdown(metric_card(label, value), unsafe_allow_html=True)
+
+def compare_app():
+    st.title('👋 NEARVision Ⓝ - Testnet vs Mainnet')
+    # Both networks' stats come from one parallel batch
+    data = fetch_both({"stats": "/v1/stats"})
+    stats = {network: (result["stats"] or {}).get("stats", [{}])[0] for network, result in data.items()}
+    if not stats['Testnet'] or not stats['Mainnet']:
+        st.error("Failed to fetch data. Please try again.")
+        return
+    testnet, mainnet = stats['Testnet'], stats['Mainnet']
+    rows = [
+        ("Total Transactions", testnet["total_txns"], mainnet["total_txns"], lambda v: f'{v/1e6:.2f}M'),
+        ("Total No of Blocks", testnet["block"], mainnet["block"], lambda v: f'{v:,.0f}'),
+        ("Avg Block Time (s)", testnet["avg_block_time"], mainnet["avg_block_time"], lambda v: f'{v:.2f}s'),
+        ("Nodes Online", testnet["nodes_online"], mainnet["nodes_online"], lambda v: f'{v:,.0f}'),
+        ("Gas Price (Ⓝ / Tgas)", testnet["gas_price"], mainnet["gas_price"], lambda v: f'{v/1e12:.7f}'),
+        ("Total Supply", testnet["total_supply"], mainnet["total_supply"], lambda v: f'{v:.3e}'),
+    ]
+    display_comparison_table(rows)
 
 if __name__ == "__main__":
     app()
\ No newline at end of file
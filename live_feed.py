@@ -0,0 +1,110 @@
+import itertools
+import threading
+import time
+from collections import deque
+import streamlit as st
+from nearblocks import get_json, LOOKUP
+from payloads import BLOCKS_FIELDS, TXNS_FIELDS
+from network_metrics import observe
+
+POLL_SECONDS = 1.0  # NEAR produces roughly one block per second
+BUFFER_SIZE = 500  # Rows kept per feed; viewers further behind than this skip ahead
+MAX_ROWS_PER_PUSH = 25  # Backpressure: a slow viewer gets the newest rows instead of a growing backlog
+IDLE_SECONDS = 300  # Stop polling a network nobody has looked at for 5 minutes
+
+class LiveFeed:
+    """One background poller per network keeping ring buffers of the newest blocks and transactions.
+
+    Every viewer reads from the same buffers with its own cursor, so upstream cost is
+    one poll per second per network no matter how many tables are open.
+    """
+
+    def __init__(self, network, poll_seconds=POLL_SECONDS, buffer_size=BUFFER_SIZE, listeners=()):
+        self.network = network
+        self.poll_seconds = poll_seconds
+        # Each buffer holds (sequence number, row) pairs in arrival order
+        self.buffers = {"blocks": deque(maxlen=buffer_size), "txns": deque(maxlen=buffer_size)}
+        self.listeners = list(listeners)
+        self._sequence = itertools.count(1)
+        self._lock = threading.Lock()
+        self._last_read = time.time()
+        self._thread = None
+        self.ensure_running()
+
+    def ensure_running(self):
+        with self._lock:
+            self._last_read = time.time()
+            # _run clears _thread under this lock as it decides to stop, so a read either keeps it polling or starts a new one
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"live-feed-{self.network}", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        try:
+            while True:
+                with self._lock:
+                    if time.time() - self._last_read >= IDLE_SECONDS:
+                        self._thread = None
+                        return
+                started = time.time()
+                self.poll()
+                time.sleep(max(self.poll_seconds - (time.time() - started), 0))
+        finally:
+            # A poll that raises must not leave a dead thread registered as the poller
+            with self._lock:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+
+    def poll(self):
+        # One shared poller serves every live viewer, so it queues as a single lookup session
+        blocks = get_json(self.network, "/v1/blocks", {"page": 1, "per_page": 25, "order": "desc"}, priority=LOOKUP,
+                          session_id=f"live-{self.network}", fields=BLOCKS_FIELDS)
+        txns = get_json(self.network, "/v1/txns", {"page": 1, "per_page": 25, "order": "desc"}, priority=LOOKUP,
+                        session_id=f"live-{self.network}", fields=TXNS_FIELDS)
+        new_blocks = self._append("blocks", (blocks or {}).get("blocks", []), lambda block: block["block_hash"])
+        new_txns = self._append("txns", (txns or {}).get("txns", []), lambda txn: txn["transaction_hash"])
+        # Listeners (e.g. metric sketches) see each new row exactly once
+        for listener in self.listeners:
+            listener(self.network, new_blocks, new_txns)
+
+    def _append(self, kind, rows, key):
+        with self._lock:
+            buffer = self.buffers[kind]
+            seen = {key(row) for _, row in buffer}
+            # The API returns newest first; store oldest first so sequence numbers follow chain order
+            fresh = [row for row in reversed(rows) if key(row) not in seen]
+            for row in fresh:
+                buffer.append((next(self._sequence), row))
+        return fresh
+
+    def read(self, kind, cursor, limit=MAX_ROWS_PER_PUSH):
+        """Rows newer than cursor (newest last), the new cursor and how many rows were skipped."""
+        with self._lock:
+            self._last_read = time.time()
+            pending = [(sequence, row) for sequence, row in self.buffers[kind] if sequence > cursor]
+        if not pending:
+            return [], cursor, 0
+        skipped = max(len(pending) - limit, 0)
+        return [row for _, row in pending[skipped:]], pending[-1][0], skipped
+
+# Shared across every session of this server process: one poller per network
+@st.cache_resource(show_spinner=False)
+def get_live_feed(network):
+    # Every polled row also feeds the network's long-window metric sketches
+    return LiveFeed(network, listeners=[observe])
+
+def live_rows(network, kind, table_rows):
+    """Pull only the rows this session has not seen yet and merge them into its bounded table."""
+    feed = get_live_feed(network)
+    feed.ensure_running()
+    state_key = f"live_{kind}_{network}"
+    if state_key not in st.session_state:
+        st.session_state[state_key] = {"cursor": 0, "rows": deque(maxlen=table_rows), "skipped": 0}
+    state = st.session_state[state_key]
+    rows, cursor, skipped = feed.read(kind, state["cursor"])
+    if state["cursor"]:
+        # The first read is a catch-up; only later gaps mean this viewer fell behind
+        state["skipped"] += skipped
+    state["cursor"] = cursor
+    state["rows"].extendleft(rows)
+    return list(state["rows"]), state["skipped"]
@@ -0,0 +1,203 @@
+import hashlib
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import numpy as np
+import requests
+
+ENGINE = "gpt-3.5-turbo-instruct"
+PROVIDER = os.environ.get("LLM_PROVIDER", "openai")  # "mock" answers offline and deterministically
+MOCK_LATENCY = float(os.environ.get("LLM_MOCK_LATENCY", "0"))  # Simulated seconds per mock completion
+MAX_CONCURRENCY = 4  # Completions in flight for the whole process, hedges included
+DEADLINE = 30  # Seconds a caller waits for an answer, queueing and retries included
+RETRIES = 2  # Extra attempts after a transient failure
+HEDGE_AFTER = 8  # Seconds before a duplicate request is sent, until enough latencies are known
+HEDGE_QUANTILE = 0.9  # Afterwards, hedge once an attempt is slower than this share of recent ones
+MIN_HEDGE_SAMPLES = 20
+LATENCY_WINDOW = 200
+TIMEOUT_MESSAGE = "The AI response took too long and was skipped. Please try again shortly."
+BUSY_MESSAGE = "The AI assistant is busy with other requests. Please try again shortly."
+ERROR_MESSAGE = "The AI response is unavailable right now. Please try again later."
+
+_local = threading.local()
+
+class OpenAIProvider:
+    """Completions API of the openai 0.28 client, with the key passed per request instead of set globally."""
+
+    name = "openai"
+
+    def __init__(self, pool_size=MAX_CONCURRENCY * 2):
+        self.pool_size = pool_size
+        self._openai = None
+        self.lock = threading.Lock()
+
+    @property
+    def openai(self):
+        # Imported on the first completion, so importers that never call the LLM do not need the client
+        with self.lock:
+            if self._openai is None:
+                import openai
+                # One pooled session for every completion so TLS connections are reused across threads
+                session = requests.Session()
+                session.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=self.pool_size))
+                openai.requestssession = session
+                self._openai = openai
+        return self._openai
+
+    def complete(self, request, timeout):
+        response = self.openai.Completion.create(
+            engine=request["engine"],
+            prompt=request["prompt"],
+            max_tokens=request["max_tokens"],
+            temperature=request["temperature"],
+            api_key=request["api_key"],
+            request_timeout=timeout,
+        )
+        usage = getattr(response, "usage", None) or {}
+        return response.choices[0].text.strip(), usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+
+    def transient(self, error):
+        if self._openai is None:
+            return False  # The client could not even be imported
+        errors = self.openai.error
+        return isinstance(error, (errors.Timeout, errors.APIConnectionError, errors.RateLimitError,
+                                  errors.ServiceUnavailableError, errors.APIError))
+
+class MockProvider:
+    """Offline provider for tests and benchmarks: the same prompt always gets the same answer."""
+
+    name = "mock"
+
+    def __init__(self, latency=MOCK_LATENCY):
+        self.latency = latency
+
+    def complete(self, request, timeout):
+        digest = hashlib.sha256(request["prompt"].encode()).hexdigest()
+        # Deterministic per-prompt latency between 0.5x and 1.5x the configured mean
+        delay = self.latency * (0.5 + int(digest[:8], 16) / 0xFFFFFFFF)
+        if delay > timeout:
+            time.sleep(timeout)
+            raise TimeoutError("Mock completion exceeded its timeout")
+        time.sleep(delay)
+        first_line = next((line.strip(" -") for line in request["prompt"].splitlines() if line.strip()), "")
+        text = (f"Offline summary {digest[:8]}: {first_line[:200]} "
+                "The figures look consistent with normal NEAR network activity.")
+        return text, len(request["prompt"].split()), len(text.split())
+
+    def transient(self, error):
+        return False
+
+def make_provider(name=PROVIDER):
+    return MockProvider() if name == "mock" else OpenAIProvider()
+
+class Gateway:
+    """Every LLM completion in the app goes through here.
+
+    Calls are capped at `concurrency` in flight, each caller gets its answer or a failure message
+    within its deadline, transient errors are retried while the deadline allows, and an attempt
+    slower than recent ones is hedged with a duplicate request when a slot is free.
+    """
+
+    def __init__(self, provider, concurrency=MAX_CONCURRENCY):
+        self.provider = provider
+        self.slots = threading.BoundedSemaphore(concurrency)
+        # Abandoned attempts keep their thread until the provider's own timeout, so leave room for hedges
+        self.pool = ThreadPoolExecutor(max_workers=concurrency * 2, thread_name_prefix="llm")
+        self.lock = threading.Lock()
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.counters = {"calls": 0, "completed": 0, "failed": 0, "timeouts": 0, "busy": 0, "retries": 0,
+                         "attempts": 0, "hedges": 0, "hedge_wins": 0, "prompt_tokens": 0, "completion_tokens": 0}
+
+    def _count(self, name, amount=1):
+        with self.lock:
+            self.counters[name] += amount
+
+    def _attempt(self, request, timeout):
+        start = time.monotonic()
+        try:
+            text, prompt_tokens, completion_tokens = self.provider.complete(request, timeout)
+        finally:
+            self.slots.release()
+        with self.lock:
+            self.latencies.append(time.monotonic() - start)
+            self.counters["attempts"] += 1
+            self.counters["prompt_tokens"] += prompt_tokens
+            self.counters["completion_tokens"] += completion_tokens
+        return text
+
+    def _start(self, request, timeout):
+        # The caller holds a slot; the attempt gives it back when the provider returns, even if nobody waits any more
+        return self.pool.submit(self._attempt, request, max(timeout, 0.1))
+
+    def hedge_delay(self):
+        with self.lock:
+            if len(self.latencies) < MIN_HEDGE_SAMPLES:
+                return HEDGE_AFTER
+            return float(np.quantile(self.latencies, HEDGE_QUANTILE))
+
+    def _fail(self, counter, message):
+        self._count(counter)
+        _local.failed = True
+        return message
+
+    def complete(self, prompt, api_key=None, max_tokens=600, temperature=0.5, deadline=DEADLINE, hedge=True, engine=ENGINE):
+        """Completion text for prompt, or a user-facing message if none arrived in time; see last_failed()."""
+        _local.failed = False
+        self._count("calls")
+        request = {"prompt": prompt, "api_key": api_key, "max_tokens": max_tokens, "temperature": temperature, "engine": engine}
+        end = time.monotonic() + deadline
+        for attempt in range(RETRIES + 1):
+            if attempt:
+                self._count("retries")
+            if not self.slots.acquire(timeout=max(end - time.monotonic(), 0)):
+                return self._fail("busy", BUSY_MESSAGE)
+            futures = {self._start(request, end - time.monotonic()): False}  # future -> is a hedge
+            hedge_at = time.monotonic() + self.hedge_delay() if hedge else float("inf")
+            error = None
+            while futures:
+                done, _ = wait(futures, timeout=max(min(end, hedge_at) - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+                for future in done:
+                    hedged = futures.pop(future)
+                    try:
+                        text = future.result()
+                    except Exception as attempt_error:
+                        error = attempt_error
+                        continue
+                    self._count("completed")
+                    if hedged:
+                        self._count("hedge_wins")
+                    return text
+                now = time.monotonic()
+                if futures and now >= end:
+                    return self._fail("timeouts", TIMEOUT_MESSAGE)
+                if futures and now >= hedge_at:
+                    hedge_at = float("inf")
+                    if self.slots.acquire(blocking=False):
+                        self._count("hedges")
+                        futures[self._start(request, end - now)] = True
+            # Every attempt failed: retry transient errors while the deadline leaves time for a backoff
+            backoff = 2 ** attempt
+            if not self.provider.transient(error) or time.monotonic() + backoff >= end:
+                break
+            time.sleep(backoff)
+        return self._fail("failed", ERROR_MESSAGE)
+
+    def stats(self):
+        """Call counts, token totals and recent latency percentiles, for display and monitoring."""
+        with self.lock:
+            latencies = np.array(self.latencies)
+            counters = dict(self.counters)
+        return {**counters, "provider": self.provider.name,
+                "p50": float(np.quantile(latencies, 0.5)) if len(latencies) else 0.0,
+                "p95": float(np.quantile(latencies, 0.95)) if len(latencies) else 0.0}
+
+gateway = Gateway(make_provider())
+
+def complete(prompt, api_key=None, max_tokens=600, temperature=0.5, deadline=DEADLINE, hedge=True):
+    return gateway.complete(prompt, api_key, max_tokens, temperature, deadline, hedge)
+
+def last_failed():
+    """Whether the last complete() in this thread returned a failure message instead of an answer."""
+    return getattr(_local, "failed", False)
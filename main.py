@@ -1,12 +1,31 @@
 import streamlit as st
 import about, analytics,health_indicators, home, nearvision_ai, smart_contracts, transactions
+from compare import COMPARE_OPTION
+from theme import register_styles
+from nearblocks import scheduler, PRIORITY_NAMES
+from prompt_cache import cache
+from llm_gateway import gateway
 
 def main():
     st.set_page_config(page_title="NearVision Dashboard ", page_icon="👁️", layout="wide")
+    # Page CSS and icon fonts go into the document head once instead of on every page render
+    register_styles()
     st.sidebar.title('📊 NearVision Analytics Dashboard Ⓝ')
     # Network selection in the sidebar, with an option for pages that don't require network selection
-    network_options = ['Select Network', 'Testnet', 'Mainnet']
+    network_options = ['Select Network', 'Testnet', 'Mainnet', COMPARE_OPTION]
     network = st.sidebar.selectbox("Select Network", network_options, key='network_radio')
+    # Requests waiting in the shared NearBlocks scheduler, so a slow page can be told apart from a busy upstream
+    load = scheduler.stats()
+    st.sidebar.caption("NearBlocks queue: " + " · ".join(f"{load[name]['queued']} {name}" for name in PRIORITY_NAMES)
+                       + (f" · rate limited, resuming in {load['paused']:.0f}s" if load['paused'] else ""))
+    # Share of AI answers served from near-duplicate prompts instead of a new LLM call
+    answers = cache.stats()
+    if answers['lookups']:
+        st.sidebar.caption(f"AI answer cache: {answers['hit_rate']:.0%} hits ({answers['hits']}/{answers['lookups']})")
+    llm = gateway.stats()
+    if llm['calls']:
+        st.sidebar.caption(f"AI calls: {llm['calls']} · p95 {llm['p95']:.1f}s · {llm['prompt_tokens'] + llm['completion_tokens']:,} tokens"
+                           + (f" · {llm['timeouts'] + llm['failed'] + llm['busy']} unanswered" if llm['timeouts'] + llm['failed'] + llm['busy'] else ""))
 
     # Dictionary mapping page names to their app functions
     PAGES = {
@@ -25,6 +44,8 @@ def main():
     # Determine if the selected page requires a network parameter
     if selection in ["❓ About", "⏰ Real Time Insights and Anomaly detection", "🧔 Personalized NearVisionAI"]:
         PAGES[selection]()  # Call without the network parameter
+    elif network == COMPARE_OPTION and selection == "🗺️ NEAR Explorer Pro":
+        st.info("NEAR Explorer Pro looks up one account on one network. Please select Testnet or Mainnet.")
     else:
         PAGES[selection](network)  # Call with the network parameter
 
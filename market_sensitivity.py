@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+import yfinance as yf
+
+# Benchmark basket NEAR is compared against; any Yahoo Finance tickers work
+MARKET_ASSETS = ["BTC-USD", "ETH-USD", "SOL-USD"]
+TARGET = "NEAR-USD"
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_prices(tickers, start, end):
+    """Close prices for every ticker from a single batched download, one column per ticker."""
+    prices = yf.download(list(tickers), start=start, end=end, progress=False, auto_adjust=True)["Close"]
+    if isinstance(prices, pd.Series):
+        prices = prices.to_frame(tickers[0])
+    return prices[list(tickers)]
+
+def _daily(prices):
+    prices = prices.copy()
+    if prices.index.tz is not None:
+        prices.index = prices.index.tz_localize(None)
+    prices.index = prices.index.normalize()
+    return prices
+
+def aligned_returns(target_close, market_prices):
+    """Daily returns of the basket and NEAR (last column) on their common dates."""
+    prices = _daily(market_prices).join(_daily(target_close.rename(TARGET).to_frame()), how="inner")
+    return prices.pct_change().iloc[1:].dropna()
+
+def return_matrix(target_close, market_prices):
+    """Align NEAR and the basket on common dates; returns (names, T x N matrix of daily returns)."""
+    returns = aligned_returns(target_close, market_prices)
+    return list(returns.columns), returns.to_numpy()
+
+def sensitivity(returns):
+    """Correlation, beta and alpha for every pair of assets from one covariance of the return matrix.
+
+    beta[i, j] and alpha[i, j] are the OLS slope and intercept of asset i's returns regressed on asset j's.
+    """
+    cov = np.cov(returns, rowvar=False)
+    variance = np.diag(cov)
+    corr = cov / np.sqrt(np.outer(variance, variance))
+    beta = cov / variance[np.newaxis, :]
+    means = returns.mean(axis=0)
+    alpha = means[:, np.newaxis] - beta * means[np.newaxis, :]
+    return corr, beta, alpha
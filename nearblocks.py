@@ -0,0 +1,222 @@
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+import requests
+import payloads
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+MAINNET_URL = "https://api.nearblocks.io"
+TESTNET_URL = "https://api-testnet.nearblocks.io"
+BASE_URL = os.environ.get("NEARBLOCKS_BASE_URL")  # Serve both networks from elsewhere, e.g. the synthetic_chain stand-in
+MAX_WORKERS = 8  # Concurrent requests per crawl
+
+# Priority classes, served strictly in this order
+INTERACTIVE, LOOKUP, BACKGROUND = 0, 1, 2
+PRIORITY_NAMES = ["interactive", "lookups", "background"]
+RATE = float(os.environ.get("NEARBLOCKS_RATE", "10"))  # Requests per second for the whole process
+BURST = 20
+BACKGROUND_RESERVE = 2  # Tokens background crawls leave untouched so page loads never queue behind them
+QUEUE_TIMEOUT = {INTERACTIVE: 30, LOOKUP: 60, BACKGROUND: 120}  # Seconds a request may wait for a slot before giving up as busy
+RATE_LIMIT_RETRIES = 3
+RATE_LIMITED_MESSAGE = "NearBlocks is rate limiting requests right now. Please try again in a minute."
+BUSY_MESSAGE = "NearBlocks requests are queued behind heavy traffic. Please try again shortly."
+
+# One pooled session shared by every fetch so TCP/TLS connections are reused
+session = requests.Session()
+adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=MAX_WORKERS * 4)
+session.mount("https://", adapter)
+session.mount("http://", adapter)
+# Shared worker pool for fanning out independent requests, e.g. both networks of a comparison
+executor = ThreadPoolExecutor(max_workers=MAX_WORKERS * 2, thread_name_prefix="nearblocks")
+_local = threading.local()
+
+class Scheduler:
+    """Token bucket shared by every NearBlocks request in the process.
+
+    Waiting requests are served by priority class first and round-robin across sessions within
+    a class, so one session's 200 page crawl cannot starve another session or an interactive load.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.paused_until = 0
+        self.cond = threading.Condition()
+        self.queues = [OrderedDict() for _ in PRIORITY_NAMES]  # session id -> deque of waiting tickets
+        self.granted = [0] * len(PRIORITY_NAMES)
+        self.wait_total = [0.0] * len(PRIORITY_NAMES)
+        self.wait_max = [0.0] * len(PRIORITY_NAMES)
+        self.timeouts = [0] * len(PRIORITY_NAMES)
+        self.rate_limited = 0
+
+    def _head(self):
+        for priority, sessions in enumerate(self.queues):
+            if sessions:
+                session_id = next(iter(sessions))
+                return priority, sessions[session_id][0]
+        return None, None
+
+    def _remove(self, priority, session_id, ticket, rotate):
+        sessions = self.queues[priority]
+        sessions[session_id].remove(ticket)
+        if not sessions[session_id]:
+            del sessions[session_id]
+        elif rotate:
+            sessions.move_to_end(session_id)  # The next request from this session goes behind the others
+        self.cond.notify_all()
+
+    def acquire(self, priority=INTERACTIVE, session_id=None, timeout=None):
+        """Block until this request may be sent; returns False if it waited longer than timeout."""
+        ticket = object()
+        start = time.monotonic()
+        with self.cond:
+            self.queues[priority].setdefault(session_id, deque()).append(ticket)
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                needed = min(1 + BACKGROUND_RESERVE, self.capacity) if priority == BACKGROUND else 1
+                if self._head()[1] is ticket and now >= self.paused_until and self.tokens >= needed:
+                    self.tokens -= 1
+                    waited = now - start
+                    self.granted[priority] += 1
+                    self.wait_total[priority] += waited
+                    self.wait_max[priority] = max(self.wait_max[priority], waited)
+                    self._remove(priority, session_id, ticket, rotate=True)
+                    return True
+                if timeout is not None and now - start >= timeout:
+                    self.timeouts[priority] += 1
+                    self._remove(priority, session_id, ticket, rotate=False)
+                    return False
+                wait = max(self.paused_until - now, (needed - self.tokens) / self.rate, 0.01)
+                if timeout is not None:
+                    wait = min(wait, start + timeout - now)
+                self.cond.wait(wait)
+
+    def backoff(self, seconds):
+        # NearBlocks answered 429: stop sending anything until the upstream window has passed
+        with self.cond:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0
+            self.rate_limited += 1
+
+    def stats(self):
+        """Queue depth and wait times per priority class, for display and monitoring."""
+        with self.cond:
+            classes = {
+                name: {
+                    "queued": sum(len(tickets) for tickets in self.queues[priority].values()),
+                    "sessions": len(self.queues[priority]),
+                    "granted": self.granted[priority],
+                    "avg_wait": self.wait_total[priority] / self.granted[priority] if self.granted[priority] else 0.0,
+                    "max_wait": self.wait_max[priority],
+                    "timeouts": self.timeouts[priority],
+                }
+                for priority, name in enumerate(PRIORITY_NAMES)
+            }
+            return {**classes, "tokens": self.tokens, "rate_limited": self.rate_limited,
+                    "paused": max(self.paused_until - time.monotonic(), 0)}
+
+scheduler = Scheduler(RATE, BURST)
+
+def current_session():
+    # Streamlit session of the calling script thread; plain threads and CLIs are their own session
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx else threading.current_thread().name
+
+def get_base_url(network):
+    if BASE_URL:
+        return BASE_URL.rstrip("/")
+    return TESTNET_URL if network == 'Testnet' else MAINNET_URL
+
+def _retry_after(response, attempt):
+    try:
+        return float(response.headers.get("Retry-After", 2 ** attempt))
+    except ValueError:
+        return 2 ** attempt
+
+def get_json(network, path, params=None, timeout=10, priority=INTERACTIVE, session_id=None, fields=None):
+    """Fetch a NearBlocks endpoint through the shared scheduler and return the decoded JSON, or None on failure.
+
+    fields (see payloads) keeps only what the caller reads; icons come back as lazily decoded IconRef.
+    After a None, failure_message() in the same thread tells whether the upstream was rate limiting.
+    """
+    session_id = session_id or current_session()
+    _local.status = None
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        if not scheduler.acquire(priority, session_id, QUEUE_TIMEOUT[priority]):
+            _local.status = "busy"
+            return None
+        try:
+            # Streamed so large bodies are decoded while they arrive instead of after being buffered whole
+            response = session.get(f"{get_base_url(network)}{path}", params=params, timeout=timeout, stream=True)
+        except requests.RequestException:
+            _local.status = "error"
+            return None
+        if response.status_code != 429:
+            break
+        response.close()
+        scheduler.backoff(_retry_after(response, attempt))
+    _local.status = response.status_code
+    with response:
+        if response.status_code != 200:
+            return None
+        try:
+            return payloads.read_response(response, fields)
+        except requests.RequestException:
+            _local.status = "error"
+        except ValueError:
+            _local.status = "invalid response"
+        return None
+
+def last_status():
+    """HTTP status (or failure reason) of the last get_json in this thread."""
+    return getattr(_local, "status", None)
+
+def failure_message(default):
+    """Explain the last failed get_json in this thread, falling back to the caller's own message."""
+    status = last_status()
+    if status == 429:
+        return RATE_LIMITED_MESSAGE
+    if status == "busy":
+        return BUSY_MESSAGE
+    return default
+
+def fetch_pages(network, path, key, pages, per_page=25, params=None, priority=INTERACTIVE, fields=None, session_id=None):
+    """Fetch several pages of a list endpoint concurrently and concatenate the rows stored under key.
+
+    Bulk crawls nobody is waiting on should pass priority=BACKGROUND. Callers on a worker thread pass
+    the session_id of the script thread that started them. If any page failed, failure_message()
+    in the calling thread explains the first failure.
+    """
+    session_id = session_id or current_session()
+
+    def fetch(page):
+        data = get_json(network, path, {**(params or {}), "page": page, "per_page": per_page, "order": "desc"},
+                        priority=priority, session_id=session_id, fields=fields)
+        return (data.get(key, []) if data else []), (None if data is not None else last_status())
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        results = list(pool.map(fetch, pages))
+    failures = [status for _, status in results if status is not None]
+    _local.status = failures[0] if failures else 200
+    return [row for rows, _ in results for row in rows]
+
+def submit_json(network, path, params=None, error="Failed to fetch data from NearBlocks", priority=INTERACTIVE):
+    """Start get_json on the shared pool; the future resolves to the JSON, or {"error": message} on failure."""
+    session_id = current_session()
+
+    def fetch():
+        data = get_json(network, path, params, priority=priority, session_id=session_id)
+        return data if data is not None else {"error": failure_message(error)}
+    return executor.submit(fetch)
+
+def fetch_many(calls, priority=INTERACTIVE):
+    """Run independent requests in parallel; calls maps a name to (network, path[, params])."""
+    session_id = current_session()
+    futures = {name: executor.submit(get_json, *call, priority=priority, session_id=session_id) for name, call in calls.items()}
+    return {name: future.result() for name, future in futures.items()}
@@ -1,21 +1,16 @@
 import streamlit as st
-import requests
+from nearblocks import get_json, failure_message, last_status, LOOKUP
+from payloads import INVENTORY_FIELDS
 from near_api.signer import KeyPair
 import base58
 from prompts import format_for_openai,format_for_openai_account,format_for_openai_inventory,generate_summary_prompt
-import openai
+from llm_gateway import complete
 
 def generate_openai_response(prompt, name):
     """Generate a response from OpenAI based on the given prompt."""
-    openai.api_key = st.secrets["API_KEY"]
-    response = openai.Completion.create(
-        engine="gpt-3.5-turbo-instruct",  # Choose the appropriate engine for your use case
-        prompt=prompt,
-        max_tokens=600,
-        temperature=0.7,
-    )
+    text = complete(prompt, st.secrets["API_KEY"], max_tokens=600, temperature=0.7)
     greeting = f"Hi {name},\n\n"  # Personalized greeting
-    full_response = greeting + response.choices[0].text.strip()  # Prepending the greeting to the OpenAI response
+    full_response = greeting + text  # Prepending the greeting to the OpenAI response
     return full_response
 
 def get_public_key_from_private(private_key_base58):
@@ -48,78 +43,27 @@ def get_public_key_from_private(private_key_base58):
 
 def fetch_keys_info(public_key_base58):
     """Fetch information associated with the public key from NearBlocks API."""
-    url = f"https://api-testnet.nearblocks.io/v1/keys/{public_key_base58}"
-    response = requests.get(url)
-    if response.status_code == 200:
-        try:
-            return response.json()
-        except ValueError:
-            return None
-    else:
-        st.error(f"Failed to fetch data. Status code: {response.status_code}")
-        return None
-    
+    data = get_json('Testnet', f"/v1/keys/{public_key_base58}", priority=LOOKUP)
+    if data is None:
+        st.error(failure_message(f"Failed to fetch data. Status code: {last_status()}"))
+    return data
+
 def fetch_account_info(account_id):
     """Fetch account information from NearBlocks API."""
-    url = f"https://api-testnet.nearblocks.io/v1/account/{account_id}"
-    response = requests.get(url)
-    if response.status_code == 200:
-        try:
-            return response.json()
-        except ValueError:
-            return None
-    else:
-        st.error(f"Failed to fetch account data. Status code: {response.status_code}")
-        return None
+    data = get_json('Testnet', f"/v1/account/{account_id}", priority=LOOKUP)
+    if data is None:
+        st.error(failure_message(f"Failed to fetch account data. Status code: {last_status()}"))
+    return data
 
 def fetch_inventory_info(account_id):
     """Fetch inventory information from NearBlocks API."""
-    url = f"https://api-testnet.nearblocks.io/v1/account/{account_id}/inventory"  
-    response = requests.get(url)
-    if response.status_code == 200:
-        try:
-            return response.json()
-        except ValueError:
-            return None
-    else:
-        st.error(f"Failed to fetch inventory data. Status code: {response.status_code}")
-        return None
+    data = get_json('Testnet', f"/v1/account/{account_id}/inventory", priority=LOOKUP, fields=INVENTORY_FIELDS)
+    if data is None:
+        st.error(failure_message(f"Failed to fetch inventory data. Status code: {last_status()}"))
+    return data
 
 def app():
     st.title("🖥️ Personalized NearVisionAI Ⓝ")
-    # Define the styles with CSS variables
-    user_prompt_style = """
-        <style>
-            .user_prompt, .ai_response,.ai_response_summary {
-                padding: 10px;
-                border-radius: 10px;
-                margin-bottom: 10px;
-            }
-            .user_prompt {
-                background-color: #e1f5fe;  /* Light blue background */
-            }
-            .ai_response {
-                background-color: #f0f4c3;  /* Light green background */
-            }
-            .ai_response_summary {
-                background-color: #F5D6D0;  /* Light green background */
-            }
-            @media (prefers-color-scheme: dark) {
-                .user_prompt {
-                    background-color: #333;  /* Darker background for dark mode */
-                }
-                .ai_response {
-                    background-color: #444;  /* Even darker background for dark mode */
-                }
-                .ai_response_summary {
-                    background-color: #444;  /* Even darker background for dark mode */
-                }
-            }
-        </style>
-        """
-    # Include the styles in your Streamlit app
-    st.markdown(user_prompt_style, unsafe_allow_html=True)
-
     private_key_base58 = st.secrets["NEAR_PRIVATE_KEY"]
     public_key_generated = get_public_key_from_private(private_key_base58)
 
@@ -0,0 +1,161 @@
+import bisect
+import threading
+from functools import partial
+import numpy as np
+from sketches import BUCKET_SECONDS, RETENTION_SECONDS, DDSketch, HyperLogLog, SpaceSaving, TimeBuckets, hash_values
+
+# Windows shown on the pages: label -> seconds
+WINDOWS = {"Last hour": 3600, "Last day": 86400, "Last week": 7 * 86400}
+TOP_K_BUCKET_SECONDS = 3600  # Heavy-hitter summaries are larger than HLLs, so they use hourly buckets
+DEDUP_SECONDS = 1800  # Rows this close to the newest one are checked against those already counted
+QUANTILES = (0.5, 0.9, 0.99)
+FEE_RANGE = (1e16, 1e27)  # Transaction fees in yoctoNEAR covered by the fee sketches
+GAS_RANGE = (1e9, 1e17)  # Gas used per block covered by the gas sketches
+
+def _seconds(rows):
+    # block_timestamp is a nanosecond string
+    return np.array([row["block_timestamp"] for row in rows]).astype(np.int64) // 10 ** 9
+
+class SeenRows:
+    """Hashes of recently counted transactions, so a row fetched by both the live feed and a crawl is counted once.
+
+    Rows older than the horizon cannot be checked and are counted as new.
+    """
+
+    def __init__(self, horizon=DEDUP_SECONDS):
+        self.horizon = horizon
+        self.buckets = {}  # bucket start -> set of row hashes
+        self.latest = 0
+        self.lock = threading.Lock()
+
+    def unseen(self, seconds, keys):
+        """Mask of the rows not seen before, remembering them from now on."""
+        mask = np.ones(len(keys), dtype=bool)
+        with self.lock:
+            self.latest = max(self.latest, int(seconds.max()))
+            oldest = self.latest - self.horizon
+            for index, (second, row_hash) in enumerate(zip(seconds.tolist(), hash_values(keys).tolist())):
+                if second < oldest:
+                    continue
+                seen = self.buckets.setdefault(second - second % BUCKET_SECONDS, set())
+                if row_hash in seen:
+                    mask[index] = False
+                else:
+                    seen.add(row_hash)
+            for start in [start for start in self.buckets if start + BUCKET_SECONDS <= oldest]:
+                del self.buckets[start]
+        return mask
+
+class SeenHeights:
+    """Block heights already counted, as sorted disjoint [first, last, newest second] ranges.
+
+    Heights identify blocks across every refetch however old they are, and the crawls and live feed
+    fetch runs of consecutive blocks, so a few ranges cover everything kept for the retention period.
+    """
+
+    def __init__(self, retention=RETENTION_SECONDS):
+        self.retention = retention
+        self.ranges = []
+        self.latest = 0
+        self.lock = threading.Lock()
+
+    def unseen(self, seconds, heights):
+        """Mask of the blocks not seen before, remembering them from now on."""
+        mask = np.ones(len(heights), dtype=bool)
+        with self.lock:
+            self.latest = max(self.latest, int(seconds.max()))
+            for index, (second, height) in enumerate(zip(seconds.tolist(), heights.tolist())):
+                position = bisect.bisect_right(self.ranges, [height, np.inf]) - 1
+                if position >= 0 and self.ranges[position][1] >= height:
+                    mask[index] = False
+                    continue
+                if position >= 0 and self.ranges[position][1] == height - 1:
+                    block_range = self.ranges[position]
+                    block_range[1], block_range[2] = height, max(block_range[2], second)
+                else:
+                    position += 1
+                    self.ranges.insert(position, [height, height, second])
+                following = position + 1
+                if following < len(self.ranges) and self.ranges[following][0] == height + 1:
+                    # The new height closes the gap between two ranges
+                    merged = self.ranges.pop(following)
+                    self.ranges[position][1], self.ranges[position][2] = merged[1], max(self.ranges[position][2], merged[2])
+            oldest = self.latest - self.retention
+            self.ranges = [block_range for block_range in self.ranges if block_range[2] >= oldest]
+        return mask
+
+class NetworkMetrics:
+    """Long-window activity sketches for one network, fed by every block and transaction row the app fetches.
+
+    Rows are bucketed by their own block time, so crawls of older pages land where they belong,
+    and rows seen twice (live feed and crawls overlap) are counted once.
+    """
+
+    def __init__(self):
+        self.signers = TimeBuckets(HyperLogLog)
+        self.producers = TimeBuckets(HyperLogLog)
+        self.seen_txns = SeenRows()
+        self.top_signers = TimeBuckets(SpaceSaving, width=TOP_K_BUCKET_SECONDS)
+        self.top_receivers = TimeBuckets(SpaceSaving, width=TOP_K_BUCKET_SECONDS)
+        self.top_fee_spenders = TimeBuckets(SpaceSaving, width=TOP_K_BUCKET_SECONDS)
+        self.seen_blocks = SeenHeights()
+        self.fees = TimeBuckets(partial(DDSketch, *FEE_RANGE))
+        self.gas = TimeBuckets(partial(DDSketch, *GAS_RANGE))
+
+    def observe(self, blocks=(), txns=()):
+        if txns:
+            seconds = _seconds(txns)
+            signers = np.array([txn["signer_account_id"] for txn in txns], dtype=object)
+            self.signers.add(seconds, signers)
+            # Distinct counts are unaffected by repeats, totals are not
+            fresh = self.seen_txns.unseen(seconds, np.array([txn["transaction_hash"] for txn in txns], dtype=object))
+            if fresh.any():
+                seconds, signers = seconds[fresh], signers[fresh]
+                fresh_txns = [txn for txn, keep in zip(txns, fresh) if keep]
+                self.top_signers.add(seconds, signers)
+                fees = np.array([txn["outcomes_agg"]["transaction_fee"] for txn in fresh_txns], dtype=np.float64)
+                self.top_receivers.add(seconds, np.array([txn["receiver_account_id"] for txn in fresh_txns], dtype=object))
+                self.top_fee_spenders.add(seconds, signers, fees)
+                self.fees.add(seconds, fees)
+        if blocks:
+            seconds = _seconds(blocks)
+            self.producers.add(seconds, np.array([block["author_account_id"] for block in blocks], dtype=object))
+            fresh = self.seen_blocks.unseen(seconds, np.array([block["block_height"] for block in blocks], dtype=np.int64))
+            if fresh.any():
+                self.gas.add(seconds[fresh], np.array([block["chunks_agg"]["gas_used"] for block, keep in zip(blocks, fresh) if keep], dtype=np.float64))
+
+    def unique_signers(self, seconds):
+        # Windows end at the newest row seen rather than the wall clock
+        return round(self.signers.merged(self.signers.latest - seconds).count()) if self.signers.latest else 0
+
+    def unique_producers(self, seconds):
+        return round(self.producers.merged(self.producers.latest - seconds).count()) if self.producers.latest else 0
+
+    def fee_quantiles(self, seconds, qs=QUANTILES):
+        """Transaction fee quantiles (yoctoNEAR) over the window, or None before any transaction is seen."""
+        return self.fees.merged(self.fees.latest - seconds).quantiles(qs) if self.fees.latest else None
+
+    def gas_quantiles(self, seconds, qs=QUANTILES):
+        """Gas used per block quantiles over the window, or None before any block is seen."""
+        return self.gas.merged(self.gas.latest - seconds).quantiles(qs) if self.gas.latest else None
+
+    def top_accounts(self, seconds, n):
+        """Heaviest signers, receivers and fee spenders over the window as (account, total, error) lists."""
+        if not self.top_signers.latest:
+            return {}
+        start = self.top_signers.latest - seconds
+        return {name: buckets.merged(start).top(n) for name, buckets in
+                [("signers", self.top_signers), ("receivers", self.top_receivers), ("fee_spenders", self.top_fee_spenders)]}
+
+_metrics = {}
+_lock = threading.Lock()
+
+def metrics_for(network):
+    with _lock:
+        if network not in _metrics:
+            _metrics[network] = NetworkMetrics()
+        return _metrics[network]
+
+def observe(network, blocks=(), txns=()):
+    """Feed fetched rows into the network's sketches; also the LiveFeed listener signature."""
+    metrics_for(network).observe(blocks, txns)
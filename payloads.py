@@ -0,0 +1,171 @@
+import json
+import re
+import orjson
+
+LARGE_BODY = 256 * 1024  # Bodies above this, or of unknown length, are split while they stream in
+CHUNK_SIZE = 64 * 1024
+ICON_KEY = re.compile(rb'"icon"\s*:\s*"')
+KEY_TAIL = 32  # Bytes carried over between chunks so an icon key cut in two is still found
+ICON_MARK = "\x00icon:"
+
+# Fields each page reads from a payload. A dict keeps only its keys (on every element of a list);
+# None keeps the value whole. Keys missing upstream stay missing.
+TOKEN_META_FIELDS = {"name": None, "symbol": None, "icon": None}
+INVENTORY_FIELDS = {"inventory": {
+    "fts": {"contract": None, "name": None, "amount": None, "ft_metas": TOKEN_META_FIELDS},
+    "nfts": {"contract": None, "name": None, "quantity": None, "nft_meta": TOKEN_META_FIELDS},
+}}
+# The tokens endpoint lists contract ids; the fields only apply if it returns token objects instead
+TOKENS_FIELDS = {"tokens": {
+    "fts": {"contract": None, "name": None, "amount": None},
+    "nfts": {"contract": None, "name": None, "amount": None},
+}}
+CONTRACT_FIELDS = {"contract": {"keys": {"public_key": None, "access_key": {"nonce": None, "permission": None}}}}
+DEPLOYMENTS_FIELDS = {"deployments": {"transaction_hash": None, "block_timestamp": None, "receipt_predecessor_account_id": None}}
+TXN_FIELDS = {"transaction_hash": None, "block_timestamp": None, "block": None, "signer_account_id": None,
+              "receiver_account_id": None, "actions": None, "outcomes": None, "outcomes_agg": None}
+BLOCK_FIELDS = {"block_height": None, "block_hash": None, "block_timestamp": None, "author_account_id": None,
+                "gas_price": None, "chunks_agg": None, "transactions_agg": None, "receipts_agg": None}
+TXNS_FIELDS = {"txns": TXN_FIELDS}
+BLOCKS_FIELDS = {"blocks": BLOCK_FIELDS}
+
+class IconRef:
+    """An icon string left undecoded in its response's icon buffer until a page shows it.
+
+    Truthiness, `in` and formatting behave like the string, so templates use it unchanged.
+    """
+
+    __slots__ = ("buffer", "start", "end")
+
+    def __init__(self, buffer, start, end):
+        self.buffer = buffer
+        self.start = start
+        self.end = end
+
+    def __str__(self):
+        raw = bytes(memoryview(self.buffer)[self.start:self.end])
+        # Data URLs never need escapes; anything else goes through the JSON string rules
+        return json.loads(b'"' + raw + b'"') if b"\\" in raw else raw.decode()
+
+    def __format__(self, spec):
+        return format(str(self), spec)
+
+    def __bool__(self):
+        return self.end > self.start
+
+    def __contains__(self, text):
+        return self.buffer.find(text.encode(), self.start, self.end) >= 0
+
+    def __reduce__(self):
+        # Pickled or cached payloads hold a plain string
+        return str, (str(self),)
+
+    def __repr__(self):
+        return f"IconRef({self.end - self.start} bytes)"
+
+class IconSplitter:
+    """Splits a JSON body chunk by chunk as it streams in.
+
+    Icon strings are copied into one shared buffer and replaced by short markers, so the
+    skeleton handed to the parser is small and the icons are never turned into Python strings.
+    """
+
+    def __init__(self):
+        self.skeleton = bytearray()
+        self.icons = bytearray()
+        self.spans = []  # (start, end) of every icon in self.icons
+        self.tail = b""
+        self.start = None  # Offset of the icon being read, None between icons
+
+    def feed(self, chunk):
+        data, position = (self.tail + chunk if self.tail else chunk), 0
+        self.tail = b""
+        while position < len(data):
+            if self.start is None:
+                match = ICON_KEY.search(data, position)
+                if match is None:
+                    keep = max(position, len(data) - KEY_TAIL)
+                    self.skeleton += memoryview(data)[position:keep]
+                    self.tail = data[keep:]
+                    return
+                self.skeleton += memoryview(data)[position:match.end()]
+                self.start = len(self.icons)
+                position = match.end()
+            else:
+                scanned = len(self.icons)
+                self.icons += memoryview(data)[position:]
+                end = self._closing_quote(scanned)
+                if end < 0:
+                    return
+                # Whatever followed the icon in this chunk is skeleton again
+                data, position = bytes(self.icons[end:]), 0
+                del self.icons[end:]
+                self.skeleton += f"\\u0000icon:{len(self.spans)}".encode()
+                self.spans.append((self.start, end))
+                self.start = None
+
+    def _closing_quote(self, position):
+        while True:
+            quote = self.icons.find(b'"', position)
+            if quote < 0:
+                return -1
+            backslashes = 0
+            while quote - backslashes > self.start and self.icons[quote - backslashes - 1] == 0x5C:
+                backslashes += 1
+            if backslashes % 2 == 0:
+                return quote
+            position = quote + 1
+
+    def close(self):
+        if self.start is not None:
+            raise ValueError("Response body ended inside a string")
+        self.skeleton += self.tail
+        self.tail = b""
+        return bytes(self.skeleton)
+
+def loads(body):
+    try:
+        return orjson.loads(body)
+    except orjson.JSONDecodeError:
+        # orjson is strict about a few things the standard parser accepts, e.g. NaN
+        return json.loads(body)
+
+def project(value, fields):
+    """Keep only the given fields of a decoded payload; see INVENTORY_FIELDS for the format."""
+    if fields is None:
+        return value
+    if isinstance(value, list):
+        return [project(item, fields) for item in value]
+    if not isinstance(value, dict):
+        return value
+    return {key: project(value[key], nested) for key, nested in fields.items() if key in value}
+
+def _restore_icons(value, icons, spans):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key == "icon" and isinstance(item, str) and item.startswith(ICON_MARK):
+                value[key] = IconRef(icons, *spans[int(item[len(ICON_MARK):])])
+            elif isinstance(item, (dict, list)):
+                _restore_icons(item, icons, spans)
+    elif isinstance(value, list):
+        for item in value:
+            if isinstance(item, (dict, list)):
+                _restore_icons(item, icons, spans)
+
+def decode_chunks(chunks, fields=None):
+    """Decode a JSON body from an iterable of byte chunks, with icons as IconRef and projected to fields."""
+    splitter = IconSplitter()
+    for chunk in chunks:
+        splitter.feed(chunk)
+    data = project(loads(splitter.close()), fields)
+    if splitter.spans:
+        _restore_icons(data, splitter.icons, splitter.spans)
+    return data
+
+def read_response(response, fields=None):
+    """Decode a streamed requests response; small bodies are parsed in one go."""
+    length = response.headers.get("Content-Length")
+    # A compressed body's length says little about its decoded size
+    if length and int(length) <= LARGE_BODY and not response.headers.get("Content-Encoding"):
+        return project(loads(response.content), fields)
+    return decode_chunks(response.iter_content(CHUNK_SIZE), fields)
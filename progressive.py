@@ -0,0 +1,79 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed, wait
+import streamlit as st
+
+POLL_INTERVAL = 2  # Seconds between checks of a pending AI answer
+LOADING_NOTE = "⏳ Waiting for NearBlocks..."
+PENDING_NOTE = "⏳ Rule-based summary from the same numbers; the AI analysis replaces it as soon as it arrives."
+
+# AI answers are produced here so a page never waits on the LLM beyond its budget
+pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="ai-box")
+
+def page_deadline(budget):
+    return time.monotonic() + budget
+
+def placeholder():
+    slot = st.empty()
+    slot.caption(LOADING_NOTE)
+    return slot
+
+def render_when_ready(panels, futures, deadline=None):
+    """Fill each panel as soon as all of its inputs are done, in whatever order they finish.
+
+    panels maps a name to (input names, placeholder, render function taking the input results);
+    futures maps input names to futures. Panels still waiting at deadline are handed to
+    late_panel, so the rest of the page does not wait on them.
+    """
+    pending = dict(panels)
+    timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+    try:
+        for _ in as_completed(futures.values(), timeout=timeout):
+            for name, (inputs, slot, render) in list(pending.items()):
+                if all(futures[key].done() for key in inputs):
+                    with slot.container():
+                        render(*(futures[key].result() for key in inputs))
+                    del pending[name]
+    except TimeoutError:
+        pass
+    for inputs, slot, render in pending.values():
+        late_panel(slot, [futures[key] for key in inputs], render)
+
+def late_panel(slot, inputs, render):
+    """Render into slot from a fragment that checks the input futures every POLL_INTERVAL until they are done."""
+    polling = not all(future.done() for future in inputs)
+
+    with slot.container():
+        @st.fragment(run_every=POLL_INTERVAL if polling else None)
+        def late_panel_fragment():
+            if all(future.done() for future in inputs):
+                render(*(future.result() for future in inputs))
+            else:
+                st.caption(LOADING_NOTE)
+
+        late_panel_fragment()
+
+def ai_box(key, prompt, answer, fallback, deadline, html):
+    """Show answer() for prompt, or fallback until it lands if it is not ready by deadline.
+
+    answer runs once per distinct prompt in the background; html is the box markup with a {text} slot.
+    """
+    jobs = st.session_state.setdefault("ai_boxes", {})
+    job = jobs.get(key)
+    if job is None or job["prompt"] != prompt:
+        job = jobs[key] = {"prompt": prompt, "future": pool.submit(answer)}
+    future = job["future"]
+    wait([future], timeout=max(deadline - time.monotonic(), 0))
+
+    # Polls only while the answer is outstanding. run_every is fixed when the page runs, so after the
+    # answer lands the remaining ticks until the next page run only redraw it from the finished future
+    polling = not future.done()
+
+    @st.fragment(run_every=POLL_INTERVAL if polling else None)
+    def ai_box_fragment():
+        if future.done():
+            st.markdown(html.replace("{text}", future.result()), unsafe_allow_html=True)
+        else:
+            st.markdown(html.replace("{text}", fallback), unsafe_allow_html=True)
+            st.caption(PENDING_NOTE)
+
+    ai_box_fragment()
@@ -0,0 +1,150 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+import faiss
+import numpy as np
+from llm_gateway import last_failed
+
+DIMENSIONS = 1024  # Width of the hashed n-gram vectors
+NGRAMS = (3, 4, 5)  # Character n-gram lengths
+SIMILARITY = 0.95  # Minimum cosine similarity between prompt skeletons
+MAX_ENTRIES = 1000  # Cached answers across all templates; least recently used go first
+MAX_AGE = 600  # Seconds an answer may be reused before the numbers behind it are considered stale
+# Numeric drift allowed per template: (relative, absolute); every number must be within one of them
+TOLERANCES = {
+    "home_stats": (0.01, 0.05),
+    "network_health": (0.01, 0.05),
+    "transactions_summary": (0.2, 2),
+    "blocks_summary": (0.2, 1),
+}
+DEFAULT_TOLERANCE = (0.005, 0)
+
+NUMBER = re.compile(r"-?\d[\d,]*(?:\.\d+)?(?:[eE][+-]?\d+)?")
+_PRIME = np.uint64(1099511628211)
+
+def split_numbers(prompt):
+    """The prompt's text with every number replaced by '#', and the numbers themselves."""
+    numbers = [float(match.replace(",", "")) for match in NUMBER.findall(prompt)]
+    return NUMBER.sub("#", prompt), np.array(numbers)
+
+def embed(text):
+    """L2-normalised signed feature hashing of character n-grams; local and deterministic."""
+    codes = np.frombuffer(text.lower().encode(), dtype=np.uint8).astype(np.uint64)
+    vector = np.zeros(DIMENSIONS, dtype=np.float32)
+    with np.errstate(over="ignore"):
+        for n in NGRAMS:
+            if len(codes) < n:
+                continue
+            hashes = np.zeros(len(codes) - n + 1, dtype=np.uint64)
+            for offset in range(n):
+                hashes = hashes * _PRIME + codes[offset:len(codes) - n + 1 + offset]
+            signs = np.where(hashes >> np.uint64(63), -1.0, 1.0)
+            vector += np.bincount((hashes % np.uint64(DIMENSIONS)).astype(np.int64), weights=signs, minlength=DIMENSIONS).astype(np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+def drift(numbers, cached, tolerance):
+    """Largest difference as a share of what the tolerance allows; above 1 means the answer can't be reused."""
+    relative, absolute = tolerance
+    if len(numbers) != len(cached):
+        return np.inf
+    if not len(numbers):
+        return 0.0
+    allowed = np.maximum(relative * np.maximum(np.abs(numbers), np.abs(cached)), absolute)
+    difference = np.abs(numbers - cached)
+    # A zero allowance (zero tolerance, or both numbers zero) only accepts an exact match
+    ratios = np.divide(difference, allowed, out=np.where(difference > 0, np.inf, 0.0), where=allowed > 0)
+    return float(ratios.max())
+
+class PromptCache:
+    """Reuses LLM answers for prompts that differ from a cached one only by small numeric drift.
+
+    Each template has its own FAISS inner-product index over the embedded prompt skeletons;
+    of the cached prompts above the similarity threshold, the one with the least numeric drift
+    is reused if every number is within the template's tolerance. Answers expire after max_age
+    and the least recently used are evicted past max_entries.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, max_age=MAX_AGE, similarity=SIMILARITY):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.similarity = similarity
+        self.lock = threading.Lock()
+        self.indexes = {}  # template -> faiss index of entry ids
+        self.entries = OrderedDict()  # entry id -> (template, numbers, answer, created), least recently used first
+        self.next_id = 0
+        self.metrics = {}
+
+    def _metrics(self, template):
+        return self.metrics.setdefault(template, {"lookups": 0, "hits": 0, "exact": 0, "misses": 0, "evictions": 0})
+
+    def _remove(self, entry_id):
+        template = self.entries.pop(entry_id)[0]
+        self.indexes[template].remove_ids(np.array([entry_id], dtype=np.int64))
+
+    def get(self, template, prompt):
+        """Cached answer for prompt, or None."""
+        skeleton, numbers = split_numbers(prompt)
+        vector = embed(skeleton)[np.newaxis, :]
+        tolerance = TOLERANCES.get(template, DEFAULT_TOLERANCE)
+        with self.lock:
+            metrics = self._metrics(template)
+            metrics["lookups"] += 1
+            index = self.indexes.get(template)
+            best, best_drift = None, 1.0
+            if index is not None and index.ntotal:
+                # Every cached prompt above the threshold: same-skeleton prompts tie on similarity
+                _, _, ids = index.range_search(vector, self.similarity)
+                for entry_id in ids:
+                    _, cached, _, created = self.entries[entry_id]
+                    if time.time() - created > self.max_age:
+                        self._remove(entry_id)
+                        continue
+                    candidate_drift = drift(numbers, cached, tolerance)
+                    if candidate_drift <= best_drift:
+                        best, best_drift = entry_id, candidate_drift
+            if best is None:
+                metrics["misses"] += 1
+                return None
+            self.entries.move_to_end(best)
+            metrics["hits"] += 1
+            metrics["exact"] += int(best_drift == 0)
+            return self.entries[best][2]
+
+    def put(self, template, prompt, answer):
+        skeleton, numbers = split_numbers(prompt)
+        vector = embed(skeleton)[np.newaxis, :]
+        with self.lock:
+            if template not in self.indexes:
+                self.indexes[template] = faiss.IndexIDMap2(faiss.IndexFlatIP(DIMENSIONS))
+            entry_id = self.next_id
+            self.next_id += 1
+            self.indexes[template].add_with_ids(vector, np.array([entry_id], dtype=np.int64))
+            self.entries[entry_id] = (template, numbers, answer, time.time())
+            while len(self.entries) > self.max_entries:
+                oldest = next(iter(self.entries))
+                self._metrics(self.entries[oldest][0])["evictions"] += 1
+                self._remove(oldest)
+
+    def stats(self):
+        """Lookups, hits and hit rate per template and overall."""
+        with self.lock:
+            templates = {template: {**metrics, "entries": self.indexes[template].ntotal if template in self.indexes else 0,
+                                    "hit_rate": metrics["hits"] / metrics["lookups"] if metrics["lookups"] else 0.0}
+                         for template, metrics in self.metrics.items()}
+        lookups = sum(metrics["lookups"] for metrics in templates.values())
+        hits = sum(metrics["hits"] for metrics in templates.values())
+        return {"templates": templates, "lookups": lookups, "hits": hits, "hit_rate": hits / lookups if lookups else 0.0,
+                "entries": sum(metrics["entries"] for metrics in templates.values())}
+
+cache = PromptCache()
+
+def complete(template, prompt, generate, *args):
+    """Answer prompt from the cache when a near-duplicate was answered recently, else call generate(prompt, *args)."""
+    answer = cache.get(template, prompt)
+    if answer is None:
+        answer = generate(prompt, *args)
+        if not last_failed():  # Timeouts and errors are worth retrying on the next run
+            cache.put(template, prompt, answer)
+    return answer
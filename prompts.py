@@ -1,5 +1,5 @@
 from datetime import datetime
-import openai
+from llm_gateway import complete
 from streamlit import secrets  # Import secrets to access your API key
 import re  # Import regular expression module
 import base64
@@ -106,24 +106,10 @@ def format_stats_for_prompt(stats, network):
 
 def generate_ai_response(prompt, api_key):
     """Generate a response from OpenAI based on the given prompt."""
-    openai.api_key = api_key
-    response = openai.Completion.create(
-        engine="gpt-3.5-turbo-instruct",
-        prompt=prompt,
-        max_tokens=600,  # Adjust max_tokens if necessary
-        temperature=0.5,  # Lower for more deterministic responses
-    )
-    return response.choices[0].text.strip()
+    return complete(prompt, api_key, max_tokens=600, temperature=0.5)  # Lower temperature for more deterministic responses
     
 def generate_ai_response_with_icons(prompt, api_key, fts=None, nfts=None):
-    openai.api_key = api_key
-    response = openai.Completion.create(
-        engine="gpt-3.5-turbo-instruct",
-        prompt=prompt,
-        max_tokens=600,  # Adjust max_tokens if necessary
-        temperature=0.5,  # Lower for more deterministic responses
-    )
-    text_response = response.choices[0].text.strip()
+    text_response = complete(prompt, api_key, max_tokens=600, temperature=0.5)
 
     # Start the HTML for the table and initialize a counter
     icon_html = '<table>'
@@ -223,10 +209,10 @@ def format_smart_contract_info(contract_info):
     summary += "\nPlease provide a concise explanation of this information."
     return summary
 
-def smart_contract_information(contract_info):
-    """Generate a structured sentence for smart contract information."""
+def format_contract_access_for_openai(contract_info):
+    """Format the access-key summary of a smart contract for OpenAI prompt."""
     if not contract_info or "contract" not in contract_info or len(contract_info["contract"]) == 0:
-        return "No contract information available."
+        return None
 
     contract_entries = contract_info["contract"]
     total_keys = sum(len(entry.get("keys", [])) for entry in contract_entries)
@@ -247,6 +233,13 @@ def smart_contract_information(contract_info):
         prompt += "- Callable Methods: None\n"
 
     prompt += "This summary indicates the permissions and capabilities set within the smart contract's access keys. Full access keys provide unrestricted access, while function call keys may limit interactions to specific contract methods. A lack of callable methods suggests broader permissions for those keys. Please provide a concise explanation of this information."
+    return prompt
+
+def smart_contract_information(contract_info):
+    """Generate a structured sentence for smart contract information."""
+    prompt = format_contract_access_for_openai(contract_info)
+    if prompt is None:
+        return "No contract information available."
 
     # Call OpenAI API to generate a response based on the prompt
     api_key = secrets["API_KEY"]  # Access API key from secrets
@@ -359,24 +352,10 @@ def format_tokens_for_openai(tokens_info):
     return prompt
 
 def generate_summary_with_openai(summary_prompt, api_key):
-    response = openai.Completion.create(
-        engine="gpt-3.5-turbo-instruct",
-        prompt=summary_prompt,
-        max_tokens=600,  # Adjust as needed
-        temperature=0.5,
-        api_key=api_key
-    )
-    return response.choices[0].text.strip()
+    return complete(summary_prompt, api_key, max_tokens=600, temperature=0.5)
 
 def generate_summary_with_openai_transactions(summary_prompt, api_key):
-    response = openai.Completion.create(
-        engine="gpt-3.5-turbo-instruct",
-        prompt=summary_prompt,
-        max_tokens=600,  # Adjust as needed
-        temperature=0.5,
-        api_key=api_key
-    )
-    return response.choices[0].text.strip()
+    return complete(summary_prompt, api_key, max_tokens=600, temperature=0.5)
 
 def generate_network_summary_prompt(stats_data, fts_count, fts_txns_count, nfts_count, nfts_txns_count, avg_block_time, unique_block_producers, market_cap, volume):
     # Format market cap and volume as currency
@@ -404,24 +383,13 @@ def generate_network_summary_prompt(stats_data, fts_count, fts_txns_count, nfts_
 
 def generate_ai_response_anomaly(prompt, api_key):
     """Generate a response from OpenAI based on the given prompt."""
-    openai.api_key = api_key
-    response = openai.Completion.create(
-        engine="gpt-3.5-turbo-instruct",
-        prompt=prompt,
-        max_tokens=800,  # Adjust max_tokens if necessary
-        temperature=0.5,  # Lower for more deterministic responses
-    )
-    return response.choices[0].text.strip()
-
-def generate_anomaly_analytics_prompt(anomaly_dates):
-    anomaly_months = [date.strftime('%B %Y') for date in anomaly_dates]
-    month_counts = {month: anomaly_months.count(month) for month in set(anomaly_months)}
-
-    sorted_months = sorted(month_counts.items(), key=lambda x: datetime.strptime(x[0], "%B %Y"))
+    return complete(prompt, api_key, max_tokens=800, temperature=0.5)  # The bucketed anomaly report needs a longer answer
 
+def generate_anomaly_analytics_prompt(anomaly_report, bucket="month"):
+    """anomaly_report is the per-bucket frame from anomaly_report.aggregate_anomalies, oldest first."""
     prompt_parts = []
-    for i, (month, count) in enumerate(sorted_months):
-        entry = f"{month}: {count} anomalies detected.\n"
+    for i, (label, count, severity) in enumerate(zip(anomaly_report["label"], anomaly_report["count"], anomaly_report["severity"])):
+        entry = f"{label}: {count} anomalies detected ({severity} severity).\n"
         entry += f" ➢ Reason: [Insert brief reason]\n"
         entry += f" ➢ Mitigation: [Insert single step]\n"
 
@@ -432,7 +400,7 @@ def generate_anomaly_analytics_prompt(anomaly_dates):
         prompt_parts.append(entry)
 
     # Start with an introduction and append all parts
-    prompt = "Provide a concise analysis for each month's detected anomalies in NEAR-USD trading, including a brief reason and a single mitigation step. Here's the data:\n\n" + "".join(prompt_parts)
+    prompt = f"Provide a concise analysis for each {bucket}'s detected anomalies in NEAR-USD trading, including a brief reason and a single mitigation step. Here's the data:\n\n" + "".join(prompt_parts)
     prompt += "\n\nFocus on brevity and clarity in your analysis and recommendations."
 
     return prompt
\ No newline at end of file
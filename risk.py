@@ -0,0 +1,94 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import multiprocessing
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+
+CONFIDENCE_LEVELS = (0.95, 0.99)
+HORIZONS = (1, 10, 30)  # Trading days
+MONTE_CARLO_PATHS = 100_000
+CHUNK_PATHS = 50_000  # Paths simulated at once: a chunk holds CHUNK_PATHS x max(HORIZONS) float64 values (12 MB)
+PARALLEL_PATHS = 500_000  # Simulations this large are spread over a process pool when there is more than one CPU
+SEED = 0
+COLUMNS = ["Method", "Confidence", "Horizon (days)", "VaR", "CVaR"]
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def process_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Spawned workers only import this module, whatever threads the app process is running
+            _pool = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+def log_returns(close):
+    return np.diff(np.log(np.asarray(close, dtype=np.float64)))
+
+def _tail(losses, confidence):
+    """VaR and CVaR (mean loss beyond the VaR) of a sample of losses."""
+    var = np.quantile(losses, confidence)
+    return float(var), float(losses[losses >= var].mean())
+
+def historical(returns, horizons=HORIZONS, confidences=CONFIDENCE_LEVELS):
+    """VaR and CVaR from every overlapping window of past returns, as (method, confidence, horizon, VaR, CVaR) rows."""
+    cumulative = np.concatenate([[0.0], np.cumsum(returns)])
+    rows = []
+    for horizon in horizons:
+        # Loss as a fraction of the position over each window of `horizon` days
+        losses = -np.expm1(cumulative[horizon:] - cumulative[:-horizon])
+        for confidence in confidences:
+            rows.append(("Historical", confidence, horizon, *(_tail(losses, confidence) if len(losses) else (np.nan, np.nan))))
+    return rows
+
+def parametric(returns, horizons=HORIZONS, confidences=CONFIDENCE_LEVELS):
+    """VaR and CVaR with normal log returns scaled to each horizon, in closed form."""
+    mu, sigma = returns.mean(), returns.std(ddof=1)
+    rows = []
+    for horizon in horizons:
+        mean, scale = mu * horizon, sigma * np.sqrt(horizon)
+        for confidence in confidences:
+            cutoff = mean + scale * norm.ppf(1 - confidence)
+            # Expected simple return in the lognormal tail below the cutoff
+            tail_return = np.exp(mean + scale ** 2 / 2) * norm.cdf((cutoff - mean - scale ** 2) / scale) / (1 - confidence)
+            rows.append(("Parametric", confidence, horizon, float(-np.expm1(cutoff)), float(1 - tail_return)))
+    return rows
+
+def _simulate(returns, horizons, paths, seed):
+    # Bootstrapped daily log returns for every path and day, summed along each path in place
+    rng = np.random.default_rng(seed)
+    steps = returns[rng.integers(0, len(returns), size=(paths, max(horizons)))]
+    np.cumsum(steps, axis=1, out=steps)
+    return (-np.expm1(steps[:, np.asarray(horizons) - 1])).astype(np.float32)
+
+def simulate_losses(returns, horizons=HORIZONS, paths=MONTE_CARLO_PATHS, seed=SEED):
+    """Simulated losses, one column per horizon, from daily returns resampled with replacement.
+
+    Paths are drawn in chunks with their own seeds, so the result is the same however the chunks
+    are spread over processes, and memory stays bounded by the chunk size plus the losses kept.
+    """
+    sizes = [min(CHUNK_PATHS, paths - start) for start in range(0, paths, CHUNK_PATHS)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    if paths >= PARALLEL_PATHS and (os.cpu_count() or 1) > 1:
+        chunks = process_pool().map(_simulate, repeat(returns), repeat(tuple(horizons)), sizes, seeds)
+    else:
+        chunks = map(_simulate, repeat(returns), repeat(tuple(horizons)), sizes, seeds)
+    return np.concatenate(list(chunks))
+
+def monte_carlo(returns, horizons=HORIZONS, confidences=CONFIDENCE_LEVELS, paths=MONTE_CARLO_PATHS, seed=SEED):
+    losses = simulate_losses(returns, horizons, paths, seed)
+    return [("Monte Carlo", confidence, horizon, *_tail(losses[:, column], confidence))
+            for column, horizon in enumerate(horizons) for confidence in confidences]
+
+def risk_table(close, horizons=HORIZONS, confidences=CONFIDENCE_LEVELS, paths=MONTE_CARLO_PATHS, seed=SEED):
+    """VaR and CVaR of a long position in the close series by method, confidence and horizon."""
+    returns = log_returns(close)
+    if len(returns) < 2:
+        return pd.DataFrame(columns=COLUMNS)
+    rows = historical(returns, horizons, confidences) + parametric(returns, horizons, confidences)
+    rows += monte_carlo(returns, horizons, confidences, paths, seed)
+    return pd.DataFrame(rows, columns=COLUMNS)
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+WINDOWS = (30, 90)  # Rows per window; daily candles by default
+PERIODS_PER_YEAR = 365  # Crypto trades every day
+
+def periods_per_year(index):
+    """Rows per year from the median spacing of a datetime index, so intraday candles annualise correctly."""
+    if len(index) < 2:
+        return PERIODS_PER_YEAR
+    spacing = np.median(np.diff(index.asi8)) / 1e9
+    return 365 * 86400 / spacing if spacing > 0 else PERIODS_PER_YEAR
+
+def _prefix(*columns):
+    # Running sums with a leading zero, so the sum over rows [i, i + w) is prefix[i + w] - prefix[i]
+    return [np.concatenate([[0.0], np.cumsum(column)]) for column in columns]
+
+def _window(prefix, window):
+    sums = np.full(len(prefix) - 1, np.nan)
+    if window < len(prefix):
+        sums[window - 1:] = prefix[window:] - prefix[:-window]
+    return sums
+
+def _centered(values):
+    # Shifting by the overall mean keeps the running sums of squares small, so the
+    # differences between them do not cancel away the variance on long series
+    values = np.asarray(values, dtype=np.float64)
+    return values - values.mean(), values.mean()
+
+def rolling_mean_std(returns, windows=WINDOWS):
+    """Rolling mean and sample standard deviation for each window from one pass of running sums.
+
+    Every window costs O(n) however long it is; the first window - 1 values are NaN.
+    """
+    x, shift = _centered(returns)
+    sum_x, sum_xx = _prefix(x, x * x)
+    stats = {}
+    for window in windows:
+        total, squares = _window(sum_x, window), _window(sum_xx, window)
+        variance = np.maximum(squares - total * total / window, 0) / (window - 1)
+        stats[window] = (total / window + shift, np.sqrt(variance))
+    return stats
+
+def rolling_volatility(returns, windows=WINDOWS, periods=PERIODS_PER_YEAR):
+    """Annualised rolling volatility, one column per window."""
+    stats = rolling_mean_std(returns, windows)
+    return pd.DataFrame({f"{window}": std * np.sqrt(periods) for window, (_, std) in stats.items()}, index=returns.index)
+
+def rolling_sharpe(returns, windows=WINDOWS, periods=PERIODS_PER_YEAR, risk_free=0.0):
+    """Annualised rolling Sharpe ratio against a constant yearly risk-free rate, one column per window."""
+    stats = rolling_mean_std(returns - risk_free / periods, windows)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return pd.DataFrame({f"{window}": mean / std * np.sqrt(periods) for window, (mean, std) in stats.items()}, index=returns.index)
+
+def rolling_beta(returns, market_returns, windows=WINDOWS):
+    """Rolling OLS slope of returns on market_returns (aligned Series), one column per window."""
+    x, _ = _centered(market_returns)
+    y, _ = _centered(returns)
+    sum_x, sum_y, sum_xy, sum_xx = _prefix(x, y, x * y, x * x)
+    betas = {}
+    for window in windows:
+        total_x = _window(sum_x, window)
+        covariance = _window(sum_xy, window) - total_x * _window(sum_y, window) / window
+        variance = _window(sum_xx, window) - total_x * total_x / window
+        with np.errstate(divide="ignore", invalid="ignore"):
+            betas[f"{window}"] = covariance / variance
+    return pd.DataFrame(betas, index=returns.index)
+
+def drawdowns(close):
+    """Drawdown from the running peak and the worst drawdown so far, both as negative fractions."""
+    values = np.asarray(close, dtype=np.float64)
+    drawdown = values / np.maximum.accumulate(values) - 1
+    return pd.DataFrame({"Drawdown": drawdown, "Max drawdown": np.minimum.accumulate(drawdown)}, index=close.index)
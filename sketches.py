@@ -0,0 +1,190 @@
+import itertools
+import math
+import threading
+import numpy as np
+import pandas as pd
+
+HLL_PRECISION = 12  # 4096 one-byte registers: 4 KB per sketch, about 1.6% standard error
+BUCKET_SECONDS = 900  # Sketches are kept per 15 minutes of chain time
+RETENTION_SECONDS = 8 * 86400  # Buckets this far behind the newest row are dropped
+TOP_K_CAPACITY = 64  # Counters kept per heavy-hitter summary after pruning
+RELATIVE_ACCURACY = 0.01  # Quantile sketches answer within 1% of the true value
+
+def hash_values(values):
+    """Stable 64-bit hashes of strings, the same in every process so sketches from anywhere merge."""
+    return pd.util.hash_array(np.asarray(values, dtype=object))
+
+def _bit_length(values):
+    # Exact for uint64: each 32-bit half converts to float64 without rounding
+    high, low = (values >> np.uint64(32)).astype(np.float64), (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(high > 0, np.frexp(high)[1] + 32, np.frexp(low)[1])
+
+class HyperLogLog:
+    """Mergeable distinct-count sketch with a fixed 2**precision bytes of state."""
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, values):
+        if not len(values):
+            return
+        hashes = hash_values(values)
+        suffix_bits = 64 - self.precision
+        index = (hashes >> np.uint64(suffix_bits)).astype(np.int64)
+        suffix = hashes & np.uint64((1 << suffix_bits) - 1)
+        # Position of the first set bit after the index bits
+        rank = (suffix_bits - _bit_length(suffix) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def update(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate while many registers are still empty
+            return m * math.log(m / zeros)
+        return float(estimate)
+
+class SpaceSaving:
+    """Mergeable heavy-hitter summary with at most 2 * capacity counters, O(1) amortised per update.
+
+    Counts never underestimate; a key's true total is at least its count minus its error.
+    """
+
+    def __init__(self, capacity=TOP_K_CAPACITY):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.floor = 0  # Largest pruned count: what a key not tracked now may already have had
+
+    def add(self, keys, weights=None):
+        counts, errors, floor = self.counts, self.errors, self.floor
+        for key, weight in zip(keys.tolist(), itertools.repeat(1) if weights is None else weights.tolist()):
+            if key in counts:
+                counts[key] += weight
+            else:
+                counts[key] = floor + weight
+                errors[key] = floor
+        # Pruning is linear in the counters but runs at most once per `capacity` new keys
+        if len(counts) > 2 * self.capacity:
+            self._prune()
+
+    def _prune(self):
+        keys = list(self.counts)
+        values = np.fromiter(self.counts.values(), dtype=np.float64, count=len(keys))
+        order = np.argpartition(values, len(keys) - self.capacity)
+        self.floor = max(self.floor, float(values[order[:len(keys) - self.capacity]].max()))
+        for index in order[:len(keys) - self.capacity]:
+            del self.counts[keys[index]], self.errors[keys[index]]
+
+    def update(self, other):
+        if other.floor:
+            # Keys the other summary does not track may have had up to its floor there
+            for key in self.counts:
+                if key not in other.counts:
+                    self.counts[key] += other.floor
+                    self.errors[key] += other.floor
+        for key, count in other.counts.items():
+            if key in self.counts:
+                self.counts[key] += count
+                self.errors[key] += other.errors[key]
+            else:
+                self.counts[key] = self.floor + count
+                self.errors[key] = self.floor + other.errors[key]
+        self.floor += other.floor
+        if len(self.counts) > 2 * self.capacity:
+            self._prune()
+
+    def top(self, n):
+        """The n heaviest keys as (key, count, error), heaviest first."""
+        keys = sorted(self.counts, key=self.counts.get, reverse=True)[:n]
+        return [(key, self.counts[key], self.errors[key]) for key in keys]
+
+class DDSketch:
+    """Mergeable quantile sketch with relative error guarantees (DDSketch) over a fixed value range.
+
+    Bins are logarithmic and dense, so merging two sketches is one array addition. Values outside
+    [min_value, max_value] are clamped to the edge bins; zeros and negatives are counted apart.
+    """
+
+    def __init__(self, min_value, max_value, relative_accuracy=RELATIVE_ACCURACY):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.offset = math.ceil(math.log(min_value) / self.log_gamma)
+        self.bins = np.zeros(math.ceil(math.log(max_value) / self.log_gamma) - self.offset + 1, dtype=np.int64)
+        self.zeros = 0
+
+    def add(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        positive = values[values > 0]
+        self.zeros += len(values) - len(positive)
+        index = np.clip(np.ceil(np.log(positive) / self.log_gamma).astype(np.int64) - self.offset, 0, len(self.bins) - 1)
+        self.bins += np.bincount(index, minlength=len(self.bins))
+
+    def update(self, other):
+        self.bins += other.bins
+        self.zeros += other.zeros
+
+    def count(self):
+        return int(self.bins.sum()) + self.zeros
+
+    def quantiles(self, qs):
+        """Estimates for each q in qs, or None when the sketch is empty."""
+        total = self.count()
+        if not total:
+            return None
+        ranks = np.asarray(qs, dtype=np.float64) * (total - 1)
+        index = np.searchsorted(np.cumsum(self.bins), ranks - self.zeros, side="right")
+        # The midpoint of a bin (in relative terms) is within the accuracy of every value in it
+        estimates = 2 * self.gamma ** (np.minimum(index, len(self.bins) - 1) + self.offset) / (self.gamma + 1)
+        return np.where(ranks < self.zeros, 0.0, estimates)
+
+class TimeBuckets:
+    """One sketch per fixed slice of time, merged on demand to answer any window.
+
+    factory creates an empty sketch; sketches need add(*columns) and update(other).
+    """
+
+    def __init__(self, factory, width=BUCKET_SECONDS, retention=RETENTION_SECONDS):
+        self.factory = factory
+        self.width = width
+        self.retention = retention
+        self.buckets = {}  # bucket start (unix seconds) -> sketch
+        self.latest = None  # Newest row time seen; windows and retention follow chain time
+        self.lock = threading.Lock()
+
+    def add(self, timestamps, *columns):
+        """Add rows by their unix timestamps (seconds); columns are arrays aligned with timestamps."""
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        if not len(timestamps):
+            return
+        starts = timestamps - timestamps % self.width
+        with self.lock:
+            self.latest = max(self.latest or 0, int(timestamps.max()))
+            oldest = self.latest - self.retention
+            for start in np.unique(starts[timestamps >= oldest]):
+                rows = starts == start
+                bucket = self.buckets.get(int(start))
+                if bucket is None:
+                    bucket = self.buckets[int(start)] = self.factory()
+                bucket.add(*(column[rows] for column in columns))
+            for start in [start for start in self.buckets if start + self.width <= oldest]:
+                del self.buckets[start]
+
+    def merged(self, start=None, end=None):
+        """A new sketch covering every bucket that overlaps [start, end)."""
+        result = self.factory()
+        with self.lock:
+            for bucket_start, bucket in self.buckets.items():
+                if (start is None or bucket_start + self.width > start) and (end is None or bucket_start < end):
+                    result.update(bucket)
+        return result
+
+    def first_seen(self):
+        with self.lock:
+            return min(self.buckets) if self.buckets else None
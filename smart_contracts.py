@@ -1,36 +1,28 @@
 import streamlit as st
 import base64
-import requests
+from nearblocks import get_json, failure_message, LOOKUP
+from payloads import CONTRACT_FIELDS, DEPLOYMENTS_FIELDS, INVENTORY_FIELDS, TOKENS_FIELDS
 from prompts import smart_contract_information, format_smart_contract_info, generate_deployments_summary,format_deployments_for_openai,generate_ai_response_with_icons,format_inventory_for_openai,format_tokens_for_openai,generate_ai_response
 
 def get_contract_info(account_id, network):
-    base_url = "https://api-testnet.nearblocks.io" if network == 'Testnet' else "https://api.nearblocks.io"
-    url = f"{base_url}/v1/account/{account_id}/contract"
-    response = requests.get(url)
-    return response.json() if response.status_code == 200 else {"error": "Failed to retrieve contract information"}
+    data = get_json(network, f"/v1/account/{account_id}/contract", priority=LOOKUP, fields=CONTRACT_FIELDS)
+    return data if data is not None else {"error": failure_message("Failed to retrieve contract information")}
 
 def get_contract_deployments(account_id, network):
-    base_url = "https://api-testnet.nearblocks.io" if network == 'Testnet' else "https://api.nearblocks.io"
-    url = f"{base_url}/v1/account/{account_id}/contract/deployments"
-    response = requests.get(url)
-    return response.json() if response.status_code == 200 else {"error": "Failed to retrieve contract deployment information"}
+    data = get_json(network, f"/v1/account/{account_id}/contract/deployments", priority=LOOKUP, fields=DEPLOYMENTS_FIELDS)
+    return data if data is not None else {"error": failure_message("Failed to retrieve contract deployment information")}
 
 def get_inventory(account_id, network):
-    base_url = "https://api-testnet.nearblocks.io" if network == 'Testnet' else "https://api.nearblocks.io"
-    url = f"{base_url}/v1/account/{account_id}/inventory"
-    response = requests.get(url)
-    return response.json() if response.status_code == 200 else {"error": "Failed to retrieve inventory information"}
+    data = get_json(network, f"/v1/account/{account_id}/inventory", priority=LOOKUP, fields=INVENTORY_FIELDS)
+    return data if data is not None else {"error": failure_message("Failed to retrieve inventory information")}
 
 def get_tokens(account_id, network):
-    base_url = "https://api-testnet.nearblocks.io" if network == 'Testnet' else "https://api.nearblocks.io"
-    url = f"{base_url}/v1/account/{account_id}/tokens"
-    response = requests.get(url)
-    return response.json() if response.status_code == 200 else {"error": "Failed to retrieve tokens information"}
+    data = get_json(network, f"/v1/account/{account_id}/tokens", priority=LOOKUP, fields=TOKENS_FIELDS)
+    return data if data is not None else {"error": failure_message("Failed to retrieve tokens information")}
 
 def app(network):
     if network != 'Select Network':
         st.title('🔎 NEAR Explorer Pro')
-        st.markdown(user_prompt_style, unsafe_allow_html=True)
 
         # Set placeholder based on the selected network
         placeholder = "Ex:-farhun.testnet" if network == 'Testnet' else "Ex:-zavodil.poolv1.near"
@@ -130,29 +122,5 @@ def deploy_contract(base64_wasm, account_id):
     """
     st.components.v1.html(html, height=100)
 
-user_prompt_style = """
-    <style>
-        .user_prompt, .ai_response {
-            padding: 10px;
-            border-radius: 10px;
-            margin-bottom: 10px;
-        }
-        .user_prompt {
-            background-color: #e1f5fe;
-        }
-        .ai_response {
-            background-color: #f0f4c3;
-        }
-        @media (prefers-color-scheme: dark) {
-            .user_prompt {
-                background-color: #333;
-            }
-            .ai_response {
-                background-color: #444;
-            }
-        }
-    </style>
-    """
-
 if __name__ == "__main__":
     app('')  # Default to 'Select Network' as a placeholder
\ No newline at end of file
@@ -0,0 +1,518 @@
+import argparse
+import base64
+import json
+import mmap
+import os
+import re
+import struct
+import zlib
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import islice
+from urllib.parse import parse_qs, urlparse
+import numpy as np
+import pandas as pd
+
+# Shape of the synthetic chain; the defaults are in the range of NEAR mainnet
+START_HEIGHT = 100_000_000
+START_TIMESTAMP = 1_700_000_000_000_000_000  # Nanoseconds, like NearBlocks' block_timestamp
+BLOCK_TIME = 1.1  # Mean seconds between blocks
+BLOCK_TIME_SHAPE = 12  # Gamma shape of the block interval; higher is more regular
+TXNS_PER_BLOCK = 40  # Mean transactions per block outside bursts
+BURST_LOAD = 10  # Load multiplier during high-TPS periods
+BURST_SHARE = 0.05  # Share of blocks that fall inside a burst
+BURST_LENGTH = 600  # Mean blocks per burst
+GAS_LIMIT = 1_000_000_000_000_000
+VALIDATORS = 100
+ACCOUNTS = 5_000_000  # Distinct signers; activity follows a power law over them
+CONTRACTS = 20_000
+SIGNER_EXPONENT = 1.3  # Zipf exponent of signer activity; lower means whales dominate less
+RECEIVER_EXPONENT = 1.2
+WHALES = 50  # The most active signers are named whale<rank>.near
+FEE_MEDIAN = 2.5e20  # Yocto NEAR
+FEE_SIGMA = 0.9
+CHUNK = 10_000  # Rows generated per vectorised step
+ACCOUNT_CHUNK = 1_000  # Account txns generated per cached page window
+# Per-account sizes: ordinary accounts are small, whales are the heaviest accounts NearBlocks serves
+ACCOUNT_SIZES = {
+    "normal": {"txns": 200, "inventory": 20, "keys": 3, "deployments": 2},
+    "whale": {"txns": 5_000_000, "inventory": 10_000, "keys": 2_000, "deployments": 500},
+}
+BASE58 = np.frombuffer(b"123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz", dtype=np.uint8)
+ACTIONS = ["FUNCTION_CALL", "TRANSFER", "ADD_KEY", "CREATE_ACCOUNT", "DEPLOY_CONTRACT", "DELETE_KEY", "STAKE"]
+ACTION_WEIGHTS = np.array([0.78, 0.15, 0.03, 0.02, 0.005, 0.01, 0.005])
+
+def _seed(*parts):
+    return zlib.crc32("/".join(map(str, parts)).encode())
+
+def _hashes(rng, count, length=44):
+    # Base58 strings the length of NEAR block and transaction hashes, built as one byte matrix
+    letters = BASE58[rng.integers(0, len(BASE58), (count, length))]
+    return np.ascontiguousarray(letters).view(f"S{length}").ravel().astype(str)
+
+def account_name(rank):
+    return f"whale{rank}.near" if rank < WHALES else f"user{rank}.near"
+
+def contract_name(rank):
+    return f"app{rank}.near"
+
+def is_whale(account_id):
+    return account_id.startswith("whale")
+
+def _validator_weights():
+    # Stake falls off steeply after the top pools
+    weights = 1 / np.arange(1, VALIDATORS + 1) ** 1.1
+    return weights / weights.sum()
+
+def _burst_mask(rng, count, state):
+    """Alternating calm and burst runs with geometric lengths; state carries the open run across chunks."""
+    mask = np.empty(count, dtype=bool)
+    filled = 0
+    while filled < count:
+        if state["left"] == 0:
+            state["burst"] = not state["burst"]
+            mean = BURST_LENGTH if state["burst"] else BURST_LENGTH * (1 - BURST_SHARE) / BURST_SHARE
+            state["left"] = int(rng.geometric(1 / mean))
+        take = min(state["left"], count - filled)
+        mask[filled:filled + take] = state["burst"]
+        filled += take
+        state["left"] -= take
+    return mask
+
+def _block_chunk(rng, height, timestamp, count, state):
+    intervals = rng.gamma(BLOCK_TIME_SHAPE, BLOCK_TIME / BLOCK_TIME_SHAPE, count)
+    burst = _burst_mask(rng, count, state)
+    load = np.where(burst, BURST_LOAD, 1.0)
+    txns = rng.poisson(TXNS_PER_BLOCK * load * intervals / BLOCK_TIME)
+    utilisation = np.clip(rng.beta(2, 8, count) * load, 0, 1)
+    return {
+        "height": height + np.arange(count),
+        "timestamp": timestamp + np.cumsum((intervals * 1e9).astype(np.int64)),
+        "hash": _hashes(rng, count),
+        "author": rng.choice(VALIDATORS, count, p=_validator_weights()),
+        "gas_used": (utilisation * GAS_LIMIT).astype(np.int64),
+        "txns": txns,
+        "receipts": txns + rng.poisson(txns * 0.8),
+        "burst": burst,
+    }
+
+def _block_rows(chunk):
+    for height, timestamp, block_hash, author, gas_used, txns, receipts in zip(
+            chunk["height"].tolist(), chunk["timestamp"].tolist(), chunk["hash"], chunk["author"].tolist(),
+            chunk["gas_used"].tolist(), chunk["txns"].tolist(), chunk["receipts"].tolist()):
+        yield {
+            "block_height": height,
+            "block_hash": block_hash,
+            "block_timestamp": str(timestamp),
+            "author_account_id": f"validator{author}.poolv1.near",
+            "gas_price": "100000000",
+            "chunks_agg": {"gas_used": gas_used, "gas_limit": GAS_LIMIT, "shards": 6},
+            "transactions_agg": {"count": txns},
+            "receipts_agg": {"count": receipts},
+        }
+
+def _txn_chunk(rng, blocks):
+    """Transactions for a block chunk: each block gets exactly its transactions_agg.count rows."""
+    per_block = blocks["txns"]
+    count = int(per_block.sum())
+    block_index = np.repeat(np.arange(len(per_block)), per_block)
+    # Spread each block's transactions over the interval before it was produced
+    timestamps = blocks["timestamp"][block_index] - (rng.random(count) * BLOCK_TIME * 1e9).astype(np.int64)
+    signers = (rng.zipf(SIGNER_EXPONENT, count) - 1) % ACCOUNTS
+    actions = rng.choice(len(ACTIONS), count, p=ACTION_WEIGHTS)
+    # Transfers go to other accounts, everything else mostly to contracts
+    to_contract = (actions != 1) & (rng.random(count) < 0.9)
+    receivers = np.where(to_contract, (rng.zipf(RECEIVER_EXPONENT, count) - 1) % CONTRACTS,
+                         (rng.zipf(SIGNER_EXPONENT, count) - 1) % ACCOUNTS)
+    fees = np.exp(rng.normal(np.log(FEE_MEDIAN), FEE_SIGMA, count))
+    return {
+        "hash": _hashes(rng, count),
+        "timestamp": timestamps,
+        "height": blocks["height"][block_index],
+        "block_hash": blocks["hash"][block_index],
+        "signer": signers,
+        "receiver": receivers,
+        "to_contract": to_contract,
+        "action": actions,
+        "fee": fees,
+        "gas": (fees / 1e8).astype(np.int64),  # Fee is gas times the 1e8 yocto gas price
+        "success": rng.random(count) > 0.02,
+    }
+
+def _txn_rows(chunk):
+    for txn_hash, timestamp, height, block_hash, signer, receiver, to_contract, action, fee, gas, success in zip(
+            chunk["hash"], chunk["timestamp"].tolist(), chunk["height"].tolist(), chunk["block_hash"],
+            chunk["signer"].tolist(), chunk["receiver"].tolist(), chunk["to_contract"].tolist(),
+            chunk["action"].tolist(), chunk["fee"].tolist(), chunk["gas"].tolist(), chunk["success"].tolist()):
+        yield {
+            "transaction_hash": txn_hash,
+            "included_in_block_hash": block_hash,
+            "block_timestamp": str(timestamp),
+            "block": {"block_height": height},
+            "signer_account_id": account_name(signer),
+            "receiver_account_id": contract_name(receiver) if to_contract else account_name(receiver),
+            "actions": [{"action": ACTIONS[action], "method": "call" if action == 0 else None}],
+            "outcomes": {"status": success},
+            "outcomes_agg": {"transaction_fee": fee, "gas_used": gas},
+        }
+
+def iter_block_chunks(seed=0, height=START_HEIGHT, timestamp=START_TIMESTAMP, chunk=CHUNK):
+    """Endless chain of block chunks (dicts of arrays), oldest first."""
+    rng = np.random.default_rng(seed)
+    state = {"burst": True, "left": 0}
+    while True:
+        blocks = _block_chunk(rng, height, timestamp, chunk, state)
+        yield blocks
+        height, timestamp = int(blocks["height"][-1]) + 1, int(blocks["timestamp"][-1])
+
+def iter_blocks(count=None, seed=0, **chain):
+    """Stream NearBlocks /v1/blocks rows, oldest first; count=None streams forever."""
+    rows = (row for blocks in iter_block_chunks(seed, **chain) for row in _block_rows(blocks))
+    return islice(rows, count)
+
+def iter_chain(seed=0, **chain):
+    """Stream (blocks, txns) chunk pairs whose transaction counts and timestamps agree."""
+    rng = np.random.default_rng(seed + 1)
+    for blocks in iter_block_chunks(seed, **chain):
+        yield blocks, _txn_chunk(rng, blocks)
+
+def iter_txns(count=None, seed=0, **chain):
+    """Stream NearBlocks /v1/txns rows, oldest first, with power-law signers and log-normal fees."""
+    rows = (row for _, txns in iter_chain(seed, **chain) for row in _txn_rows(txns))
+    return islice(rows, count)
+
+def make_stats(blocks=None, txns=None, seed=0):
+    """A /v1/stats row; pass the last block row and the txn total to match a generated dataset."""
+    rng = np.random.default_rng(seed)
+    price = rng.uniform(2, 8)
+    return {
+        "block": str(blocks["block_height"] if blocks else START_HEIGHT),
+        "total_supply": str(1_190_000_000 * 10 ** 24),
+        "total_txns": str(txns if txns is not None else 3_000_000_000),
+        "nodes_online": str(VALIDATORS * 2),
+        "avg_block_time": f"{BLOCK_TIME:.2f}",
+        "gas_price": "100000000",
+        "near_price": f"{price:.4f}",
+        "near_btc_price": f"{price / 60000:.10f}",
+        "market_cap": f"{price * 1.1e9:.2f}",
+        "volume": f"{rng.uniform(1e8, 5e8):.2f}",
+        "high_24h": f"{price * 1.04:.4f}",
+        "high_all": "20.4400",
+        "low_24h": f"{price * 0.96:.4f}",
+        "low_all": "0.5260",
+        "change_24": f"{rng.normal(0, 3):.4f}",
+    }
+
+def iter_charts(days=365 * 4, end="2024-01-01", seed=0):
+    """Daily /v1/charts rows, oldest first, with a random-walk price and weekly activity cycle."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(end=end, periods=days, freq="D")
+    price = 3 * np.exp(np.cumsum(rng.normal(0, 0.04, days)))
+    txns = TXNS_PER_BLOCK * 86400 / BLOCK_TIME * (1 + 0.15 * np.sin(np.arange(days) * 2 * np.pi / 7)) \
+        * np.exp(rng.normal(0, 0.2, days))
+    active = txns / rng.uniform(15, 40, days)
+    for i, date in enumerate(dates):
+        yield {
+            "date": date.strftime("%Y-%m-%dT00:00:00.000Z"),
+            "near_price": f"{price[i]:.4f}",
+            "market_cap": f"{price[i] * 1.1e9:.2f}",
+            "total_supply": str(1_190_000_000 * 10 ** 24),
+            "blocks": str(int(86400 / BLOCK_TIME)),
+            "gas_fee": f"{txns[i] * FEE_MEDIAN:.0f}",
+            "txns": str(int(txns[i])),
+            "txn_volume": f"{txns[i] * rng.uniform(0.5, 5):.0f}",
+            "txn_volume_usd": f"{txns[i] * price[i]:.2f}",
+            "active_accounts": str(int(active[i])),
+            "new_accounts": str(int(active[i] * rng.uniform(0.02, 0.1))),
+        }
+
+def _png(width, height, rng):
+    # Noisy pixels keep the image from compressing, so icon sizes span a realistic range
+    raw = b"".join(b"\x00" + rng.integers(0, 256, width * 3, dtype=np.uint8).tobytes() for _ in range(height))
+
+    def block(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    return (b"\x89PNG\r\n\x1a\n" + block(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + block(b"IDAT", zlib.compress(raw)) + block(b"IEND", b""))
+
+@lru_cache(maxsize=None)
+def icons():
+    """Base64 data-URL icons from 1 KB to about 27 KB, shared by every inventory."""
+    rng = np.random.default_rng(7)
+    return tuple("data:image/png;base64," + base64.b64encode(_png(size, size, rng)).decode() for size in (16, 24, 32, 48, 64, 96))
+
+def make_inventory(fts=20, nfts=20, seed=0):
+    """A /v1/account/{id}/inventory payload; most tokens carry an icon, a few do not."""
+    rng = np.random.default_rng(seed)
+    choices = icons()
+
+    def icon():
+        return choices[rng.integers(len(choices))] if rng.random() < 0.85 else None
+
+    return {"inventory": {
+        "fts": [{"contract": f"token{i}.near", "amount": str(int(rng.integers(1, 10 ** 6)) * 10 ** 18),
+                 "ft_metas": {"name": f"Token {i}", "symbol": f"TK{i}", "decimals": 18, "icon": icon()}} for i in range(fts)],
+        "nfts": [{"contract": f"nft{i}.near", "quantity": str(int(rng.zipf(2))),
+                  "nft_meta": {"name": f"Collection {i}", "symbol": f"NFT{i}", "icon": icon()}} for i in range(nfts)],
+    }}
+
+def make_tokens(fts=20, nfts=20):
+    return {"tokens": {"fts": [f"token{i}.near" for i in range(fts)], "nfts": [f"nft{i}.near" for i in range(nfts)]}}
+
+def make_contract(keys=3, seed=0):
+    """A /v1/account/{id}/contract payload with a mix of full-access and function-call keys."""
+    rng = np.random.default_rng(seed)
+    public_keys = _hashes(rng, keys)
+    rows = []
+    for i in range(keys):
+        if i % 4 == 0:
+            permission = "FullAccess"
+        else:
+            permission = {"FunctionCall": {"allowance": str(int(rng.integers(1, 100)) * 10 ** 23),
+                                           "receiver_id": contract_name(int(rng.zipf(RECEIVER_EXPONENT)) % CONTRACTS),
+                                           "method_names": [f"method_{j}" for j in range(int(rng.integers(0, 6)))]}}
+        rows.append({"public_key": f"ed25519:{public_keys[i]}", "access_key": {"nonce": int(rng.integers(1, 10 ** 12)), "permission": permission}})
+    return {"contract": [{"keys": rows}]}
+
+def make_keys(account_id, public_key=None):
+    """A /v1/keys/{key} payload resolving a public key to its account."""
+    return {"keys": [{"public_key": public_key or f"ed25519:{_hashes(np.random.default_rng(_seed(account_id)), 1)[0]}",
+                      "account_id": account_id, "permission_kind": "FULL_ACCESS",
+                      "created": {"transaction_hash": _hashes(np.random.default_rng(_seed(account_id, "key")), 1)[0],
+                                  "block_timestamp": str(START_TIMESTAMP)}}]}
+
+def make_deployments(count=2, seed=0):
+    rng = np.random.default_rng(seed)
+    hashes = _hashes(rng, count)
+    timestamps = np.sort(START_TIMESTAMP - rng.integers(0, 10 ** 17, count))[::-1]
+    return {"deployments": [{"transaction_hash": hashes[i], "block_timestamp": str(timestamps[i]),
+                             "receipt_predecessor_account_id": account_name(int(rng.zipf(SIGNER_EXPONENT)) % ACCOUNTS)}
+                            for i in range(count)]}
+
+def make_account(account_id, seed=0):
+    rng = np.random.default_rng(seed)
+    return {"account": [{"account_id": account_id, "amount": str(int(rng.lognormal(np.log(50), 2) * 10 ** 24)),
+                         "block_hash": _hashes(rng, 1)[0], "block_height": START_HEIGHT,
+                         "code_hash": "11111111111111111111111111111111", "storage_paid_at": 0,
+                         "storage_usage": int(rng.integers(182, 10 ** 6))}]}
+
+def account_sizes(account_id):
+    """Record counts for an account: whale ids get the whale tier, others a log-normal spread around normal."""
+    if is_whale(account_id):
+        return ACCOUNT_SIZES["whale"]
+    rng = np.random.default_rng(_seed(account_id, "sizes"))
+    return {name: max(1, int(size * rng.lognormal(0, 1))) for name, size in ACCOUNT_SIZES["normal"].items()}
+
+@lru_cache(maxsize=256)
+def _account_window(account_id, kind, window):
+    # ACCOUNT_CHUNK rows of an account's history, newest first; window 0 ends at the newest transaction
+    rng = np.random.default_rng(_seed(account_id, kind, window))
+    total = account_sizes(account_id)["txns"]
+    span = (START_TIMESTAMP - 1_600_000_000_000_000_000) // max(total // ACCOUNT_CHUNK, 1)
+    end = START_TIMESTAMP - window * span
+    blocks = {"height": np.zeros(ACCOUNT_CHUNK, dtype=np.int64), "hash": _hashes(rng, ACCOUNT_CHUNK),
+              "timestamp": np.sort(end - rng.integers(0, span, ACCOUNT_CHUNK))[::-1],
+              "txns": np.ones(ACCOUNT_CHUNK, dtype=np.int64)}
+    blocks["height"] = START_HEIGHT - (START_TIMESTAMP - blocks["timestamp"]) // int(BLOCK_TIME * 1e9)
+    rows = list(_txn_rows(_txn_chunk(rng, blocks)))
+    for row in rows[::2]:
+        row["signer_account_id"] = account_id  # Half of the history is sent by the account itself
+    for row in rows[1::2]:
+        row["receiver_account_id"] = account_id
+    return rows
+
+def account_txns(account_id, kind="txns", cursor=None, per_page=25):
+    """One cursor page of /v1/account/{id}/txns (or ft-txns / nft-txns), newest first."""
+    total = account_sizes(account_id)["txns"]
+    start = int(cursor or 0)
+    end = min(start + per_page, total)
+    rows = []
+    if end > start:
+        for window in range(start // ACCOUNT_CHUNK, (end - 1) // ACCOUNT_CHUNK + 1):
+            offset = window * ACCOUNT_CHUNK
+            rows += _account_window(account_id, kind, window)[max(start - offset, 0):end - offset]
+    return {"txns": rows, "cursor": str(end) if end < total else None}
+
+# --- Datasets on disk ----------------------------------------------------------------------------------
+
+def write_dataset(directory, blocks=1_000_000, days=365 * 4, seed=0):
+    """Write blocks.jsonl and txns.jsonl (oldest first) plus stats.json and charts.json for the stand-in server."""
+    os.makedirs(directory, exist_ok=True)
+    written, txn_total, last = 0, 0, None
+    with open(os.path.join(directory, "blocks.jsonl"), "w") as block_file, \
+            open(os.path.join(directory, "txns.jsonl"), "w") as txn_file:
+        for block_chunk, txn_chunk in iter_chain(seed, chunk=min(CHUNK, blocks)):
+            take = min(blocks - written, len(block_chunk["height"]))
+            keep = np.searchsorted(txn_chunk["height"], block_chunk["height"][0] + take)
+            block_chunk = {name: values[:take] for name, values in block_chunk.items()}
+            txn_chunk = {name: values[:keep] for name, values in txn_chunk.items()}
+            for row in _block_rows(block_chunk):
+                block_file.write(json.dumps(row) + "\n")
+                last = row
+            for row in _txn_rows(txn_chunk):
+                txn_file.write(json.dumps(row) + "\n")
+            written += take
+            txn_total += keep
+            if written >= blocks:
+                break
+    with open(os.path.join(directory, "stats.json"), "w") as stats_file:
+        json.dump({"stats": [make_stats(last, txn_total, seed)]}, stats_file)
+    with open(os.path.join(directory, "charts.json"), "w") as charts_file:
+        json.dump({"charts": list(iter_charts(days, seed=seed))}, charts_file)
+    return {"blocks": written, "txns": txn_total}
+
+class JsonLines:
+    """Random access to the rows of a JSON lines file by index, without loading or decoding it."""
+
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if os.path.getsize(path) else b""
+        ends = np.flatnonzero(np.frombuffer(self.data, dtype=np.uint8) == ord("\n")) if self.data else np.array([], dtype=np.int64)
+        self.starts = np.concatenate([[0], ends[:-1] + 1])[:len(ends)]
+        self.ends = ends
+
+    def __len__(self):
+        return len(self.ends)
+
+    def rows(self, start, stop):
+        start, stop = max(start, 0), min(stop, len(self))
+        return [self.data[self.starts[i]:self.ends[i]] for i in range(start, stop)]
+
+    def newest(self, page, per_page):
+        # Page 1 is the newest per_page rows, newest first, like NearBlocks' order=desc
+        stop = len(self) - (page - 1) * per_page
+        return self.rows(stop - per_page, stop)[::-1]
+
+def _count(key, count):
+    return {key: [{"count": str(count)}]}
+
+class Dataset:
+    """Answers NearBlocks API paths from a directory written by write_dataset.
+
+    Chain-wide lists come from the files; account endpoints are generated deterministically
+    from the account id, with whale-sized histories for ids starting with "whale".
+    """
+
+    ACCOUNT_PATH = re.compile(r"^/v1/account/([^/]+)(/.*)?$")
+
+    def __init__(self, directory):
+        self.blocks = JsonLines(os.path.join(directory, "blocks.jsonl"))
+        self.txns = JsonLines(os.path.join(directory, "txns.jsonl"))
+        with open(os.path.join(directory, "stats.json"), "rb") as stats_file:
+            self.stats = stats_file.read()
+        with open(os.path.join(directory, "charts.json")) as charts_file:
+            self.charts = json.load(charts_file)["charts"]
+
+    @staticmethod
+    def _list(key, rows):
+        return b'{"%s":[' % key.encode() + b",".join(rows) + b"]}"
+
+    def respond(self, path, query):
+        """(status, body bytes) for a request path and its parsed query string."""
+        page = int(query.get("page", 1))
+        per_page = min(int(query.get("per_page", 25)), 250)
+        if path == "/v1/stats":
+            return 200, self.stats
+        if path in ("/v1/blocks", "/v1/txns"):
+            rows = self.blocks if path == "/v1/blocks" else self.txns
+            return 200, self._list(path[4:], rows.newest(page, per_page))
+        if path == "/v1/blocks/latest":
+            return 200, self._list("blocks", self.blocks.newest(1, int(query.get("limit", 10))))
+        if path in ("/v1/blocks/count", "/v1/txns/count"):
+            key = path.split("/")[2]
+            return 200, json.dumps(_count(key, len(getattr(self, key)))).encode()
+        if path == "/v1/charts":
+            return 200, json.dumps({"charts": self.charts}).encode()
+        if path == "/v1/charts/latest":
+            return 200, json.dumps({"charts": self.charts[-7:]}).encode()
+        if path in ("/v1/fts/count", "/v1/nfts/count"):
+            return 200, json.dumps(_count("tokens", 12_000 if "fts" in path else 300_000)).encode()
+        if path in ("/v1/fts/txns/count", "/v1/nfts/txns/count"):
+            return 200, json.dumps(_count("txns", len(self.txns) // (20 if "fts" in path else 200))).encode()
+        if path.startswith("/v1/keys/"):
+            return 200, json.dumps(make_keys(account_name(_seed(path) % ACCOUNTS), path[len("/v1/keys/"):])).encode()
+        if path == "/v1/search":
+            return 200, json.dumps(self.search(query.get("keyword", ""))).encode()
+        match = self.ACCOUNT_PATH.match(path)
+        if match:
+            payload = self.account(match.group(1), match.group(2) or "", query, per_page)
+            if payload is not None:
+                return 200, json.dumps(payload).encode()
+        return 404, b'{"message":"Not found"}'
+
+    def search(self, keyword):
+        # Heights and account ids resolve; hashes are not indexed, so they search the newest page only
+        if keyword.isdigit() and START_HEIGHT <= int(keyword) < START_HEIGHT + len(self.blocks):
+            return {"blocks": [json.loads(self.blocks.rows(int(keyword) - START_HEIGHT, int(keyword) - START_HEIGHT + 1)[0])]}
+        if keyword.endswith(".near"):
+            return {"accounts": [{"account_id": keyword}]}
+        recent = [json.loads(row) for row in self.txns.newest(1, 250)]
+        return {"txns": [row for row in recent if row["transaction_hash"] == keyword]}
+
+    def account(self, account_id, path, query, per_page):
+        sizes = account_sizes(account_id)
+        seed = _seed(account_id)
+        half = sizes["inventory"] // 2
+        if path == "":
+            return make_account(account_id, seed)
+        if path in ("/txns", "/ft-txns", "/nft-txns"):
+            return account_txns(account_id, path[1:], query.get("cursor"), per_page)
+        if path in ("/txns/count", "/ft-txns/count", "/nft-txns/count"):
+            return _count("txns", sizes["txns"] // {"/txns/count": 1, "/ft-txns/count": 4, "/nft-txns/count": 20}[path])
+        if path == "/inventory":
+            return make_inventory(half, sizes["inventory"] - half, seed)
+        if path == "/tokens":
+            return make_tokens(half, sizes["inventory"] - half)
+        if path == "/contract":
+            return make_contract(sizes["keys"], seed)
+        if path == "/contract/deployments":
+            return make_deployments(sizes["deployments"], seed)
+        return None
+
+def serve(directory, host="127.0.0.1", port=8765):
+    """Serve a dataset as a NearBlocks stand-in; point the app at it with NEARBLOCKS_BASE_URL=http://host:port."""
+    dataset = Dataset(directory)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+            try:
+                status, body = dataset.respond(url.path.rstrip("/"), query)
+            except ValueError:
+                status, body = 400, b'{"message":"Bad request"}'
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    print(f"Serving {len(dataset.blocks):,} blocks and {len(dataset.txns):,} txns from {directory} on http://{host}:{port}")
+    server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic NearBlocks data and serve it as a local stand-in API.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    generate = commands.add_parser("generate", help="Write a dataset directory")
+    generate.add_argument("directory")
+    generate.add_argument("--blocks", type=int, default=1_000_000)
+    generate.add_argument("--days", type=int, default=365 * 4, help="Days of daily chart history")
+    generate.add_argument("--seed", type=int, default=0)
+    stand_in = commands.add_parser("serve", help="Serve a dataset directory over HTTP")
+    stand_in.add_argument("directory")
+    stand_in.add_argument("--host", default="127.0.0.1")
+    stand_in.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        counts = write_dataset(args.directory, args.blocks, args.days, args.seed)
+        print(f"Wrote {counts['blocks']:,} blocks and {counts['txns']:,} txns to {args.directory}")
+    else:
+        serve(args.directory, args.host, args.port)
+
+if __name__ == "__main__":
+    main()
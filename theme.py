@@ -0,0 +1,269 @@
+import hashlib
+import json
+from functools import lru_cache
+import streamlit as st
+import streamlit.components.v1 as components
+
+# External stylesheets, loaded once into the page head
+ASSETS = ["https://cdnjs.cloudflare.com/ajax/libs/font-awesome/5.15.1/css/all.min.css"]
+
+# Every stylesheet the pages use, grouped by the part of the app they style
+STYLES = {
+    "animations": """
+        @keyframes fadeIn {0% {opacity: 0;} 100% {opacity: 1;}}
+        @keyframes fadeInAnimation {0% {opacity: 0;} 100% {opacity: 1;}}
+        .animate {animation: fadeIn ease 3s; animation-iteration-count: 1; animation-fill-mode: forwards;}
+        .animate-fade-in {animation: fadeIn 1s ease-in-out;}
+    """,
+    "prompts": """
+        .user_prompt, .ai_response, .ai_response_summary {
+            padding: 10px;
+            border-radius: 10px;
+            margin-bottom: 10px;
+        }
+        .user_prompt {
+            background-color: #e1f5fe;  /* Light blue background */
+        }
+        .ai_response {
+            background-color: #f0f4c3;  /* Light green background */
+        }
+        .ai_response_summary {
+            background-color: #F5D6D0;
+        }
+        @media (prefers-color-scheme: dark) {
+            .user_prompt {
+                background-color: #333;  /* Darker background for dark mode */
+            }
+            .ai_response, .ai_response_summary {
+                background-color: #444;  /* Even darker background for dark mode */
+            }
+        }
+    """,
+    "headers": """
+        .header {
+            color: #ff4f8b;
+            font-size: 3rem;
+            text-shadow: 2px 2px #ffcccb;
+            font-weight: bold;
+            margin-bottom: 1rem;
+        }
+        .sub-header {
+            color: #30336b;
+            font-size: 2rem;
+            text-shadow: 1px 1px #dfe6e9;
+            font-weight: bold;
+            margin-bottom: 1rem;
+        }
+        .near-symbol {
+            font-size: 1.5rem;
+            color: #6c5ce7;
+        }
+        .big-font {font-size: 30px !important; font-weight: bold; color: #ff6347;}
+        .small-font {font-size: 18px !important;}
+        .page-title {text-align: center; margin-bottom: 30px;}
+        .chart-title {
+            text-align: center;
+            margin-top: 40px;
+            font-weight: bold;
+            font-size: 24px;
+            color: #193785;
+        }
+    """,
+    "about": """
+        .highlight {
+            color: #2557a7;
+            font-weight: bold;
+        }
+        .about-container {
+            animation: fadeInAnimation ease 3s;
+            animation-iteration-count: 1;
+            animation-fill-mode: forwards;
+        }
+    """,
+    "metrics": """
+        .st-emotion-cache-1isgx0k {
+            width: 800px !important;
+        }
+        .metric-container {
+            border-radius: 10px;
+            background-color: #f0f2f6;
+            box-shadow: 0 2px 12px rgba(0,0,0,0.1);
+            padding: 20px;
+            height: 150px;  /* Fixed height for uniform size */
+            display: flex;
+            flex-direction: column;
+            justify-content: space-around;
+            transition: transform 0.2s;
+            cursor: pointer;
+            margin: 10px 0px;
+        }
+        .metric-container h3 {
+            font-size: 16px;
+            margin: 0;
+            padding: 0;
+            text-align: center;
+        }
+        .metric-container p {
+            font-size: 20px;
+            margin: 0;
+            padding: 0;
+            text-align: center;
+            word-wrap: break-word;  /* Ensure long words do not overflow */
+        }
+        .metric-container:hover {
+            transform: scale(1.05);
+        }
+    """,
+    "stat_cards": """
+        .stat-card {
+            padding: 10px;
+            border-radius: 10px;
+            background-color: #f0f2f6;
+            border-left: 5px solid var(--accent, #4CAF50);
+            margin: 10px 0;
+            box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
+            animation: fadeIn 1s ease-in-out;
+        }
+        .stat-card h5 {margin: 0; color: #333;}
+        .stat-card h3 {margin: 5px 0; color: var(--accent, #4CAF50);}
+    """,
+    "tables": """
+        /* Apply to all tables created with DataFrame.to_html() */
+        .dataframe {
+            width: 100%;
+            border-collapse: collapse;
+            margin: 25px 0;
+            font-size: 0.8em;
+            font-family: sans-serif;
+            min-width: 400px;
+            box-shadow: 0 0 20px rgba(0, 0, 0, 0.15);
+        }
+        .dataframe thead tr {
+            background: linear-gradient(90deg, #18184a 0%, #193785 50%, #18184a 100%);
+            color: #ffffff;
+            text-align: left;
+        }
+        .dataframe th,
+        .dataframe td {
+            padding: 4px 6px;
+        }
+        .dataframe tbody tr {
+            border-bottom: 1px solid #dddddd;
+        }
+        .dataframe tbody tr:nth-of-type(even) {
+            background-color: #e8ebf3 !important;
+            border-bottom: #eee 1px solid;
+            border-top: #eee 1px solid;
+        }
+        .dataframe tbody tr:hover {
+            background-color: whitesmoke !important;
+            transition: 0.4s;
+        }
+        .compare-table {width: 100%; border-collapse: collapse; margin: 15px 0; font-family: sans-serif;
+            box-shadow: 0 0 20px rgba(0, 0, 0, 0.15);}
+        .compare-table thead tr {background: linear-gradient(90deg, #18184a 0%, #193785 50%, #18184a 100%); color: #ffffff; text-align: left;}
+        .compare-table th, .compare-table td {padding: 6px 10px;}
+        .compare-table tbody tr:nth-of-type(even) {background-color: #e8ebf3;}
+    """,
+    "pagination": """
+        /* Only buttons inside st.container(key="pagination_...") get the pagination look */
+        [class*="st-key-pagination"] .stButton>button {
+            width: 180px;
+            border: 2px solid #4E2A84;
+            border-radius: 20px;
+            color: white;
+            background-color: #193785;
+            padding: 6px 12px;
+            font-size: 14px;
+            font-weight: bold;
+            transition: background-color 0.3s ease;
+        }
+        [class*="st-key-pagination"] .stButton>button:hover {
+            border-color: #372c6f;
+            background-color: #372c6f;
+        }
+        .page-info {
+            margin: 0 20px;
+            font-size: 16px;
+            font-weight: bold;
+            color: #333;
+            text-align: center;
+        }
+    """,
+    "account_boxes": """
+        .category-box {
+            padding: 10px;
+            margin: 5px 0px;
+            border-radius: 10px;
+            background-color: #6C63FF;
+            color: white;
+            text-align: center;
+        }
+        .data-box {
+            border: 2px solid #FFC107;
+            border-radius: 10px;
+            padding: 10px;
+            margin: 5px 0px;
+            background-color: #FFECB3;
+            text-align: center;
+            transition: transform .2s;
+        }
+        .data-box:hover {
+            transform: scale(1.05);
+            box-shadow: 0 4px 8px 0 rgba(0,0,0,0.2);
+        }
+        .data-value {
+            font-size: 1.5rem;
+            font-weight: bold;
+            color: #FF5722;
+        }
+    """,
+}
+
+THEME_CSS = "\n".join(STYLES.values())
+THEME_VERSION = hashlib.sha1((THEME_CSS + "".join(ASSETS)).encode()).hexdigest()[:12]
+
+def register_styles():
+    """Install the stylesheet and assets into the page <head> once per browser session.
+
+    The styles live in the parent document rather than in a markdown element, so later
+    reruns do not have to resend them to keep the page styled.
+    """
+    if st.session_state.get("theme_version") == THEME_VERSION:
+        return
+    components.html(f"""
+        <script>
+        const doc = window.parent.document;
+        const id = "nearvision-theme-{THEME_VERSION}";
+        if (!doc.getElementById(id)) {{
+            for (const href of {json.dumps(ASSETS)}) {{
+                const link = doc.createElement("link");
+                link.rel = "stylesheet";
+                link.href = href;
+                doc.head.appendChild(link);
+            }}
+            const style = doc.createElement("style");
+            style.id = id;
+            style.textContent = {json.dumps(THEME_CSS)};
+            doc.head.appendChild(style);
+        }}
+        </script>
+        """, height=0)
+    st.session_state["theme_version"] = THEME_VERSION
+
+# Static HTML fragments are built once per distinct value and reused across reruns
+@lru_cache(maxsize=2048)
+def stat_card(title, value, color="#4CAF50"):
+    return f'<div class="stat-card" style="--accent: {color};"><h5>{title}</h5><h3>{value}</h3></div>'
+
+@lru_cache(maxsize=2048)
+def metric_card(label, value):
+    return f'<div class="metric-container"><h3>{label}</h3><p><strong>{value}</strong></p></div>'
+
+@lru_cache(maxsize=256)
+def category_box(label):
+    return f'<div class="category-box">{label}</div>'
+
+@lru_cache(maxsize=2048)
+def data_box(value):
+    return f'<div class="data-box"><p class="data-value">{value}</p></div>'
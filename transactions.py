@@ -1,44 +1,45 @@
 import streamlit as st
-import requests
 import pandas as pd
 from datetime import datetime
 from datetime import timedelta
 # Import necessary functions from prompts.py
 from prompts import generate_summary_with_openai_transactions,generate_summary_with_openai
-
-# Function to determine the base URL
-def get_base_url(network):
-    return "https://api-testnet.nearblocks.io" if network == 'Testnet' else "https://api.nearblocks.io"
+from live_feed import live_rows
+from account_export import export_account, export_path, EXPORT_KINDS
+from compare import COMPARE_OPTION, NETWORKS, fetch_both, submit_both, display_comparison_table, first_count
+from theme import category_box, data_box
+from prompt_cache import complete
+from nearblocks import get_json, fetch_pages, failure_message, LOOKUP, BACKGROUND
+from payloads import BLOCKS_FIELDS, TXNS_FIELDS
+from network_metrics import observe, metrics_for, WINDOWS
 
 # Function to fetch transactions for the table
 @st.cache_data(ttl=1, max_entries=200, show_spinner=True)  # Cache for 1 second
 def fetch_transactions(network, page):
-    base_url = get_base_url(network)
     params = {"page": page, "per_page": 10, "order": "desc"}
-    response = requests.get(f"{base_url}/v1/txns", params=params)
-    return response.json()["txns"] if response.status_code == 200 else []
+    data = get_json(network, "/v1/txns", params, fields=TXNS_FIELDS)
+    observe(network, txns=data["txns"] if data else [])
+    return data["txns"] if data else []
 
 @st.cache_data(ttl=1, max_entries=200, show_spinner=True)  # Cache for 1 second
 def fetch_blocks(network, page):
-    base_url = get_base_url(network)
     params = {"page": page, "per_page": 10, "order": "desc"}
-    response = requests.get(f"{base_url}/v1/blocks", params=params)
-    return response.json()["blocks"] if response.status_code == 200 else []
+    data = get_json(network, "/v1/blocks", params, fields=BLOCKS_FIELDS)
+    observe(network, blocks=data["blocks"] if data else [])
+    return data["blocks"] if data else []
 
 # Utility function to truncate content and append '...'
 def truncate_content(content, max_length):
     return content[:max_length] + "..." if len(content) > max_length else content
 
 def search_transaction(network, keyword):
-    base_url = get_base_url(network)
-    response = requests.get(f"{base_url}/v1/search", params={"keyword": keyword})
-    if response.status_code == 200:
-        return response.json()
+    data = get_json(network, "/v1/search", {"keyword": keyword}, priority=LOOKUP)
+    if data is not None:
+        return data
     else:
-        return {"error": "Failed to search transactions"}
+        return {"error": failure_message("Failed to search transactions")}
 
-def display_transactions(network, page):
-    transactions = fetch_transactions(network, page)
+def build_transactions_table(transactions):
     data = []
     for txn in transactions:
         tx_hash = truncate_content(txn["transaction_hash"], 10)
@@ -58,90 +59,33 @@ def display_transactions(network, page):
     df = pd.DataFrame(data)
     df['Transaction Time'] = pd.to_datetime(df['Transaction Time'])
     df = df.sort_values(by='Transaction Time', ascending=False)
+    return df
+
+def build_top_accounts_table(top):
+    # One ranked row per position: the account and its (approximate) total for each list
+    rows = []
+    for rank in range(max(len(entries) for entries in top.values())):
+        def cell(name, fmt):
+            if rank >= len(top[name]):
+                return ""
+            account, total, _ = top[name][rank]
+            return f"{truncate_content(account, 25)} · {fmt(total)}"
+        rows.append({
+            "Rank": rank + 1,
+            "Top Signers (txns)": cell("signers", lambda total: f"{total:,.0f}"),
+            "Top Receivers (txns)": cell("receivers", lambda total: f"{total:,.0f}"),
+            "Top Fee Spenders": cell("fee_spenders", lambda total: f"{total / 1e24:.4f} Ⓝ"),
+        })
+    return pd.DataFrame(rows)
+
+def display_transactions(network, page):
+    df = build_transactions_table(fetch_transactions(network, page))
 
-    # Custom CSS for the table
-    st.markdown("""
-        <style>
-        /* Apply to all tables created with DataFrame.to_html() */
-        .dataframe {
-            width: 100%;
-            border-collapse: collapse;
-            margin: 25px 0;
-            font-size: 0.8em;
-            font-family: sans-serif;
-            min-width: 400px;
-            box-shadow: 0 0 20px rgba(0, 0, 0, 0.15);
-        }
-        .dataframe thead tr {
-            background: linear-gradient(90deg, #18184a 0%, #193785 50%, #18184a 100%);
-            color: #ffffff;
-            text-align: left;
-        }
-        .dataframe th,
-        .dataframe td {
-            padding: 4px 6px ;
-        }
-        .dataframe tbody tr{
-            border-bottom: 1px solid #dddddd;
-        }
-        .dataframe tbody tr:nth-of-type(even) {
-           background-color: #e8ebf3 !important;
-           border-bottom: #eee 1px solid;
-           border-top: #eee 1px solid;
-        }
-        .dataframe tbody tr:hover {
-            background-color: whitesmoke !important;
-            transition: 0.4s;
-    }
-        </style>
-        """, unsafe_allow_html=True)
-    
     # Display the DataFrame as an HTML table with custom styling
     st.markdown(df.to_html(index=False, escape=False, classes='dataframe'), unsafe_allow_html=True)
 
-    # Custom CSS for pagination
-    st.markdown("""
-        <style>
-        .pagination-container {
-          display: flex;
-          justify-content: space-between;
-          align-items: center;
-          margin-top: 30px;
-        }
-        .stButton>button {
-        width: 180px; /* Fixed width for both buttons */
-        border: 2px solid #4E2A84;
-        border-radius: 20px;
-        color: white;
-        background-color: #193785;
-        padding: 6px 12px;
-        font-size: 14px;
-        font-weight: bold;
-        transition: background-color 0.3s ease;
-        }
-        .stButton>button:hover {
-            border-color: #372c6f;
-            background-color: #372c6f;
-        }
-        .page-info {
-            margin: 0 20px; /* Space around page info */
-            font-size: 16px;
-            font-weight: bold;
-            color: #333; /* Text color */
-            text-align: center;
-        }
-        @keyframes fadeIn {
-            from {opacity: 0;}
-            to {opacity: 1;}
-        }
-        .animate-fade-in {
-            animation: fadeIn 1s ease-in-out;
-        }
-        </style>
-        """, unsafe_allow_html=True)
-
-    # Pagination
-    cols = st.columns([1, 2, 1])  # Adjust ratios as needed
+    # Pagination; the keyed container scopes the pagination button style from theme.py
+    cols = st.container(key="pagination_transactions").columns([1, 2, 1])  # Adjust ratios as needed
     with cols[0]:
         if page > 1:
             prev_page = page - 1
@@ -165,8 +109,7 @@ def format_gas_value(gas_value):
     else:
         return f"{gas_value:.4g} wei"
 
-def display_blocks(network, page):
-    blocks = fetch_blocks(network, page)
+def build_blocks_table(blocks):
     data = []
     for block in blocks:
         block_height = block["block_height"]
@@ -192,11 +135,15 @@ def display_blocks(network, page):
     df = pd.DataFrame(data)
     df['Block Timestamp'] = pd.to_datetime(df['Block Timestamp'])
     df = df.sort_values(by='Block Height', ascending=False)
+    return df
+
+def display_blocks(network, page):
+    df = build_blocks_table(fetch_blocks(network, page))
 
     st.markdown(df.to_html(index=False, escape=False, classes='dataframe'), unsafe_allow_html=True)
 
-    # Pagination
-    cols = st.columns([1, 2, 1])  # Adjust ratios as needed
+    # Pagination; the keyed container scopes the pagination button style from theme.py
+    cols = st.container(key="pagination_blocks").columns([1, 2, 1])  # Adjust ratios as needed
     with cols[0]:
         if page > 1:
             prev_page = page - 1
@@ -213,26 +160,27 @@ def display_blocks(network, page):
             st.button("Next Blocks", key="next_block", on_click=lambda: update_page_blocks(network, next_page))
         st.markdown('</div>', unsafe_allow_html=True)
 
+# Pagination callbacks run before the owning fragment reruns, so no extra rerun is needed
 def update_page_transactions(network, page):
     st.session_state['current_page_transactions'] = page
-    st.session_state['page_changed_transactions'] = True  # Add a flag to indicate the page change
 
 def update_page_blocks(network, page):
     st.session_state['current_page_blocks'] = page
-    st.session_state['page_changed_blocks'] = True  # Add a flag to indicate the page change
 
-def fetch_all_transactions_for_summary(network,start_time,end_time):
-    transactions = []
+@st.cache_data(ttl=60, show_spinner=False)  # Cache the 200 page crawl for a minute
+def fetch_all_transactions_for_summary(network, _start_time, _end_time):
     total_pages = 200  # This should ideally be dynamic based on the total count of transactions available
-    for page in range(1, total_pages + 1):
-        transactions.extend(fetch_transactions(network, page))
+    # A background crawl: the shared scheduler serves page loads and lookups first
+    transactions = fetch_pages(network, "/v1/txns", "txns", range(1, total_pages + 1), per_page=10, priority=BACKGROUND, fields=TXNS_FIELDS)
+    observe(network, txns=transactions)
     return transactions
 
-def fetch_all_blocks_for_summary(network,start_time,end_time):
-    blocks = []
+@st.cache_data(ttl=60, show_spinner=False)  # Cache the 200 page crawl for a minute
+def fetch_all_blocks_for_summary(network, _start_time, _end_time):
     total_pages = 200  # This should ideally be dynamic based on the total count of transactions available
-    for page in range(1, total_pages + 1):
-        blocks.extend(fetch_blocks(network, page))
+    # A background crawl: the shared scheduler serves page loads and lookups first
+    blocks = fetch_pages(network, "/v1/blocks", "blocks", range(1, total_pages + 1), per_page=10, priority=BACKGROUND, fields=BLOCKS_FIELDS)
+    observe(network, blocks=blocks)
     return blocks
 
 def create_summary_prompt(total_transactions, unique_signers):
@@ -243,30 +191,27 @@ def create_summary_prompt_with_blocks(total_blocks, unique_signers):
     prompt = f"There were a total of {total_blocks} blocks conducted by {unique_signers} unique individuals within a second. Please summarize this high-frequency blocks data in a concise and informative manner suitable for a general audience."
     return prompt
 
+@st.cache_data(ttl=60, show_spinner=False)
 def get_total_transactions_count(network):
-    base_url = "https://api-testnet.nearblocks.io/v1/txns/count" if network == 'Testnet' else "https://api.nearblocks.io/v1/txns/count"
-    response = requests.get(base_url)
-    if response.status_code == 200:
-        data = response.json()
+    data = get_json(network, "/v1/txns/count")
+    if data is not None:
         return data['txns'][0]['count']
     else:
         return "Unknown"
     
+@st.cache_data(ttl=60, show_spinner=False)
 def get_total_blocks_count(network):
-    base_url = "https://api-testnet.nearblocks.io/v1/blocks/count" if network == 'Testnet' else "https://api.nearblocks.io/v1/blocks/count"
-    response = requests.get(base_url)
-    if response.status_code == 200:
-        data = response.json()
+    data = get_json(network, "/v1/blocks/count")
+    if data is not None:
         return data['blocks'][0]['count']
     else:
         return "Unknown"
 
 # Function to fetch transaction count from NEARBlocks API
+@st.cache_data(ttl=60, max_entries=500, show_spinner=False)
 def get_transaction_count(account_id, network):
-    base_url = "https://api-testnet.nearblocks.io" if network == 'Testnet' else "https://api.nearblocks.io"
-    url = f"{base_url}/v1/account/{account_id}/txns/count"
-    response = requests.get(url)
-    return response.json() if response.status_code == 200 else {"error": "Failed to retrieve transaction count"}
+    data = get_json(network, f"/v1/account/{account_id}/txns/count", priority=LOOKUP)
+    return data if data is not None else {"error": failure_message("Failed to retrieve transaction count")}
 
 # Function to display transaction count
 def handle_transaction_count(transaction_count_info):
@@ -276,17 +221,210 @@ def handle_transaction_count(transaction_count_info):
     else:
         st.error(transaction_count_info["error"])
 
+@st.cache_data(ttl=60, max_entries=500, show_spinner=False)
 def get_ft_txn_count(account_id, network):
-    base_url = "https://api-testnet.nearblocks.io" if network == 'Testnet' else "https://api.nearblocks.io"
-    url = f"{base_url}/v1/account/{account_id}/ft-txns/count"
-    response = requests.get(url)
-    return response.json() if response.status_code == 200 else {"error": "Failed to retrieve FT transaction count"}
+    data = get_json(network, f"/v1/account/{account_id}/ft-txns/count", priority=LOOKUP)
+    return data if data is not None else {"error": failure_message("Failed to retrieve FT transaction count")}
 
+@st.cache_data(ttl=60, max_entries=500, show_spinner=False)
 def get_nft_txn_count(account_id, network):
-    base_url = "https://api-testnet.nearblocks.io" if network == 'Testnet' else "https://api.nearblocks.io"
-    url = f"{base_url}/v1/account/{account_id}/nft-txns/count"
-    response = requests.get(url)
-    return response.json() if response.status_code == 200 else {"error": "Failed to retrieve NFT transaction count"}
+    data = get_json(network, f"/v1/account/{account_id}/nft-txns/count", priority=LOOKUP)
+    return data if data is not None else {"error": failure_message("Failed to retrieve NFT transaction count")}
+
+# Each section below is a fragment: interacting with a widget inside one only reruns that section
+@st.fragment
+def transactions_table_fragment(network):
+    st.markdown('<p class="big-font">Latest Transactions</p>', unsafe_allow_html=True)
+    display_transactions(network, st.session_state['current_page_transactions'])
+
+@st.fragment
+def blocks_table_fragment(network):
+    st.markdown('<p class="big-font">Latest Blocks</p>', unsafe_allow_html=True)
+    display_blocks(network, st.session_state['current_page_blocks'])
+
+LIVE_TABLE_ROWS = 10
+
+def live_tables(network, cadence):
+    # Reruns on its own every `cadence` seconds and only renders rows the shared poller already holds
+    @st.fragment(run_every=cadence)
+    def live_tables_fragment():
+        for kind, title, build_table in [("txns", "Latest Transactions", build_transactions_table), ("blocks", "Latest Blocks", build_blocks_table)]:
+            st.markdown(f'<p class="big-font">{title}</p>', unsafe_allow_html=True)
+            rows, skipped = live_rows(network, kind, LIVE_TABLE_ROWS)
+            if rows:
+                st.markdown(build_table(rows).to_html(index=False, escape=False, classes='dataframe'), unsafe_allow_html=True)
+            else:
+                st.info("Waiting for the live feed...")
+            if skipped:
+                st.caption(f"🔴 Live · {skipped} rows skipped to keep up with the chain")
+            else:
+                st.caption("🔴 Live")
+
+    live_tables_fragment()
+
+@st.fragment
+def blocks_summary_fragment(network):
+    if network != st.session_state['current_network_blocks'] or not st.session_state['summary_generated_blocks']:
+        total_blocks_count = get_total_blocks_count(network)
+        # Display a message to wait for transaction summary
+        wait_message = st.empty()
+        wait_message.warning("Please wait for a minute or two to view the blocks summary for the last second.")
+        api_key = st.secrets["API_KEY"]
+        start_time = datetime.now() - timedelta(seconds=1)
+        end_time = start_time + timedelta(seconds=1)
+        blocks = fetch_all_blocks_for_summary(network,start_time,end_time)
+        total_blocks = len(blocks)
+        unique_signers = len(set(block["author_account_id"] for block in blocks))
+
+        # Format the input prompt as a structured summary
+        input_prompt = f"Hi there, here's a brief summary of blocks generated in NEAR {network} within the last second:\n\n"
+        input_prompt += f"- Total Blocks: {total_blocks}\n\n"
+        input_prompt += f"- Unique Signers: {unique_signers}\n\n"
+        input_prompt += f"- Total blocks on the {network}: {total_blocks_count}\n\n"
+        input_prompt += "Please provide a concise explanation of this high-frequency blocks data."
+
+        formatted_prompt = create_summary_prompt_with_blocks(total_blocks, unique_signers)
+        ai_response = complete("blocks_summary", formatted_prompt, generate_summary_with_openai, api_key)
+
+        # Store the generated summary in session state
+        st.session_state['input_prompt_blocks'] = input_prompt
+        st.session_state['ai_response_blocks'] = ai_response
+        st.session_state['current_network_blocks'] = network
+        st.session_state['summary_generated_blocks'] = True  # Indicate that summary has been generated
+        wait_message.empty()
+
+    # Display the stored summary
+    st.markdown(f"<div class='user_prompt'>👤 <strong>You:</strong><br>{st.session_state['input_prompt_blocks']}</div>", unsafe_allow_html=True)
+    st.markdown(f"<div class='ai_response'>🤖 <strong>NearVision AI:</strong><br>{st.session_state['ai_response_blocks']}</div>", unsafe_allow_html=True)
+
+@st.fragment
+def transactions_summary_fragment(network):
+    if network != st.session_state['current_network_transactions'] or not st.session_state['summary_generated_transactions'] and st.session_state['current_action'] == 'show_transaction_summary':
+        total_transactions_count = get_total_transactions_count(network)
+        api_key = st.secrets["API_KEY"]
+        start_time = datetime.now() - timedelta(seconds=1)
+        end_time = start_time + timedelta(seconds=1)
+        transactions = fetch_all_transactions_for_summary(network, start_time, end_time)
+
+        if transactions:  # Check if the transactions list is not empty
+            total_transactions = len(transactions)
+            unique_signers = len(set(txn["signer_account_id"] for txn in transactions))
+            input_prompt = f"Hi there, here's a brief summary of transactions generated in NEAR {network} within the last second:\n\n"
+            input_prompt += f"- Total Transactions: {total_transactions}\n\n"
+            input_prompt += f"- Unique Signers: {unique_signers}\n\n"
+            input_prompt += f"- Total Transactions on the {network}: {total_transactions_count}\n\n"
+            input_prompt += "Please provide a concise explanation of this high-frequency transaction data."
+            formatted_prompt = create_summary_prompt(total_transactions, unique_signers)
+            ai_response = complete("transactions_summary", formatted_prompt, generate_summary_with_openai_transactions, api_key)
+            st.session_state['input_prompt_transactions'] = input_prompt
+            st.session_state['ai_response_transactions'] = ai_response
+        else:  # If the transactions list is empty, display the message for no transactions
+            st.session_state['input_prompt_transactions'] = "No Transactions Input"
+            st.session_state['ai_response_transactions'] = failure_message("No transactions were found in the last second. No Transactions Summary available.")
+
+        st.session_state['current_network_transactions'] = network
+        st.session_state['summary_generated_transactions'] = True
+        st.session_state['current_action'] = 'show_transaction_summary'
+
+    # Display the stored summary or the no transactions message
+    st.markdown(f"<div class='user_prompt'>👤 <strong>You:</strong><br>{st.session_state['input_prompt_transactions']}</div>", unsafe_allow_html=True)
+    st.markdown(f"<div class='ai_response'>🤖 <strong>NearVision AI:</strong><br>{st.session_state['ai_response_transactions']}</div>", unsafe_allow_html=True)
+
+@st.fragment
+def unique_accounts_fragment(network):
+    st.markdown('<p class="big-font animate"> 👥 Unique Active Accounts</p>', unsafe_allow_html=True)
+    metrics = metrics_for(network)
+    first_seen = metrics.signers.first_seen()
+    if first_seen is None:
+        st.info("No transactions have been observed yet. Live mode and the transactions summary both feed these counts.")
+        return
+    for column, (label, seconds) in zip(st.columns(len(WINDOWS)), WINDOWS.items()):
+        with column:
+            st.markdown(category_box(f"Unique Signers · {label}"), unsafe_allow_html=True)
+            st.markdown(data_box(f"👤 {metrics.unique_signers(seconds):,}"), unsafe_allow_html=True)
+    st.caption(f"Approximate (about ±2%) distinct signers of the transactions this app has seen since {datetime.fromtimestamp(first_seen):%Y-%m-%d %H:%M}.")
+
+TOP_ACCOUNTS_ROWS = 10
+
+def format_quantiles(values, fmt):
+    return "—" if values is None else " / ".join(fmt(value) for value in values)
+
+@st.fragment
+def fee_gas_fragment(network):
+    st.markdown('<p class="big-font animate"> 💸 Fee & Gas Distribution</p>', unsafe_allow_html=True)
+    window = st.selectbox("Window", list(WINDOWS), key=f"fee_gas_window_{network}")
+    metrics = metrics_for(network)
+    fees, gas = metrics.fee_quantiles(WINDOWS[window]), metrics.gas_quantiles(WINDOWS[window])
+    if fees is None and gas is None:
+        st.info("No transactions or blocks have been observed yet. Live mode and the summaries both feed these percentiles.")
+        return
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown(category_box("Transaction Fee p50 / p90 / p99"), unsafe_allow_html=True)
+        st.markdown(data_box(format_quantiles(fees, lambda fee: f"{fee / 1e24:.5f} Ⓝ")), unsafe_allow_html=True)
+    with col2:
+        st.markdown(category_box("Gas Used per Block p50 / p90 / p99"), unsafe_allow_html=True)
+        st.markdown(data_box(format_quantiles(gas, lambda used: f"{used / 1e12:,.0f} Tgas")), unsafe_allow_html=True)
+    st.caption("Within 1% of the exact percentiles of the transactions and blocks this app has seen.")
+
+@st.fragment
+def top_accounts_fragment(network):
+    st.markdown('<p class="big-font animate"> 🔥 Most Active Accounts</p>', unsafe_allow_html=True)
+    window = st.selectbox("Window", list(WINDOWS), key=f"top_accounts_window_{network}")
+    top = metrics_for(network).top_accounts(WINDOWS[window], TOP_ACCOUNTS_ROWS)
+    if not top or not top["signers"]:
+        st.info("No transactions have been observed yet. Live mode and the transactions summary both feed this table.")
+        return
+    st.markdown(build_top_accounts_table(top).to_html(index=False, escape=False, classes='dataframe'), unsafe_allow_html=True)
+    st.caption("Totals come from bounded heavy-hitter summaries and may be slightly overstated for accounts near the bottom of the list.")
+
+@st.fragment
+def account_stats_fragment(network):
+    st.markdown('<p class="big-font animate"> 🤵🏻 Personalized Summary</p>', unsafe_allow_html=True)
+    st.markdown('<p class="small-font">Enter your NEAR account ID:', unsafe_allow_html=True)
+    placeholder = "Ex:-farhun.testnet" if network == 'Testnet' else "Ex:-zavodil.poolv1.near"
+    account_id = st.text_input("", placeholder=placeholder, key=f"account_stats_{network}")
+    if account_id:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.markdown(category_box("Total Transactions"), unsafe_allow_html=True)
+                txn_count_info = get_transaction_count(account_id, network)
+                if "error" in txn_count_info:
+                    st.error(txn_count_info["error"])
+                else:
+                    count = txn_count_info.get("txns", [{}])[0].get("count", "Unknown")
+                    st.markdown(data_box(f"🔢 {count}"), unsafe_allow_html=True)
+                
+            with col2:
+                st.markdown(category_box("FT Transactions"), unsafe_allow_html=True)
+                ft_txn_count_info = get_ft_txn_count(account_id, network)
+                if "error" in ft_txn_count_info:
+                    st.error(ft_txn_count_info["error"])
+                else:
+                    count_ft = ft_txn_count_info.get("txns", [{}])[0].get("count", "Unknown")
+                    st.markdown(data_box(f"🎭 {count_ft}"), unsafe_allow_html=True)
+
+            with col3:
+                st.markdown(category_box("NFT Transactions"), unsafe_allow_html=True)
+                nft_txn_count_info = get_nft_txn_count(account_id, network)
+                if "error" in nft_txn_count_info:
+                    st.error(nft_txn_count_info["error"])
+                else:
+                    count_nft = nft_txn_count_info.get("txns", [{}])[0].get("count", "Unknown")
+                    st.markdown(data_box(f"🖼️ {count_nft}"), unsafe_allow_html=True)
+
+            with st.expander("📦 Export full history"):
+                export_format = st.radio("Format", ["parquet", "csv"], horizontal=True, key=f"export_format_{network}")
+                st.caption(f"Large accounts are better exported from the command line: python account_export.py {account_id} --network {network}")
+                if st.button("Start, resume or update export", key=f"export_{network}"):
+                    try:
+                        with st.spinner("Exporting transactions, FT and NFT transfers..."):
+                            results = export_account(account_id, network, export_format)
+                    except RuntimeError as error:
+                        st.error(f"{error}. Press the button again to resume from the last checkpoint.")
+                    else:
+                        for kind in EXPORT_KINDS:
+                            st.success(f"{kind}: {results[kind]['rows']} rows written to {export_path(account_id, network, kind, export_format)}")
 
 def app(network):
     # Initialize session state variables for pagination
@@ -314,180 +452,54 @@ def app(network):
      # Initialize session state variables for current action
     if 'current_action' not in st.session_state:
         st.session_state['current_action'] = 'show_transactions'  # Default action
-    if network != 'Select Network':
-        st.markdown("""
-        <style>
-            .big-font {font-size:30px !important; font-weight: bold; color: #ff6347;}
-            .small-font {font-size:18px !important;}
-            .animate {animation: fadeIn ease 3s; animation-iteration-count: 1; animation-fill-mode: forwards;}
-            @keyframes fadeIn {0% {opacity:0;} 100% {opacity:1;}}
-            .user_prompt, .ai_response {
-            padding: 10px;
-            border-radius: 10px;
-            margin-bottom: 10px;
-            }
-            .user_prompt {
-                background-color: #e1f5fe;
-            }
-            .ai_response {
-                background-color: #f0f4c3;
-            }
-            @media (prefers-color-scheme: dark) {
-                .user_prompt {
-                    background-color: #333;
-                }
-                .ai_response {
-                    background-color: #444;
-                }
-            }
-            </style>
-            """, unsafe_allow_html=True)
-     
+    if network == COMPARE_OPTION:
+        compare_app()
+    elif network != 'Select Network':
         st.markdown('<p class="big-font animate">🧐 NEAR Transactions Overview</p>', unsafe_allow_html=True)
-        st.markdown('<p class="big-font">Latest Transactions</p>', unsafe_allow_html=True)
-
-        display_transactions(network, st.session_state['current_page_transactions'])
-
-        # In your app() function or main script body, after calling display_transactions():
-        if 'page_changed_transactions' in st.session_state and st.session_state['page_changed_transactions']:
-            st.session_state['page_changed_transactions'] = False  # Reset the flag
-            st.experimental_rerun()  # Now it's safe to call rerun
+        live_col, cadence_col = st.columns([1, 3])
+        with live_col:
+            live_mode = st.toggle("Live mode", key="live_mode_transactions")
+        if live_mode:
+            with cadence_col:
+                cadence = st.select_slider("Refresh every (seconds)", options=[1, 2, 5, 10], value=2, key="live_cadence_transactions")
+            live_tables(network, cadence)
+        else:
+            transactions_table_fragment(network)
+            blocks_table_fragment(network)
 
-        st.markdown('<p class="big-font">Latest Blocks</p>', unsafe_allow_html=True)
-        # Display transactions after the buttons, so they have the chance to update the page first
-        display_blocks(network, st.session_state['current_page_blocks'])
-
-        # In your app() function or main script body, after calling display_transactions():
-        if 'page_changed_blocks' in st.session_state and st.session_state['page_changed_blocks']:
-            st.session_state['page_changed_blocks'] = False  # Reset the flag
-            st.experimental_rerun()  # Now it's safe to call rerun
-        
         st.markdown('<p class="big-font animate"> 📝 NEAR Blocks And Transactions Summary</p>', unsafe_allow_html=True)
-        
-        if network != st.session_state['current_network_blocks'] or not st.session_state['summary_generated_blocks']:
-            total_blocks_count = get_total_blocks_count(network)
-            # Display a message to wait for transaction summary
-            st.warning("Please wait for a minute or two to view the blocks summary for the last second.")    
-            api_key = st.secrets["API_KEY"]
-            start_time = datetime.now() - timedelta(seconds=1)
-            end_time = start_time + timedelta(seconds=1)
-            blocks = fetch_all_blocks_for_summary(network,start_time,end_time)
-            total_blocks = len(blocks)
-            unique_signers = len(set(block["author_account_id"] for block in blocks))
-
-            # Format the input prompt as a structured summary
-            input_prompt = f"Hi there, here's a brief summary of blocks generated in NEAR {network} within the last second:\n\n"
-            input_prompt += f"- Total Blocks: {total_blocks}\n\n"
-            input_prompt += f"- Unique Signers: {unique_signers}\n\n"
-            input_prompt += f"- Total blocks on the {network}: {total_blocks_count}\n\n"
-            input_prompt += "Please provide a concise explanation of this high-frequency blocks data."
-
-            formatted_prompt = create_summary_prompt_with_blocks(total_blocks, unique_signers)
-            ai_response = generate_summary_with_openai(formatted_prompt, api_key)
-
-            # Store the generated summary in session state
-            st.session_state['input_prompt_blocks'] = input_prompt
-            st.session_state['ai_response_blocks'] = ai_response
-            st.session_state['current_network_blocks'] = network
-            st.session_state['summary_generated_blocks'] = True  # Indicate that summary has been generated
-            st.experimental_rerun()
-
-        # Display the stored summary
-        st.markdown(f"<div class='user_prompt'>👤 <strong>You:</strong><br>{st.session_state['input_prompt_blocks']}</div>", unsafe_allow_html=True)
-        st.markdown(f"<div class='ai_response'>🤖 <strong>NearVision AI:</strong><br>{st.session_state['ai_response_blocks']}</div>", unsafe_allow_html=True)
-        
-        if network != st.session_state['current_network_transactions'] or not st.session_state['summary_generated_transactions'] and st.session_state['current_action'] == 'show_transaction_summary':
-            total_transactions_count = get_total_transactions_count(network)
-            api_key = st.secrets["API_KEY"]
-            start_time = datetime.now() - timedelta(seconds=1)
-            end_time = start_time + timedelta(seconds=1)
-            transactions = fetch_all_transactions_for_summary(network, start_time, end_time)
-
-            if transactions:  # Check if the transactions list is not empty
-                total_transactions = len(transactions)
-                unique_signers = len(set(txn["signer_account_id"] for txn in transactions))
-                input_prompt = f"Hi there, here's a brief summary of transactions generated in NEAR {network} within the last second:\n\n"
-                input_prompt += f"- Total Transactions: {total_transactions}\n\n"
-                input_prompt += f"- Unique Signers: {unique_signers}\n\n"
-                input_prompt += f"- Total Transactions on the {network}: {total_transactions_count}\n\n"
-                input_prompt += "Please provide a concise explanation of this high-frequency transaction data."
-                formatted_prompt = create_summary_prompt(total_transactions, unique_signers)
-                ai_response = generate_summary_with_openai_transactions(formatted_prompt, api_key)
-                st.session_state['input_prompt_transactions'] = input_prompt
-                st.session_state['ai_response_transactions'] = ai_response
-            else:  # If the transactions list is empty, display the message for no transactions
-                st.session_state['input_prompt_transactions'] = "No Transactions Input"
-                st.session_state['ai_response_transactions'] = "No transactions were found in the last second. No Transactions Summary available."
-
-            st.session_state['current_network_transactions'] = network
-            st.session_state['summary_generated_transactions'] = True
-            st.session_state['current_action'] = 'show_transaction_summary'
-            st.experimental_rerun()
-
-        # Display the stored summary or the no transactions message
-        st.markdown(f"<div class='user_prompt'>👤 <strong>You:</strong><br>{st.session_state['input_prompt_transactions']}</div>", unsafe_allow_html=True)
-        st.markdown(f"<div class='ai_response'>🤖 <strong>NearVision AI:</strong><br>{st.session_state['ai_response_transactions']}</div>", unsafe_allow_html=True)
-
-        st.markdown('<p class="big-font animate"> 🤵🏻 Personalized Summary</p>', unsafe_allow_html=True)
-        st.markdown('<p class="small-font">Enter your NEAR account ID:', unsafe_allow_html=True)
-        placeholder = "Ex:-farhun.testnet" if network == 'Testnet' else "Ex:-zavodil.poolv1.near"
-        account_id = st.text_input("", placeholder=placeholder)
-        if account_id:
-            # Define custom CSS for the boxes
-                box_css = """
-                    <style>
-                        .category-box {
-                            padding: 10px;
-                            margin: 5px 0px;
-                            border-radius: 10px;
-                            background-color: #6C63FF;  /* Attractive purple shade for category */
-                            color: white;
-                            text-align: center;
-                        }
-
-                        .data-box {
-                            border: 2px solid #FFC107;  /* Golden border */
-                            border-radius: 10px;
-                            padding: 10px;
-                            margin: 5px 0px;
-                            background-color: #FFECB3;  /* Light golden background for data */
-                            text-align: center;
-                            transition: transform .2s;  /* Smooth scaling animation */
-                        }
-
-                        .data-box:hover {
-                            transform: scale(1.05);  /* Slightly larger on hover */
-                            box-shadow: 0 4px 8px 0 rgba(0,0,0,0.2);
-                        }
-
-                        .data-value {
-                            font-size: 1.5rem;
-                            font-weight: bold;
-                            color: #FF5722;  /* Deep orange for value */
-                        }
-                    </style>
-                """
-
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.markdown(box_css + '<div class="category-box">Total Transactions</div>', unsafe_allow_html=True)
-                    txn_count_info = get_transaction_count(account_id, network)
-                    count = txn_count_info.get("txns", [{}])[0].get("count", "Unknown")
-                    st.markdown(box_css + f'<div class="data-box"><p class="data-value">🔢 {count}</p></div>', unsafe_allow_html=True)
-                    
-                with col2:
-                    st.markdown(box_css + '<div class="category-box">FT Transactions</div>', unsafe_allow_html=True)
-                    ft_txn_count_info = get_ft_txn_count(account_id, network)
-                    count_ft = ft_txn_count_info.get("txns", [{}])[0].get("count", "Unknown")
-                    st.markdown(box_css + f'<div class="data-box"><p class="data-value">🎭 {count_ft}</p></div>', unsafe_allow_html=True)
+        blocks_summary_fragment(network)
+        transactions_summary_fragment(network)
+        unique_accounts_fragment(network)
+        top_accounts_fragment(network)
+        fee_gas_fragment(network)
 
-                with col3:
-                    st.markdown(box_css + '<div class="category-box">NFT Transactions</div>', unsafe_allow_html=True)
-                    nft_txn_count_info = get_nft_txn_count(account_id, network)
-                    count_nft = nft_txn_count_info.get("txns", [{}])[0].get("count", "Unknown")
-                    st.markdown(box_css + f'<div class="data-box"><p class="data-value">🖼️ {count_nft}</p></div>', unsafe_allow_html=True)
+        account_stats_fragment(network)
     else:
         st.info("Please select a network to view transactions.")
 
+def compare_app():
+    st.markdown('<p style="font-size:30px; font-weight:bold; color:#ff6347;">🧐 NEAR Transactions Overview - Testnet vs Mainnet</p>', unsafe_allow_html=True)
+    # The four table pages and both networks' counts are fetched in parallel
+    transaction_futures = submit_both(fetch_transactions, 1)
+    block_futures = submit_both(fetch_blocks, 1)
+    counts = fetch_both({"txns": "/v1/txns/count", "blocks": "/v1/blocks/count"})
+    count = lambda v: f'{v:,.0f}'
+    display_comparison_table([
+        ("Total Transactions", first_count(counts['Testnet']["txns"], "txns"), first_count(counts['Mainnet']["txns"], "txns"), count),
+        ("Total Blocks", first_count(counts['Testnet']["blocks"], "blocks"), first_count(counts['Mainnet']["blocks"], "blocks"), count),
+    ])
+
+    for network, column in zip(NETWORKS, st.columns(2)):
+        with column:
+            st.subheader(f"{network} - Latest Transactions")
+            transactions = transaction_futures[network].result()
+            if transactions:
+                st.markdown(build_transactions_table(transactions).to_html(index=False, escape=False, classes='dataframe'), unsafe_allow_html=True)
+            st.subheader(f"{network} - Latest Blocks")
+            blocks = block_futures[network].result()
+            if blocks:
+                st.markdown(build_blocks_table(blocks).to_html(index=False, escape=False, classes='dataframe'), unsafe_allow_html=True)
+
 if __name__ == "__main__":
     app('')
\ No newline at end of file